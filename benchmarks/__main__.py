@@ -0,0 +1,139 @@
+"""Benchmarks the codemod on generated projects of growing size.
+
+    python -m benchmarks run --routes 40 --scales 1 2 4 8 --output before.json
+    python -m benchmarks compare before.json after.json
+
+`run` reports, for each scale, the best time of each stage over `--repeat`
+runs, and the scaling exponent of each stage: the slope of log(time) against
+log(routes), 1 being linear.
+"""
+import json
+import platform
+import sys
+from argparse import ArgumentParser
+from dataclasses import fields
+from math import log
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Sequence
+
+from benchmarks.generator import ProjectShape, generate_project
+from benchmarks.stages import STAGES, run_stages
+from django_to_fastapi import __version__
+
+
+def get_scaling_exponent(sizes: Sequence[int], timings: Sequence[float]):
+    points = [
+        (log(size), log(timing)) for size, timing in zip(sizes, timings) if timing > 0
+    ]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def run(shape: ProjectShape, scales: Sequence[int], repeat: int):
+    results = []
+    for scale in scales:
+        scaled_shape = shape.scaled(scale)
+        with TemporaryDirectory() as destination:
+            urls_path = generate_project(destination, scaled_shape)
+            best: Dict[str, float] = {}
+            for _ in range(repeat):
+                timings, size = run_stages(urls_path)
+                for stage, timing in timings.items():
+                    best[stage] = min(best.get(stage, timing), timing)
+        results.append({"scale": scale, **size, "stages": best})
+        print(
+            f"scale {scale:>3}: {size['routes']:>5} routes {size['lines']:>7} lines"
+            f" {sum(best.values()):>9.4f}s"
+        )
+
+    routes = [result["routes"] for result in results]
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "shape": shape.to_dict(),
+        "results": results,
+        "scaling": {
+            stage: get_scaling_exponent(
+                routes, [result["stages"][stage] for result in results]
+            )
+            for stage in STAGES
+        },
+    }
+
+
+def print_report(report: Dict):
+    print(
+        f"\n{'stage':<24}"
+        + "".join(f"{'x' + str(r['scale']):>10}" for r in report["results"])
+        + f"{'exponent':>10}"
+    )
+    for stage in STAGES:
+        exponent = report["scaling"][stage]
+        print(
+            f"{stage:<24}"
+            + "".join(
+                f"{result['stages'][stage]:>10.4f}" for result in report["results"]
+            )
+            + (f"{exponent:>10.2f}" if exponent is not None else f"{'-':>10}")
+        )
+
+
+def compare(before: Dict, after: Dict):
+    """Prints the relative change of each stage at each scale both reports share."""
+    after_results = {result["scale"]: result for result in after["results"]}
+    print(f"{before['version']} -> {after['version']}")
+    print(f"{'scale':>5} {'stage':<24} {'before':>10} {'after':>10} {'change':>8}")
+    for result in before["results"]:
+        other = after_results.get(result["scale"])
+        if other is None:
+            continue
+        for stage in STAGES:
+            previous, current = result["stages"][stage], other["stages"][stage]
+            change = (current - previous) / previous * 100 if previous else 0.0
+            print(
+                f"{result['scale']:>5} {stage:<24} {previous:>10.4f}"
+                f" {current:>10.4f} {change:>+7.1f}%"
+            )
+
+
+def main(arguments: List[str]):
+    parser = ArgumentParser(prog="benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="benchmark generated projects")
+    for field in fields(ProjectShape):
+        run_parser.add_argument(
+            "--" + field.name.replace("_", "-"), type=int, default=field.default
+        )
+    run_parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4, 8])
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--output", help="where to store results as JSON")
+
+    compare_parser = commands.add_parser("compare", help="diff two JSON results")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+
+    parsed = parser.parse_args(arguments)
+    if parsed.command == "compare":
+        with open(parsed.before) as before, open(parsed.after) as after:
+            compare(json.load(before), json.load(after))
+        return
+
+    shape = ProjectShape(
+        **{field.name: getattr(parsed, field.name) for field in fields(ProjectShape)}
+    )
+    report = run(shape, parsed.scales, parsed.repeat)
+    print_report(report)
+    if parsed.output:
+        with open(parsed.output, "w") as cursor:
+            json.dump(report, cursor, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,76 @@
+"""Compares the batched `Runner.execute` with applying operations one at a
+time, on modules shaped like what `Migrator.visit_Module` queues for.
+
+    python -m benchmarks.ast_operations --sizes 1000 2000 5000
+"""
+import ast
+from argparse import ArgumentParser
+from time import perf_counter
+
+from django_to_fastapi.ast_operations import ASTOperation, ASTOperationAction, Runner
+
+IMPORTS_COUNT = 20
+
+
+def build_module(size: int):
+    imports = [f"import module_{index}" for index in range(IMPORTS_COUNT)]
+    views = [f"def view_{index}(request):\n    ..." for index in range(size)]
+    return ast.parse("\n".join(imports + views))
+
+
+def build_operations(module: ast.Module):
+    last_import = module.body[IMPORTS_COUNT - 1]
+    operations = []
+    for view in module.body[IMPORTS_COUNT:]:
+        operations.append(
+            ASTOperation(
+                ASTOperationAction.InsertBefore,
+                {"target": view, "candidate": ast.parse("Payload = Any").body[0]},
+            )
+        )
+        operations.append(
+            ASTOperation(
+                ASTOperationAction.Replace,
+                {"target": view, "candidate": ast.parse("async def f(): ...").body[0]},
+            )
+        )
+    for index in range(6):
+        operations.append(
+            ASTOperation(
+                ASTOperationAction.InsertAfter,
+                {
+                    "target": last_import,
+                    "candidate": ast.parse(f"import extra_{index}").body[0],
+                },
+            )
+        )
+    return operations
+
+
+def execute_sequentially(root: ast.AST, operations):
+    for operation in operations:
+        getattr(Runner, operation.action)(root, **operation.options)
+    ast.fix_missing_locations(root)
+
+
+def measure(size: int, execute):
+    module = build_module(size)
+    operations = build_operations(module)
+    start = perf_counter()
+    execute(module, operations)
+    return perf_counter() - start, ast.dump(module)
+
+
+def main(sizes):
+    print(f"{'statements':>10} {'sequential':>12} {'batched':>12}")
+    for size in sizes:
+        sequential, expected = measure(size, execute_sequentially)
+        batched, out = measure(size, Runner.execute)
+        assert out == expected
+        print(f"{size:>10} {sequential:>11.4f}s {batched:>11.4f}s")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 5000])
+    main(parser.parse_args().sizes)
@@ -0,0 +1,94 @@
+"""Times the cold start of a generated project migrated with the eager and the
+lazy entrypoint: importing `main` in a fresh interpreter, then serving a first
+request. Requires the dependencies of migrated apps (fastapi,
+fastapi-restful, httpx...).
+
+    python -m benchmarks.cold_start --apps 50 --routes 1000
+
+`--payloads pydantic` is needed where pydantic rejects `typing.TypedDict`
+payloads (Python < 3.12).
+"""
+import subprocess
+import sys
+from argparse import ArgumentParser
+from statistics import median
+from tempfile import TemporaryDirectory
+
+from benchmarks.generator import ProjectShape, generate_project
+
+MEASURE = """
+from time import perf_counter
+start = perf_counter()
+from main import app
+imported = perf_counter()
+from fastapi.testclient import TestClient
+TestClient(app).get({path!r})
+print(imported - start, perf_counter() - imported)
+"""
+
+
+def migrate(urls_path: str, destination: str, entrypoint: str, payloads: str):
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "django_to_fastapi",
+            urls_path,
+            destination,
+            "--no-cache",
+            "--entrypoint",
+            entrypoint,
+            "--payloads",
+            payloads,
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+
+def measure(destination: str, path: str, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", MEASURE.format(path=path)],
+            cwd=destination,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        timings.append([float(timing) for timing in output.split()])
+    return (
+        median(timing[0] for timing in timings),
+        median(timing[1] for timing in timings),
+    )
+
+
+def main(shape: ProjectShape, repeat: int, payloads: str = "typeddict"):
+    with TemporaryDirectory() as source, TemporaryDirectory() as destination:
+        urls_path = generate_project(source, shape)
+        results = {}
+        for entrypoint in ("eager", "lazy"):
+            migrate(urls_path, destination, entrypoint, payloads)
+            results[entrypoint] = measure(destination, "/app_0/", repeat)
+    for entrypoint, (startup, first_request) in results.items():
+        print(
+            f"{entrypoint:>5}: startup {startup * 1000:.0f}ms,"
+            f" first request {first_request * 1000:.0f}ms"
+        )
+    print(f"startup speedup: {results['eager'][0] / results['lazy'][0]:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--apps", type=int, default=50)
+    parser.add_argument("--routes", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--payloads", choices=("typeddict", "pydantic"), default="typeddict"
+    )
+    arguments = parser.parse_args()
+    main(
+        ProjectShape(apps=arguments.apps, routes=arguments.routes),
+        arguments.repeat,
+        arguments.payloads,
+    )
@@ -0,0 +1,87 @@
+"""Times dispatching a request to the last static route of a FastAPI app of
+growing route counts, with Starlette's scan and with `--static-routes`. The
+endpoint does nothing, what's left is routing. Requires fastapi.
+
+    python -m benchmarks.dispatch --routes 10 100 1000 5000
+"""
+import asyncio
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Sequence
+
+from django_to_fastapi.modules import generate_static_routes_module
+
+# A tenth of the routes have a parameter, as in migrated projects.
+PARAMETRIZED_RATIO = 10
+
+
+def build_app(routes: int, static_routes: bool):
+    from fastapi import FastAPI
+    from fastapi.responses import Response
+
+    app = FastAPI(openapi_url=None)
+
+    async def endpoint():
+        return Response()
+
+    for index in range(routes):
+        path = (
+            f"/items_{index}/{{pk}}"
+            if index % PARAMETRIZED_RATIO == 0
+            else f"/items_{index}"
+        )
+        app.add_api_route(path, endpoint, methods=["GET"])
+    if static_routes:
+        namespace = {}
+        exec(generate_static_routes_module(), namespace)
+        namespace["install_static_routes"](app)
+    return app
+
+
+async def dispatch(app, path: str, requests: int):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = perf_counter()
+    for _ in range(requests):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "server": ("testserver", 80),
+            "client": ("testclient", 50000),
+        }
+        await app(scope, receive, send)
+    return perf_counter() - start
+
+
+def main(route_counts: Sequence[int], requests: int):
+    print(f"{'routes':>7} {'scan':>10} {'static':>10}")
+    for routes in route_counts:
+        # Found last by the scan.
+        path = f"/items_{max(index for index in range(routes) if index % PARAMETRIZED_RATIO)}"
+        timings = [
+            asyncio.run(dispatch(build_app(routes, static_routes), path, requests))
+            / requests
+            * 1e6
+            for static_routes in (False, True)
+        ]
+        print(f"{routes:>7} {timings[0]:>8.1f}us {timings[1]:>8.1f}us")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--routes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--requests", type=int, default=2000)
+    arguments = parser.parse_args()
+    main(arguments.routes, arguments.requests)
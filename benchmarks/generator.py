@@ -0,0 +1,168 @@
+"""Generates synthetic Django/DRF projects shaped like `tests/fixtures`.
+
+    project/urls.py        root URLconf importing every view
+    project/settings.py
+    app_<n>/views.py       function views, CRUD class views, stateful class
+                           views and single action class views
+"""
+import os
+from dataclasses import asdict, dataclass
+from random import Random
+
+VIEW_SHAPES = ("function", "crud", "stateful", "action")
+
+
+@dataclass
+class ProjectShape:
+    apps: int = 4
+    routes: int = 40
+    # Relative weights of each shape of view, in `VIEW_SHAPES` order.
+    function_views: int = 4
+    crud_views: int = 1
+    stateful_views: int = 1
+    action_views: int = 2
+    # `request.data` / `request.query_params` accesses per view.
+    request_density: int = 4
+    seed: int = 0
+
+    def scaled(self, scale: int):
+        return ProjectShape(**{**asdict(self), "routes": self.routes * scale})
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def _request_accesses(count: int, prefix: str, indent: str):
+    lines = []
+    for index in range(count):
+        match index % 4:
+            case 0:
+                lines.append(f'{prefix}_{index} = request.data.get("{prefix}_{index}")')
+            case 1:
+                lines.append(
+                    f'{prefix}_{index} = request.data.get("{prefix}_{index}", "")'
+                )
+            case 2:
+                lines.append(
+                    f'{prefix}_{index} = request.query_params.get("{prefix}_{index}", "")'
+                )
+            case 3:
+                lines.append(
+                    f'{prefix}_{index} = request.query_params["{prefix}_{index}"]'
+                )
+    return "".join(f"{indent}{line}\n" for line in lines)
+
+
+def _response(count: int, prefix: str, indent: str):
+    keys = ", ".join(f'"{prefix}_{index}": {prefix}_{index}' for index in range(count))
+    return f"{indent}return Response({{{keys}}}, status=status.HTTP_200_OK)\n"
+
+
+def _function_view(name: str, density: int):
+    return (
+        f'@api_view(["POST"])\ndef {name}(request):\n'
+        + _request_accesses(density, "field", "    ")
+        + _response(density, "field", "    ")
+    )
+
+
+def _crud_view(name: str, density: int):
+    methods = "".join(
+        f"    def {method}(self, request):\n"
+        + _request_accesses(density, method, "        ")
+        + _response(density, method, "        ")
+        + "\n"
+        for method in ("get", "post", "put", "delete")
+    )
+    return f"class {name}(APIView):\n{methods}"
+
+
+def _stateful_view(name: str, density: int):
+    return (
+        f"class {name}(APIView):\n"
+        "    def get(self, request):\n"
+        + _request_accesses(density, "field", "        ")
+        + "        self.count = 1\n"
+        + _response(density, "field", "        ")
+    )
+
+
+def _action_view(name: str, density: int):
+    return (
+        f"class {name}(APIView):\n"
+        "    def post(self, request):\n"
+        + _request_accesses(density, "field", "        ")
+        + '        self.notify("created")\n'
+        + _response(density, "field", "        ")
+        + "\n"
+        "    def notify(self, message):\n"
+        "        return message\n"
+    )
+
+
+VIEW_FACTORIES = {
+    "function": _function_view,
+    "crud": _crud_view,
+    "stateful": _stateful_view,
+    "action": _action_view,
+}
+
+VIEWS_HEADER = """from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+"""
+
+
+def generate_project(destination: str, shape: ProjectShape):
+    """Writes the project under `destination`, returns the root urls.py path."""
+    random = Random(shape.seed)
+    weights = (
+        shape.function_views,
+        shape.crud_views,
+        shape.stateful_views,
+        shape.action_views,
+    )
+    views = {app: [] for app in range(shape.apps)}
+    for index in range(shape.routes):
+        view_shape = random.choices(VIEW_SHAPES, weights)[0]
+        name = f"view_{index}" if view_shape == "function" else f"Route{index}View"
+        views[index % shape.apps].append((view_shape, name))
+
+    imports = []
+    urlpatterns = []
+    for app, app_views in views.items():
+        if not app_views:
+            continue
+        os.makedirs(f"{destination}/app_{app}", exist_ok=True)
+        with open(f"{destination}/app_{app}/views.py", "w") as cursor:
+            cursor.write(
+                VIEWS_HEADER
+                + "\n\n".join(
+                    VIEW_FACTORIES[view_shape](name, shape.request_density)
+                    for view_shape, name in app_views
+                )
+            )
+        imports.append(
+            f"from app_{app}.views import " + ", ".join(name for _, name in app_views)
+        )
+        urlpatterns += [
+            f"    path('app_{app}/{name.lower()}', {name}),"
+            if view_shape == "function"
+            else f"    path('app_{app}/{name.lower()}', {name}.as_view()),"
+            for view_shape, name in app_views
+        ]
+
+    os.makedirs(f"{destination}/project", exist_ok=True)
+    with open(f"{destination}/project/settings.py", "w") as cursor:
+        cursor.write("DEBUG = False\n")
+    with open(f"{destination}/project/urls.py", "w") as cursor:
+        cursor.write(
+            "from django.urls import path\n"
+            + "\n".join(imports)
+            + "\n\nurlpatterns = [\n"
+            + "\n".join(urlpatterns)
+            + "\n]\n"
+        )
+    return f"{destination}/project/urls.py"
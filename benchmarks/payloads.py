@@ -0,0 +1,55 @@
+"""Times payload inference (`get_payload_inputs`) on a generated view module
+of about 2,000 lines.
+
+    python -m benchmarks.payloads --lines 2000
+"""
+import ast
+import logging
+from argparse import ArgumentParser
+from time import perf_counter
+
+from django_to_fastapi.payloads import get_payload_inputs
+
+STATEMENTS = [
+    'title_{index} = request.data.get("title_{index}")',
+    'content_{index} = request.data.get("content_{index}", "")',
+    'page_{index} = request.query_params.get("page_{index}", 1)',
+    'search_{index} = request.GET["search_{index}"]',
+    "user_{index} = request.user",
+    'if request.data.get("flag_{index}") is not None:\n'
+    '        flag_{index} = request.data["flag_{index}"]',
+]
+
+
+def build_view(lines: int):
+    body = []
+    index = 0
+    while len(body) < lines:
+        for statement in STATEMENTS:
+            body.extend(statement.format(index=index).split("\n"))
+        index += 1
+    body.append('return Response({"title": title_0}, status=201)')
+    return "def huge_view(request):\n    " + "\n    ".join(body) + "\n"
+
+
+def main(lines: int, repeat: int):
+    logging.disable(logging.WARNING)
+    source_code = build_view(lines)
+    timings = []
+    for _ in range(repeat):
+        node = ast.parse(source_code).body[0]
+        start = perf_counter()
+        inputs, _, _ = get_payload_inputs(node, "Bench")
+        timings.append(perf_counter() - start)
+    print(
+        f"{len(source_code.splitlines())} lines, {len(inputs)} inputs:"
+        f" best {min(timings):.4f}s over {repeat} runs"
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--lines", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    main(arguments.lines, arguments.repeat)
@@ -0,0 +1,103 @@
+"""Times serializing a handler's output as FastAPI does, with the payload
+declared as a TypedDict (`jsonable_encoder`) or as a Pydantic model set as
+`response_model` (validated and dumped by pydantic-core), then rendered by
+`JSONResponse`. Requires fastapi and pydantic 2.
+
+    python -m benchmarks.serialization --fields 20 --items 1000
+"""
+import ast
+import json
+import logging
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Any, Optional, Union
+
+from django_to_fastapi.config import Config
+from django_to_fastapi.payloads import get_definition_name, get_payload_inputs
+
+VALUES = ['"name"', "42", "3.5", "True", '[1, 2, 3]', '{"nested": "value"}']
+
+
+def build_view(fields: int):
+    items = ", ".join(
+        f'"field_{index}": {VALUES[index % len(VALUES)]}' for index in range(fields)
+    )
+    return f"def view(request):\n    return Response({{{items}}})\n"
+
+
+def define_output_model(source_code: str):
+    """Output model of the view migrated with Pydantic payloads, and the value
+    it returns."""
+    from pydantic import BaseModel, ConfigDict, Field
+
+    Config.payloads = "pydantic"
+    node = ast.parse(source_code).body[0]
+    _, _, payload_output = get_payload_inputs(node)
+    definition = ast.fix_missing_locations(
+        ast.Module(body=[payload_output.unwrap()], type_ignores=[])
+    )
+    namespace = dict(
+        Any=Any,
+        Optional=Optional,
+        Union=Union,
+        BaseModel=BaseModel,
+        ConfigDict=ConfigDict,
+        Field=Field,
+    )
+    exec(compile(definition, "<payloads>", "exec"), namespace)
+    value = eval(ast.unparse(node.body[-1].value))
+    return namespace[get_definition_name(payload_output.unwrap())], value
+
+
+def time_runs(serialize, value, items: int, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(items):
+            serialize(value)
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+def main(fields: int, items: int, repeat: int):
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    logging.disable(logging.WARNING)
+    source_code = build_view(fields)
+    model, value = define_output_model(source_code)
+    adapter = TypeAdapter(model)
+
+    def render(content):
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    timings = {
+        "typeddict": time_runs(
+            lambda value: render(jsonable_encoder(value)), value, items, repeat
+        ),
+        "pydantic": time_runs(
+            lambda value: render(
+                adapter.dump_python(adapter.validate_python(value), mode="json")
+            ),
+            value,
+            items,
+            repeat,
+        ),
+    }
+    for payloads, timing in timings.items():
+        print(
+            f"{payloads:>9}: {timing / items * 1e6:.1f}us per response of {fields}"
+            f" fields, best of {repeat} runs"
+        )
+    print(f"pydantic speedup: {timings['typeddict'] / timings['pydantic']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--fields", type=int, default=20)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    main(arguments.fields, arguments.items, arguments.repeat)
@@ -0,0 +1,104 @@
+"""Times each stage of the codemod on a generated project.
+
+Stages run in the same order as `__main__.main` and `modules.process_code`,
+but separately so each one gets its own timing. `InputCollector` runs inside
+`Migrator`, its time is subtracted from the latter.
+"""
+import ast
+import logging
+import os
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict
+
+from django_to_fastapi.ast_operations import Runner
+from django_to_fastapi.modules import Migrator, RemoveImports
+from django_to_fastapi.payloads import InputCollector
+from django_to_fastapi.routes import (
+    get_modules_from_routes,
+    get_routes,
+    resolve_routes,
+)
+from django_to_fastapi.utils import Formatter, read_file, unparse
+
+STAGES = (
+    "get_routes",
+    "get_modules_from_routes",
+    "resolve_routes",
+    "Migrator",
+    "InputCollector",
+    "Runner.execute",
+    "RemoveImports",
+    "unparse",
+)
+
+
+class StageTimer:
+    def __init__(self):
+        self.timings: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += perf_counter() - start
+
+    @contextmanager
+    def timed_input_collector(self):
+        collect = InputCollector.collect
+        timer = self
+
+        def timed_collect(self, node):
+            with timer.stage("InputCollector"):
+                return collect(self, node)
+
+        InputCollector.collect = timed_collect
+        try:
+            yield
+        finally:
+            InputCollector.collect = collect
+
+
+def run_stages(urls_path: str):
+    """Runs the whole pipeline once, returns seconds spent per stage and the
+    size of what was migrated."""
+    logging.disable(logging.WARNING)
+    # Formatted code is cached by content, repeated runs would not format.
+    Formatter.cache.clear()
+    timer = StageTimer()
+    urls_source_code = read_file(urls_path)
+
+    with timer.stage("get_routes"):
+        routes = get_routes(urls_source_code)
+    with timer.stage("get_modules_from_routes"):
+        modules = get_modules_from_routes(urls_source_code, routes)
+    with timer.stage("resolve_routes"):
+        routes = resolve_routes(urls_path)
+
+    root_path = os.sep.join(urls_path.split(os.sep)[0:-2])
+    lines = 0
+    with timer.timed_input_collector():
+        for module in modules:
+            source_code = read_file(root_path + "/" + module + ".py")
+            lines += source_code.count("\n")
+            tree = ast.parse(source_code)
+
+            with timer.stage("Migrator"):
+                migrator = Migrator(routes, module)
+                migrator.visit(tree)
+            with timer.stage("Runner.execute"):
+                Runner.execute(tree, migrator.operations)
+            with timer.stage("RemoveImports"):
+                tree = RemoveImports().visit(tree)
+            with timer.stage("unparse"):
+                unparse(tree)
+
+    timer.timings["Migrator"] -= timer.timings["InputCollector"]
+    logging.disable(logging.NOTSET)
+    return timer.timings, {
+        "routes": len(routes),
+        "modules": len(modules),
+        "lines": lines,
+    }
@@ -0,0 +1,77 @@
+"""Measures the memory each gunicorn worker of a migrated app doesn't share:
+its unique set size (private clean and dirty pages, from Linux
+`/proc/<pid>/smaps_rollup`). Compare an app migrated with and without
+`--preload`:
+
+    python -m benchmarks.worker_rss output --workers 4
+"""
+import os
+import signal
+import subprocess
+import sys
+from argparse import ArgumentParser
+from time import sleep
+from typing import Dict, List
+
+
+def get_children(pid: int) -> List[int]:
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as file:
+            children += [int(child) for child in file.read().split()]
+    return children
+
+
+def get_memory(pid: int) -> Dict[str, int]:
+    """Resident, proportional and unique set sizes of a process, in kB."""
+    with open(f"/proc/{pid}/smaps_rollup") as file:
+        fields = {
+            line.split(":")[0]: int(line.split()[1])
+            for line in file
+            if line.split()[-1] == "kB"
+        }
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def main(path: str, workers: int, warmup: float):
+    master = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+        cwd=path,
+        env={**os.environ, "WEB_CONCURRENCY": str(workers)},
+    )
+    try:
+        sleep(warmup)
+        pids = get_children(master.pid)
+        if len(pids) < workers:
+            raise RuntimeError(f"{len(pids)} of {workers} workers started")
+        master_memory = get_memory(master.pid)
+        print(f"master: rss {master_memory['rss'] / 1024:.1f}MB")
+        memories = [get_memory(pid) for pid in pids]
+        for pid, memory in zip(pids, memories):
+            print(
+                f"worker {pid}: rss {memory['rss'] / 1024:.1f}MB,"
+                f" pss {memory['pss'] / 1024:.1f}MB,"
+                f" uss {memory['uss'] / 1024:.1f}MB"
+            )
+        print(
+            f"mean unique per worker: "
+            f"{sum(memory['uss'] for memory in memories) / len(memories) / 1024:.1f}MB"
+        )
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("path", help="directory of the migrated app")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--warmup", type=float, default=5, help="seconds to wait for workers"
+    )
+    arguments = parser.parse_args()
+    main(arguments.path, arguments.workers, arguments.warmup)
@@ -1,58 +1,238 @@
+import json
 import os
-import shutil
-from sys import argv
+from argparse import ArgumentParser
+from typing import Optional
 
-from django_to_fastapi.modules import (
-    generate_bootstrap_module,
-    generate_entrypoint,
-    process_code,
-)
-from django_to_fastapi.routes import get_modules_from_routes, get_routes
-from django_to_fastapi.utils import Logger, unparse
+from django_to_fastapi.config import Config
+from django_to_fastapi.migration import ProjectMigration
+from django_to_fastapi.profiling import Profiler, ProfileReport
+from django_to_fastapi.utils import Logger
+from django_to_fastapi.watch import Watcher
 
 
-def _read_file(path: str):
-    with open(path) as cursor:
-        return cursor.read()
+def main(
+    urls_path: str,
+    destination_path: str,
+    jobs: int = 1,
+    use_cache: bool = True,
+    profile_path: Optional[str] = None,
+    profile_top: int = 10,
+    blocking_report_path: Optional[str] = None,
+):
+    project = ProjectMigration(urls_path, destination_path, jobs, use_cache)
+    modules = project.routes.modules
+    migrated_modules = project.run()
 
+    if profile_path:
+        report = ProfileReport()
+        for migrated in migrated_modules:
+            report.add(migrated.profile)
+        with open(profile_path, "w") as cursor:
+            json.dump(report.to_dict(top=profile_top), cursor, indent=2)
+    if blocking_report_path:
+        with open(blocking_report_path, "w") as cursor:
+            json.dump(project.get_blocking_calls(), cursor, indent=2)
+    print(
+        f"Finished with {Logger.warns_counter} warnings"
+        f" ({len(modules) - len(migrated_modules)} of {len(modules)} modules"
+        " unchanged)."
+    )
 
-def main(urls_path: str, destination_path: str):
-    urls_source_code = _read_file(urls_path)
-
-    routes = get_routes(urls_source_code)
-
-    modules = get_modules_from_routes(urls_source_code, routes)
-
-    root_path = os.sep.join(urls_path.split(os.sep)[0:-2])
-
-    for module in modules:
-        Logger.current_module = module
-        source_code = _read_file(root_path + "/" + module + ".py")
-        # fix_missing_annotations(source_code)
-        migrated = process_code(source_code, routes)
-        os.makedirs(os.path.dirname(destination_path + "/" + module), exist_ok=True)
-        with open(destination_path + "/" + module + ".py", "w") as cursor:
-            cursor.write(unparse(migrated))
 
-    with open(destination_path + "/bootstrap.py", "w") as cursor:
-        cursor.write(generate_bootstrap_module())
+def watch(
+    urls_path: str,
+    destination_path: str,
+    jobs: int = 1,
+    use_cache: bool = True,
+    interval: float = 0.1,
+):
+    project = ProjectMigration(urls_path, destination_path, jobs, use_cache)
+    Watcher(project, interval).watch()
 
-    with open(destination_path + "/main.py", "w") as cursor:
-        cursor.write(generate_entrypoint(modules))
 
-    os.makedirs(destination_path + "/conf", exist_ok=True)
-    shutil.copyfile(
-        os.sep.join(urls_path.split(os.sep)[0:-1]) + "/settings.py",
-        destination_path + "/conf/settings.py",
+def parse_args(args=None):
+    parser = ArgumentParser(prog="django_to_fastapi")
+    parser.add_argument("urls_path", help="path to the root urls.py")
+    parser.add_argument("destination_path", nargs="?", default="./output")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes, 0 to use every core (default: 1)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="migrate every module, ignoring and not updating the cache",
+    )
+    parser.add_argument(
+        "--formatter",
+        choices=("none", "black", "batch"),
+        default="black",
+        help="black formats each module in-process, batch formats every written"
+        " file at the end with black's own cache and workers (default: black)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="REPORT_PATH",
+        help="write a JSON report of time and memory spent per module and stage"
+        " (only migrated modules are profiled, see --no-cache)",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        help="number of slowest modules listed in the report (default: 10)",
+    )
+    parser.add_argument(
+        "--cprofile-module",
+        metavar="MODULE",
+        help="with --profile, also dump cProfile stats of this module"
+        " (as in app/views) next to the report",
+    )
+    parser.add_argument(
+        "--blocking-calls",
+        choices=("ignore", "sync", "threadpool"),
+        default="sync",
+        help="handlers calling the Django ORM, requests, time.sleep, files..."
+        " become a plain def run in FastAPI's threadpool (sync), get those calls"
+        " wrapped in run_in_threadpool (threadpool), or are only reported"
+        " (ignore) (default: sync)",
+    )
+    parser.add_argument(
+        "--no-async-orm",
+        dest="async_orm",
+        action="store_false",
+        help="keep ORM calls synchronous instead of using Django's async API"
+        " (aget, acreate, asave, async for...)",
+    )
+    parser.add_argument(
+        "--models",
+        choices=("django", "sqlalchemy"),
+        default="django",
+        help="translate the models.py of each app with routed views to SQLAlchemy"
+        " 2.0 models, with an async engine built from settings.DATABASES"
+        " (default: django)",
     )
-    print(f"Finished with {Logger.warns_counter} warnings.")
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=5,
+        help="with --models sqlalchemy, default size of the connection pool,"
+        " DATABASE_POOL_SIZE overrides it at runtime (default: 5)",
+    )
+    parser.add_argument(
+        "--max-overflow",
+        type=int,
+        default=10,
+        help="with --models sqlalchemy, default number of connections opened"
+        " beyond the pool, DATABASE_MAX_OVERFLOW overrides it (default: 10)",
+    )
+    parser.add_argument(
+        "--responses",
+        choices=("json", "orjson", "fast"),
+        default="json",
+        help="response class of handlers and default one of the app: FastAPI's"
+        " JSONResponse, ORJSONResponse (requires orjson), or a bundled"
+        " FastJSONResponse using orjson when installed and compact stdlib json"
+        " otherwise (default: json)",
+    )
+    parser.add_argument(
+        "--payloads",
+        choices=("typeddict", "pydantic"),
+        default="typeddict",
+        help="declare inferred payloads as TypedDict, or as Pydantic v2 models"
+        " set as the response_model of routes (default: typeddict)",
+    )
+    parser.add_argument(
+        "--entrypoint",
+        choices=("eager", "lazy"),
+        default="eager",
+        help="have main.py include every router at startup (eager), or import"
+        " the modules serving each first path segment on its first request"
+        " (lazy) (default: eager)",
+    )
+    parser.add_argument(
+        "--static-routes",
+        action="store_true",
+        help="resolve paths without parameters with a dict lookup rather than"
+        " Starlette's scan of every route",
+    )
+    parser.add_argument(
+        "--preload",
+        action="store_true",
+        help="have gunicorn import the app once before forking workers, with"
+        " gc.freeze() so they keep sharing its memory",
+    )
+    parser.add_argument(
+        "--blocking-report",
+        metavar="REPORT_PATH",
+        help="write a JSON report of blocking calls found per module and route",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="stay resident and migrate modules again as they are edited",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=0.1,
+        metavar="SECONDS",
+        help="how often --watch polls the project for changes (default: 0.1)",
+    )
+    arguments = parser.parse_args(args)
+    if arguments.watch and arguments.profile:
+        parser.error("--profile cannot be used with --watch")
+    if arguments.cprofile_module and not arguments.profile:
+        parser.error("--cprofile-module requires --profile")
+    return arguments
 
 
-try:
-    destination_path = argv[2]
-except IndexError:
-    destination_path = "./output"
-try:
-    main(urls_path=argv[1], destination_path=destination_path)
-except IndexError:
-    print("Path to urls.py should be provided as a position argument")
+if __name__ == "__main__":
+    arguments = parse_args()
+    Config.update(
+        formatter=arguments.formatter,
+        blocking_calls=arguments.blocking_calls,
+        async_orm=arguments.async_orm,
+        models=arguments.models,
+        pool_size=arguments.pool_size,
+        max_overflow=arguments.max_overflow,
+        responses=arguments.responses,
+        payloads=arguments.payloads,
+        preload=arguments.preload,
+        entrypoint=arguments.entrypoint,
+        static_routes=arguments.static_routes,
+    )
+    Profiler.configure(
+        enabled=bool(arguments.profile),
+        cprofile_module=arguments.cprofile_module,
+        cprofile_path=(
+            os.path.splitext(arguments.profile)[0]
+            + "."
+            + arguments.cprofile_module.replace("/", ".")
+            + ".prof"
+        )
+        if arguments.profile and arguments.cprofile_module
+        else None,
+    )
+    if arguments.watch:
+        watch(
+            urls_path=arguments.urls_path,
+            destination_path=arguments.destination_path,
+            jobs=arguments.jobs or os.cpu_count() or 1,
+            use_cache=arguments.use_cache,
+            interval=arguments.watch_interval,
+        )
+    else:
+        main(
+            urls_path=arguments.urls_path,
+            destination_path=arguments.destination_path,
+            jobs=arguments.jobs or os.cpu_count() or 1,
+            use_cache=arguments.use_cache,
+            profile_path=arguments.profile,
+            profile_top=arguments.profile_top,
+            blocking_report_path=arguments.blocking_report,
+        )
@@ -3,6 +3,8 @@ from enum import Enum
 from dataclasses import dataclass
 from typing import List, TypedDict
 
+from django_to_fastapi.profiling import Profiler
+
 
 Options = TypedDict(
     "Options", {"candidate": ast.AST, "target": ast.AST, "position": int}, total=False
@@ -39,11 +41,132 @@ def find_field(root: ast.AST, target: ast.AST):
                     return field
 
 
+class _Cell:
+    __slots__ = ("node", "previous", "next")
+
+    def __init__(self, node):
+        self.node = node
+        self.previous: "_Cell" = None
+        self.next: "_Cell" = None
+
+
+class _LinkedNodes:
+    """Doubly linked list over the items of a list field, so that inserting
+    around or removing a known item doesn't shift the whole list."""
+
+    def __init__(self, items: list):
+        self.items = items
+        self.head = _Cell(None)
+        self.head.previous = self.head.next = self.head
+        self.cells = [self.append(item) for item in items]
+
+    def append(self, node):
+        return self.link_before(self.head, node)
+
+    def link_before(self, cell: _Cell, node):
+        new_cell = _Cell(node)
+        new_cell.previous, new_cell.next = cell.previous, cell
+        cell.previous.next = new_cell
+        cell.previous = new_cell
+        return new_cell
+
+    def link_after(self, cell: _Cell, node):
+        return self.link_before(cell.next, node)
+
+    def unlink(self, cell: _Cell):
+        cell.previous.next = cell.next
+        cell.next.previous = cell.previous
+
+    def __iter__(self):
+        cell = self.head.next
+        while cell is not self.head:
+            yield cell
+            cell = cell.next
+
+    def rebuild(self):
+        # In place, as callers may hold a reference to the field list.
+        self.items[:] = [cell.node for cell in self]
+
+
+class OperationApplier:
+    """Applies a batch of operations on the direct children of `root`.
+
+    Children are indexed once as node -> (field, cell), edits are applied to
+    linked lists and each touched list field is rebuilt in a single pass, so a
+    batch costs O(operations + children) instead of O(operations * children).
+    Results are the same as applying each operation in turn on the fields.
+    """
+
+    def __init__(self, root: ast.AST):
+        self.root = root
+        self.fields: dict = {}
+        self.index: dict = {}
+        for field, child in ast.iter_fields(root):
+            if isinstance(child, ast.AST):
+                self.index[id(child)] = (child, field, None)
+            elif isinstance(child, list):
+                self.fields[field] = _LinkedNodes(child)
+                for cell in self.fields[field].cells:
+                    self.index[id(cell.node)] = (cell.node, field, cell)
+
+    def locate(self, target: ast.AST):
+        node, field, cell = self.index.get(id(target), (None, None, None))
+        if node is not target:
+            raise ValueError(f"{ast.dump(target)[:80]} is not a child of the root")
+        return field, cell
+
+    def register(self, node: ast.AST, field: str, cell: _Cell):
+        self.index[id(node)] = (node, field, cell)
+
+    def replace(self, target: ast.AST, candidate: ast.AST):
+        field, cell = self.locate(target)
+        del self.index[id(target)]
+        if cell is None:
+            setattr(self.root, field, candidate)
+        else:
+            cell.node = candidate
+        self.register(candidate, field, cell)
+
+    def remove(self, target: ast.AST):
+        field, cell = self.locate(target)
+        del self.index[id(target)]
+        if cell is None:
+            setattr(self.root, field, None)
+        else:
+            self.fields[field].unlink(cell)
+
+    def insert_before(self, target: ast.AST, candidate: ast.AST):
+        field, cell = self.locate(target)
+        self.register(candidate, field, self.fields[field].link_before(cell, candidate))
+
+    def insert_after(self, target: ast.AST, candidate: ast.AST):
+        field, cell = self.locate(target)
+        self.register(candidate, field, self.fields[field].link_after(cell, candidate))
+
+    def insert_last(self, target: ast.AST):
+        self.register(target, "body", self.fields["body"].append(target))
+
+    def insert(self, target: ast.AST, position: int):
+        nodes = self.fields["body"]
+        cells = list(nodes)
+        if position < 0:
+            position = max(len(cells) + position, 0)
+        anchor = cells[position] if position < len(cells) else nodes.head
+        self.register(target, "body", nodes.link_before(anchor, target))
+
+    def apply(self):
+        for nodes in self.fields.values():
+            nodes.rebuild()
+
+
 class Runner:
     @classmethod
     def execute(cls, root: ast.AST, operations: List[ASTOperation]):
+        Profiler.count_operations(len(operations))
+        applier = OperationApplier(root)
         for operation in operations:
-            getattr(cls, operation.action)(root, **operation.options)
+            getattr(applier, operation.action)(**operation.options)
+        applier.apply()
         ast.fix_missing_locations(root)
 
     @staticmethod
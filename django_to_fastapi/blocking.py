@@ -0,0 +1,464 @@
+import ast
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional, Set, Union
+
+from django_to_fastapi.config import Config
+from django_to_fastapi.utils import Logger
+
+BLOCKING_KIND = Literal["orm", "http", "sleep", "file", "subprocess", "mail", "helper"]
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+
+# QuerySet and manager methods hitting the database, the others return lazy
+# querysets which only block once iterated.
+QUERYSET_METHODS = {
+    "get",
+    "first",
+    "last",
+    "earliest",
+    "latest",
+    "count",
+    "exists",
+    "contains",
+    "create",
+    "get_or_create",
+    "update_or_create",
+    "bulk_create",
+    "bulk_update",
+    "in_bulk",
+    "update",
+    "delete",
+    "aggregate",
+    "iterator",
+    "explain",
+}
+MODEL_METHODS = {"save", "delete", "refresh_from_db", "full_clean"}
+MANAGERS = {"objects", "_default_manager"}
+# Builtins consuming their argument, blocking when it is a queryset.
+CONSUMERS = {"list", "tuple", "set", "sorted", "len", "bool", "sum", "dict"}
+
+BLOCKING_FUNCTIONS: Dict[str, BLOCKING_KIND] = {
+    "open": "file",
+    "time.sleep": "sleep",
+    "os.system": "subprocess",
+    "os.remove": "file",
+    "os.unlink": "file",
+    "os.rename": "file",
+    "os.listdir": "file",
+    "os.makedirs": "file",
+    "urllib.request.urlopen": "http",
+    "django.shortcuts.get_object_or_404": "orm",
+    "django.shortcuts.get_list_or_404": "orm",
+    "django.core.mail.send_mail": "mail",
+    "django.core.mail.send_mass_mail": "mail",
+    "django.core.mail.mail_admins": "mail",
+    "django.db.transaction.atomic": "orm",
+}
+# Context managers entered by the handler, which can't be run in a thread.
+UNWRAPPABLE_FUNCTIONS = {"django.db.transaction.atomic"}
+BLOCKING_PACKAGES: Dict[str, BLOCKING_KIND] = {
+    "requests.": "http",
+    "httpx.": "http",
+    "urllib3.": "http",
+    "subprocess.": "subprocess",
+    "shutil.": "file",
+    "smtplib.": "mail",
+}
+# Async APIs of the packages above.
+NON_BLOCKING_FUNCTIONS = {"httpx.AsyncClient"}
+
+
+@dataclass
+class BlockingCall:
+    node: ast.expr
+    kind: BLOCKING_KIND
+    # Whether the call can be awaited where it is, which is not the case
+    # inside a generator expression.
+    wrappable: bool = True
+    # Whether `node` is a queryset blocking because it is iterated.
+    iterated: bool = False
+
+    @property
+    def name(self):
+        return ast.unparse(
+            self.node.func if isinstance(self.node, ast.Call) else self.node
+        )
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "call": ast.unparse(self.node),
+            "line": getattr(self.node, "lineno", None),
+        }
+
+
+class BlockingCalls:
+    """Blocking calls found in the handlers of the module being migrated.
+
+    Like `Logger`, state is held by the class so `migrate_module` can collect
+    the report of each module, whichever process migrates it.
+    """
+
+    records: List[Dict] = []
+
+
+def get_imported_names(module: ast.Module) -> Dict[str, str]:
+    """Qualified name of each name imported at the top of `module`."""
+    names = {}
+    for node in module.body:
+        match node:
+            case ast.Import(names=aliases):
+                for alias in aliases:
+                    if alias.asname:
+                        names[alias.asname] = alias.name
+                    else:
+                        head = alias.name.split(".")[0]
+                        names[head] = head
+            case ast.ImportFrom(module=str(base), level=0, names=aliases):
+                for alias in aliases:
+                    names[alias.asname or alias.name] = base + "." + alias.name
+    return names
+
+
+def get_qualified_name(node: ast.expr, imports: Dict[str, str]) -> Optional[str]:
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(imports.get(node.id, node.id))
+    return ".".join(reversed(parts))
+
+
+def has_manager(node: ast.expr):
+    """Whether `node` is a chain of calls starting from a model manager."""
+    while isinstance(node, (ast.Attribute, ast.Call)):
+        if isinstance(node, ast.Call):
+            node = node.func
+        elif node.attr in MANAGERS:
+            return True
+        else:
+            node = node.value
+    return False
+
+
+def is_lazy_queryset(node: ast.expr):
+    match node:
+        case ast.Call(func=ast.Attribute(attr=attr, value=value)):
+            return attr not in QUERYSET_METHODS and has_manager(value)
+        case ast.Attribute(attr=attr, value=value):
+            return attr in MANAGERS or has_manager(value)
+    return False
+
+
+class BlockingCallsFinder(ast.NodeVisitor):
+    """Collects blocking calls of a function body, nested functions, lambdas
+    and classes aside as they don't run when the function does."""
+
+    def __init__(
+        self,
+        imports: Dict[str, str],
+        helpers: Set[str] = frozenset(),
+        class_name: Optional[str] = None,
+    ):
+        self.imports = imports
+        # Plain functions of the module calling blocking APIs, as "name" or
+        # "Class.method".
+        self.helpers = helpers
+        self.class_name = class_name
+        self.calls: List[BlockingCall] = []
+        self.awaits = False
+        self.generators = 0
+
+    def find(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]):
+        for statement in node.body:
+            self.visit(statement)
+        return self.calls
+
+    def add(self, node: ast.expr, kind: BLOCKING_KIND, iterated: bool = False):
+        self.calls.append(
+            BlockingCall(node, kind, wrappable=not self.generators, iterated=iterated)
+        )
+
+    def visit_FunctionDef(self, node):
+        return
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_Lambda = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
+
+    def visit_Await(self, node):
+        self.awaits = True
+        self.generic_visit(node)
+
+    visit_AsyncFor = visit_Await
+    visit_AsyncWith = visit_Await
+
+    def visit_GeneratorExp(self, node):
+        self.generators += 1
+        self.generic_visit(node)
+        self.generators -= 1
+
+    def visit_For(self, node):
+        if is_lazy_queryset(node.iter):
+            self.add(node.iter, "orm", iterated=True)
+        self.generic_visit(node)
+
+    def visit_comprehension(self, node):
+        if node.is_async:
+            self.awaits = True
+        elif is_lazy_queryset(node.iter):
+            self.add(node.iter, "orm", iterated=True)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        kind = self.get_kind(node)
+        if kind is not None:
+            self.add(node, kind)
+            if get_qualified_name(node.func, self.imports) in UNWRAPPABLE_FUNCTIONS:
+                self.calls[-1].wrappable = False
+        self.generic_visit(node)
+
+    def get_kind(self, node: ast.Call) -> Optional[BLOCKING_KIND]:
+        match node.func:
+            case ast.Name(id=name) if name in self.helpers:
+                return "helper"
+            case ast.Attribute(value=ast.Name(id="self"), attr=attr) if (
+                f"{self.class_name}.{attr}" in self.helpers
+            ):
+                return "helper"
+            case ast.Attribute(attr=attr, value=value) if has_manager(value):
+                return "orm" if attr in QUERYSET_METHODS else None
+            case ast.Attribute(attr=attr, value=value) if attr in MODEL_METHODS:
+                return (
+                    None
+                    if isinstance(value, ast.Name) and value.id == "self"
+                    else "orm"
+                )
+            case ast.Name(id=name) if name in CONSUMERS:
+                return (
+                    "orm"
+                    if name not in self.imports
+                    and node.args
+                    and is_lazy_queryset(node.args[0])
+                    else None
+                )
+
+        qualified_name = get_qualified_name(node.func, self.imports)
+        if qualified_name is None or qualified_name in NON_BLOCKING_FUNCTIONS:
+            return None
+        if qualified_name in BLOCKING_FUNCTIONS:
+            return BLOCKING_FUNCTIONS[qualified_name]
+        return next(
+            (
+                kind
+                for package, kind in BLOCKING_PACKAGES.items()
+                if qualified_name.startswith(package)
+            ),
+            None,
+        )
+
+
+def wrap_in_threadpool(call: BlockingCall, node: ast.expr, nested: bool):
+    """`await run_in_threadpool(...)` running `node` in a worker thread; as a
+    lambda when `node` holds other blocking calls so they run there too."""
+    if call.iterated:
+        # The queryset is evaluated in the worker thread.
+        node = ast.Call(func=ast.Name(id="list"), args=[node], keywords=[])
+    match node:
+        case ast.Call() if not nested:
+            args = [node.func, *node.args]
+            keywords = node.keywords
+        case _:
+            args = [ast.Lambda(args=_no_arguments(), body=node)]
+            keywords = []
+    return ast.copy_location(
+        ast.Await(
+            value=ast.Call(
+                func=ast.Name(id="run_in_threadpool"), args=args, keywords=keywords
+            )
+        ),
+        call.node,
+    )
+
+
+def _no_arguments():
+    return ast.arguments(
+        posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[]
+    )
+
+
+class _Wrapper(ast.NodeTransformer):
+    def __init__(self, calls: List[BlockingCall]):
+        self.calls = {id(call.node): call for call in calls if call.wrappable}
+
+    def visit(self, node):
+        if id(node) not in self.calls:
+            return super().visit(node)
+        nested = any(
+            id(child) in self.calls
+            for child in ast.walk(node)
+            if child is not node and not isinstance(child, ast.Await)
+        )
+        has_await = any(isinstance(child, ast.Await) for child in ast.walk(node))
+        call = self.calls[id(node)]
+        if nested and not has_await:
+            return wrap_in_threadpool(call, node, nested=True)
+        return wrap_in_threadpool(call, super().generic_visit(node), nested=False)
+
+
+def get_route(
+    node: ast.AsyncFunctionDef, prefixes: Dict[str, str]
+) -> Optional[Dict[str, str]]:
+    for decorator in node.decorator_list:
+        match decorator:
+            case ast.Call(
+                func=ast.Attribute(attr=method, value=ast.Name(id=router)),
+                args=[ast.Constant(value=str(path)), *_],
+            ) if method in HTTP_METHODS:
+                prefix = prefixes.get(router, "")
+                return {
+                    "method": method,
+                    "path": prefix if prefix and path == "/" else prefix + path,
+                }
+    return None
+
+
+def get_router_prefixes(module: ast.Module) -> Dict[str, str]:
+    prefixes = {}
+    for node in module.body:
+        match node:
+            case ast.Assign(
+                targets=[ast.Name(id=name)],
+                value=ast.Call(func=ast.Name(id="InferringRouter"), keywords=keywords),
+            ):
+                for keyword in keywords:
+                    if keyword.arg == "prefix" and isinstance(
+                        keyword.value, ast.Constant
+                    ):
+                        prefixes[name] = keyword.value.value
+    return prefixes
+
+
+class BlockingCallsHandler(ast.NodeTransformer):
+    """Keeps migrated `async def` handlers from blocking the event loop.
+
+    Handlers calling the synchronous Django ORM, `requests`, `time.sleep`,
+    file I/O and the like become plain `def`, which FastAPI runs in its
+    threadpool, or get those calls wrapped in `run_in_threadpool`, according to
+    `Config.blocking_calls`. What was found is recorded per route in
+    `BlockingCalls.records`.
+    """
+
+    def __init__(self, module: ast.Module):
+        self.imports = get_imported_names(module)
+        self.prefixes = get_router_prefixes(module)
+        self.helpers = self.get_blocking_helpers(module)
+        self.class_name: Optional[str] = None
+        self.uses_threadpool = False
+
+    def get_blocking_helpers(self, module: ast.Module) -> Set[str]:
+        """Plain functions and methods calling blocking APIs, directly or
+        through one another."""
+        functions = [
+            (node.name, node, None)
+            for node in module.body
+            if isinstance(node, ast.FunctionDef)
+        ] + [
+            (f"{node.name}.{item.name}", item, node.name)
+            for node in module.body
+            if isinstance(node, ast.ClassDef)
+            for item in node.body
+            if isinstance(item, ast.FunctionDef)
+        ]
+        helpers: Set[str] = set()
+        while True:
+            found = {
+                key
+                for key, node, class_name in functions
+                if BlockingCallsFinder(self.imports, helpers, class_name).find(node)
+            }
+            if found == helpers:
+                return helpers
+            helpers = found
+
+    def visit_ClassDef(self, node):
+        self.class_name = node.name
+        self.generic_visit(node)
+        self.class_name = None
+        return node
+
+    def visit_AsyncFunctionDef(self, node):
+        finder = BlockingCallsFinder(self.imports, self.helpers, self.class_name)
+        calls = finder.find(node)
+        self.generic_visit(node)
+        if not calls:
+            return node
+
+        wrappable = all(call.wrappable for call in calls)
+        match Config.blocking_calls:
+            case "sync" if not finder.awaits:
+                action = "sync"
+            case "threadpool" if not wrappable and not finder.awaits:
+                action = "sync"
+            case "sync" | "threadpool":
+                action = "threadpool"
+            case _:
+                action = "ignore"
+
+        names = ", ".join(sorted({call.name for call in calls}))
+        unwrapped = [call for call in calls if not call.wrappable]
+        if action == "sync":
+            result = ast.copy_location(
+                ast.FunctionDef(
+                    name=node.name,
+                    args=node.args,
+                    body=node.body,
+                    decorator_list=node.decorator_list,
+                    returns=node.returns,
+                    type_comment=node.type_comment,
+                ),
+                node,
+            )
+            Logger.print_info(
+                f"Blocking calls to {names} in {node.name}, emitted as a plain def",
+                line=node.lineno,
+            )
+            unwrapped = []
+        elif action == "threadpool":
+            _Wrapper(calls).visit(node)
+            self.uses_threadpool = True
+            result = node
+            Logger.print_info(
+                f"Blocking calls to {names} in {node.name}, run in the threadpool",
+                line=node.lineno,
+            )
+        else:
+            result = node
+            unwrapped = calls
+
+        for call in unwrapped:
+            Logger.print_warn(
+                f"Blocking {call.kind} call in async def {node.name}",
+                sample_code=ast.unparse(call.node) + "\n",
+                line=getattr(call.node, "lineno", -1),
+            )
+
+        BlockingCalls.records.append(
+            {
+                "handler": node.name,
+                "route": get_route(node, self.prefixes),
+                "line": node.lineno,
+                "action": action,
+                "calls": [call.to_dict() for call in calls],
+            }
+        )
+        return result
+
+
+def handle_blocking_calls(module: ast.Module):
+    """Returns whether `run_in_threadpool` has to be imported."""
+    handler = BlockingCallsHandler(module)
+    handler.visit(module)
+    return handler.uses_threadpool
@@ -0,0 +1,887 @@
+import ast
+from typing import Dict, Iterable, List, Optional
+
+from django_to_fastapi.blocking import get_imported_names, get_qualified_name
+from django_to_fastapi.utils import format_string
+
+# Django's per-view cache decorators, same-named in `caching.py`.
+CACHE_DECORATORS = (
+    "cache_control",
+    "cache_page",
+    "never_cache",
+    "vary_on_cookie",
+    "vary_on_headers",
+)
+
+
+# Methods of Django's cache API, awaited as their async counterparts.
+ASYNC_CACHE_METHODS = {
+    method: "a" + method
+    for method in (
+        "add",
+        "get",
+        "set",
+        "touch",
+        "delete",
+        "get_many",
+        "set_many",
+        "delete_many",
+        "clear",
+        "get_or_set",
+        "has_key",
+        "incr",
+        "decr",
+        "incr_version",
+        "decr_version",
+        "close",
+    )
+}
+# Names of `django.core.cache` kept, imported from `cache.py`.
+CACHE_NAMES = {"cache", "caches", "DEFAULT_TIMEOUT"}
+
+
+def is_cache_decorator(decorator: ast.expr):
+    match decorator:
+        case ast.Call(func=ast.Name(id=name)) | ast.Name(id=name):
+            return name in CACHE_DECORATORS
+    return False
+
+
+def _unwrap(decorator: ast.expr, method: Optional[str] = None) -> List[ast.expr]:
+    """Cache decorators of `decorator`, out of `method_decorator(...)`. With
+    `method`, only those `method_decorator` applies to it with `name`."""
+    match decorator:
+        case ast.Call(func=ast.Name(id="method_decorator"), args=[wrapped, *_]):
+            name = next(
+                (
+                    keyword.value
+                    for keyword in decorator.keywords
+                    if keyword.arg == "name"
+                ),
+                None,
+            )
+            if method is not None and not (
+                isinstance(name, ast.Constant) and name.value in (method, "dispatch")
+            ):
+                return []
+            wrapped = (
+                wrapped.elts
+                if isinstance(wrapped, (ast.List, ast.Tuple))
+                else [wrapped]
+            )
+            return [item for item in wrapped if is_cache_decorator(item)]
+        case _ if method is None and is_cache_decorator(decorator):
+            return [decorator]
+    return []
+
+
+def get_cache_decorators(decorators: Iterable[ast.expr]) -> List[ast.expr]:
+    """Cache decorators of a function view, its other decorators are dropped."""
+    return [item for decorator in decorators for item in _unwrap(decorator)]
+
+
+def translate_method_decorators(decorators: Iterable[ast.expr]) -> List[ast.expr]:
+    """Decorators of a view method, cache ones out of `method_decorator`."""
+    translated = []
+    for decorator in decorators:
+        unwrapped = _unwrap(decorator)
+        translated += unwrapped if unwrapped else [decorator]
+    return translated
+
+
+def get_class_cache_decorators(
+    decorators: Iterable[ast.expr], method: str
+) -> List[ast.expr]:
+    """Cache decorators a view class applies to `method` with
+    `method_decorator(..., name=...)`, `dispatch` standing for every method."""
+    return [item for decorator in decorators for item in _unwrap(decorator, method)]
+
+
+def remove_class_cache_decorators(decorators: Iterable[ast.expr]) -> List[ast.expr]:
+    """Decorators of a view class, but those moved to its methods."""
+    return [decorator for decorator in decorators if not _unwrap(decorator)]
+
+
+def get_cache_names(nodes: Iterable[ast.AST]) -> List[str]:
+    """Decorators of `caching.py` the migrated functions use."""
+    names = set()
+    for node in nodes:
+        for child in ast.walk(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                for decorator in child.decorator_list:
+                    match decorator:
+                        case ast.Call(func=ast.Name(id=name)) | ast.Name(
+                            id=name
+                        ) if name in CACHE_DECORATORS:
+                            names.add(name)
+    return sorted(names)
+
+
+def is_cache(node: ast.expr, imports: Dict[str, str]):
+    """Whether `node` is `cache` or `caches[...]` of `django.core.cache`."""
+    if isinstance(node, ast.Subscript):
+        return get_qualified_name(node.value, imports) == "django.core.cache.caches"
+    return get_qualified_name(node, imports) == "django.core.cache.cache"
+
+
+class AsyncCacheTransformer(ast.NodeTransformer):
+    """Awaits the async counterparts of Django cache calls in an `async def`,
+    `await cache.aget(...)`. Calls where nothing can be awaited, in nested
+    functions, lambdas and generator expressions, are left as they are."""
+
+    def __init__(self, imports: Dict[str, str]):
+        self.imports = imports
+        self.synchronous = 0
+
+    def transform(self, node: ast.AsyncFunctionDef):
+        node.body = [self.visit(statement) for statement in node.body]
+        return node
+
+    def _visit_synchronous(self, node):
+        self.synchronous += 1
+        self.generic_visit(node)
+        self.synchronous -= 1
+        return node
+
+    def visit_FunctionDef(self, node):
+        return self._visit_synchronous(node)
+
+    visit_Lambda = visit_FunctionDef
+    visit_GeneratorExp = visit_FunctionDef
+
+    def visit_AsyncFunctionDef(self, node):
+        # Migrated on its own.
+        return node
+
+    def visit_ClassDef(self, node):
+        return node
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        match node.func:
+            case ast.Attribute(attr=attr, value=value) if (
+                attr in ASYNC_CACHE_METHODS
+                and not self.synchronous
+                and is_cache(value, self.imports)
+            ):
+                return ast.copy_location(
+                    ast.Await(
+                        value=ast.Call(
+                            func=ast.Attribute(
+                                value=value,
+                                attr=ASYNC_CACHE_METHODS[attr],
+                                ctx=ast.Load(),
+                            ),
+                            args=node.args,
+                            keywords=node.keywords,
+                        )
+                    ),
+                    node,
+                )
+        return node
+
+
+def convert_cache_calls(module: ast.Module):
+    """Converts Django cache calls of every `async def` in `module`."""
+    transformer = AsyncCacheTransformer(get_imported_names(module))
+    for node in [
+        node for node in ast.walk(module) if isinstance(node, ast.AsyncFunctionDef)
+    ]:
+        transformer.transform(node)
+    ast.fix_missing_locations(module)
+
+
+def imports_cache(module: ast.Module):
+    """Whether migrated `module` imports `cache.py`."""
+    return any(
+        isinstance(node, ast.ImportFrom) and node.module == "cache" and not node.level
+        for node in module.body
+    )
+
+
+def generate_caching_module():
+    return format_string(
+        '''"""Per-view response caching, migrated from Django's `cache_page`,
+`vary_on_headers`, `vary_on_cookie`, `cache_control` and `never_cache`.
+
+The decorators record a policy on endpoints; `install_cache` wraps the routes
+of those, once routers are included, with `CachedRoute`. As Django's cache
+middleware, it caches successful GET responses, neither streamed nor setting
+cookies, under their URL and the values of the request headers their `Vary`
+lists. Handlers depending on the user or the session vary on `Cookie` and
+`Authorization`.
+
+Backends are named as Django's `CACHES` aliases, given with
+`cache_page(..., cache=...)`. Each one is an in-memory LRU of the worker, but
+"default" is shared with Redis when `RESPONSE_CACHE_URL` is set; other shared
+backends are plugged with `register_backend`.
+"""
+import hashlib
+import pickle
+import time
+from collections import OrderedDict
+from os import getenv
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from fastapi import FastAPI
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+
+from dependencies import get_identity, get_session
+
+CACHE_MAX_ENTRIES = int(getenv("CACHE_MAX_ENTRIES", "1000"))
+RESPONSE_CACHE_URL = getenv("RESPONSE_CACHE_URL")
+CACHED_METHODS = ("GET",)
+UNCACHED_DIRECTIVES = ("private", "no-cache", "no-store")
+# Providers of `dependencies.py` reading the session cookie or the
+# `Authorization` header, and the headers responses of their dependents vary
+# on, as Django's SessionMiddleware adds `Vary: Cookie`.
+IDENTITY_PROVIDERS = (get_identity, get_session)
+IDENTITY_HEADERS = ("Cookie", "Authorization")
+
+
+class Backend:
+    """Stores picklable values, for `timeout` seconds."""
+
+    async def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, timeout: float):
+        raise NotImplementedError
+
+
+class MemoryBackend(Backend):
+    """Entries expire after their timeout, the least recently used ones are
+    evicted past `max_entries`."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+
+    async def get(self, key: str) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, timeout: float):
+        self.entries[key] = time.monotonic() + timeout, value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class RedisBackend(Backend):
+    """Shared by every worker using the same server, requires `redis`."""
+
+    def __init__(self, url: str):
+        from redis.asyncio import Redis
+
+        self.client = Redis.from_url(url)
+
+    async def get(self, key: str) -> Any:
+        value = await self.client.get(key)
+        return None if value is None else pickle.loads(value)
+
+    async def set(self, key: str, value: Any, timeout: float):
+        await self.client.set(key, pickle.dumps(value), px=int(timeout * 1000))
+
+
+backends: Dict[str, Backend] = {}
+
+
+def register_backend(name: str, backend: Backend):
+    backends[name] = backend
+
+
+def get_backend(name: str) -> Backend:
+    if name not in backends:
+        backends[name] = (
+            RedisBackend(RESPONSE_CACHE_URL)
+            if name == "default" and RESPONSE_CACHE_URL
+            else MemoryBackend()
+        )
+    return backends[name]
+
+
+# Hits and misses per route path.
+stats: Dict[str, Dict[str, int]] = {}
+
+
+def get_stats() -> Dict[str, Any]:
+    return {
+        "hits": sum(route["hits"] for route in stats.values()),
+        "misses": sum(route["misses"] for route in stats.values()),
+        "routes": stats,
+    }
+
+
+def get_policy(endpoint: Callable) -> Dict[str, Any]:
+    return endpoint.__dict__.setdefault(
+        "__cache_policy__",
+        {
+            "timeout": None,
+            "cache": "default",
+            "key_prefix": "",
+            "vary": [],
+            "cache_control": {},
+        },
+    )
+
+
+def cache_page(timeout: Optional[float], *, cache=None, key_prefix=None):
+    def decorator(endpoint):
+        get_policy(endpoint).update(
+            timeout=timeout, cache=cache or "default", key_prefix=key_prefix or ""
+        )
+        return endpoint
+
+    return decorator
+
+
+def vary_on_headers(*headers: str):
+    def decorator(endpoint):
+        vary = get_policy(endpoint)["vary"]
+        vary += [header for header in headers if header.lower() not in map(str.lower, vary)]
+        return endpoint
+
+    return decorator
+
+
+def vary_on_cookie(endpoint):
+    return vary_on_headers("Cookie")(endpoint)
+
+
+def cache_control(**directives):
+    def decorator(endpoint):
+        policy = get_policy(endpoint)["cache_control"]
+        # As Django's `patch_cache_control`, the smallest max-age wins.
+        if "max_age" in policy and "max_age" in directives:
+            directives["max_age"] = min(policy["max_age"], directives["max_age"])
+        policy.update(directives)
+        return endpoint
+
+    return decorator
+
+
+def never_cache(endpoint):
+    return cache_control(
+        max_age=0, no_cache=True, no_store=True, must_revalidate=True, private=True
+    )(endpoint)
+
+
+def parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def patch_headers(headers: MutableHeaders, policy: Dict[str, Any]):
+    """Adds the `Vary` and `Cache-Control` values of the policy, as Django's
+    `patch_vary_headers`, `patch_cache_control` and `patch_response_headers`."""
+    if policy["vary"]:
+        vary = parse_list(headers.get("vary", ""))
+        vary += [
+            header
+            for header in policy["vary"]
+            if header.lower() not in map(str.lower, vary)
+        ]
+        headers["vary"] = ", ".join(vary)
+    directives = {}
+    for directive in parse_list(headers.get("cache-control", "")):
+        name, _, value = directive.partition("=")
+        directives[name.strip().lower()] = value.strip() or True
+    if policy["timeout"] is not None and "max-age" not in directives:
+        directives["max-age"] = max(0, int(policy["timeout"]))
+    for name, value in policy["cache_control"].items():
+        if value is not False:
+            directives[name.replace("_", "-").lower()] = value
+    if directives:
+        headers["cache-control"] = ", ".join(
+            name if value is True else f"{name}={value}"
+            for name, value in directives.items()
+        )
+
+
+class CachedRoute:
+    """ASGI app of a route with a cache policy, wrapping the route's own."""
+
+    def __init__(self, app, policy: Dict[str, Any], path: str):
+        self.app = app
+        self.policy = policy
+        self.stats = (
+            stats.setdefault(path, {"hits": 0, "misses": 0})
+            if policy["timeout"]
+            else {"hits": 0, "misses": 0}
+        )
+
+    def get_key(self, kind: str, url: str, values: Sequence[str] = ()) -> str:
+        digest = hashlib.md5("\\n".join([url, *values]).encode()).hexdigest()
+        return f"views.cache.{kind}.{self.policy['key_prefix']}.{digest}"
+
+    async def __call__(self, scope, receive, send):
+        timeout = self.policy["timeout"]
+        if not timeout or timeout <= 0 or scope["method"] not in CACHED_METHODS:
+            await self.app(scope, receive, self.patch(send))
+            return
+        backend = get_backend(self.policy["cache"])
+        headers = Headers(scope=scope)
+        url = "{}://{}{}?{}".format(
+            scope.get("scheme", "http"),
+            headers.get("host", ""),
+            scope.get("root_path", "") + scope["path"],
+            scope.get("query_string", b"").decode("latin-1"),
+        )
+        # The headers responses vary on are learned from the last one.
+        vary = await backend.get(self.get_key("headers", url))
+        if vary is not None:
+            values = [headers.get(header, "") for header in vary]
+            entry = await backend.get(self.get_key("page", url, values))
+            if entry is not None:
+                self.stats["hits"] += 1
+                status, raw_headers, body = entry
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": status,
+                        "headers": raw_headers,
+                    }
+                )
+                await send({"type": "http.response.body", "body": body})
+                return
+        self.stats["misses"] += 1
+
+        response = {}
+
+        async def store(message):
+            if message["type"] == "http.response.start":
+                patch_headers(MutableHeaders(scope=message), self.policy)
+                response.update(message, body=[])
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+                # Streamed responses are not cached.
+                if not message.get("more_body") and len(response["body"]) == 1:
+                    await self.save(backend, url, headers, response)
+            await send(message)
+
+        await self.app(scope, receive, store)
+
+    async def save(self, backend: Backend, url: str, headers: Headers, response):
+        response_headers = Headers(raw=response["headers"])
+        directives = parse_list(response_headers.get("cache-control", "").lower())
+        if (
+            response["status"] != 200
+            or "set-cookie" in response_headers
+            or any(directive in UNCACHED_DIRECTIVES for directive in directives)
+        ):
+            return
+        vary = [
+            header.lower() for header in parse_list(response_headers.get("vary", ""))
+        ]
+        if "*" in vary:
+            return
+        timeout = self.policy["timeout"]
+        values = [headers.get(header, "") for header in vary]
+        await backend.set(self.get_key("headers", url), vary, timeout)
+        await backend.set(
+            self.get_key("page", url, values),
+            (response["status"], list(response["headers"]), response["body"][0]),
+            timeout,
+        )
+
+    def patch(self, send):
+        async def patched(message):
+            if message["type"] == "http.response.start":
+                patch_headers(MutableHeaders(scope=message), self.policy)
+            await send(message)
+
+        return patched
+
+
+def depends_on_identity(dependant: Dependant) -> bool:
+    return any(
+        dependency.call in IDENTITY_PROVIDERS or depends_on_identity(dependency)
+        for dependency in dependant.dependencies
+    )
+
+
+def install_cache(app: FastAPI):
+    """Wraps the routes of `app` whose endpoint has a cache policy. Pages of
+    handlers depending on the user or the session are cached per user."""
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or isinstance(route.app, CachedRoute):
+            continue
+        policy = getattr(route.endpoint, "__cache_policy__", None)
+        if policy is None:
+            continue
+        if depends_on_identity(route.dependant):
+            vary_on_headers(*IDENTITY_HEADERS)(route.endpoint)
+        route.app = CachedRoute(route.app, policy, route.path)
+'''
+    )
+
+
+def generate_cache_module():
+    return format_string(
+        '''"""Django's low-level cache API, `cache` and `caches[alias]`, with its
+synchronous methods and their async counterparts (`aget`, `aset`,
+`aget_or_set`...) which migrated views await.
+
+Every alias is stored in a SQLite database in WAL mode, `CACHE_PATH`, shared
+by the workers of the host: a value set by one is a hit for the others. Its
+schema is created in a thread from the app lifespan, `startup()`. Readers
+never wait for writers, reads run on the event loop, giving up after
+`LOOP_BUSY_TIMEOUT` on the rare locks readers wait for to read in a thread;
+writes, which may wait for the database lock, run in a thread. Values are
+pickled as Django's backends do. Other backends, which only need the same methods, are
+plugged with `caches[alias] = backend`.
+"""
+import asyncio
+import pickle
+import sqlite3
+import threading
+import time
+from os import getenv
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+CACHE_PATH = getenv("CACHE_PATH", str(Path(__file__).with_name(".cache.sqlite3")))
+CACHE_MAX_ENTRIES = int(getenv("CACHE_DB_MAX_ENTRIES", "100000"))
+# Expired entries are culled every `CULL_EVERY` writes of a worker.
+CULL_EVERY = 1000
+# Seconds the event loop waits for a lock before reading in a thread.
+LOOP_BUSY_TIMEOUT = 0.005
+DEFAULT_CACHE_ALIAS = "default"
+# Databases whose schema was created by this process.
+_schemas: Set[str] = set()
+
+
+def create_schema(path: str = CACHE_PATH):
+    """Switches the database to WAL and creates the cache table, once per
+    process. Blocking, it runs in a thread."""
+    if path in _schemas:
+        return
+    connection = sqlite3.connect(path, timeout=5, isolation_level=None)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache"
+            " (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)"
+            " WITHOUT ROWID"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)")
+    finally:
+        connection.close()
+    _schemas.add(path)
+
+
+async def startup():
+    await asyncio.to_thread(create_schema)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class _DefaultTimeout:
+    def __repr__(self):
+        return "DEFAULT_TIMEOUT"
+
+
+DEFAULT_TIMEOUT: Any = _DefaultTimeout()
+_MISSING = object()
+
+
+class SQLiteCache:
+    default_timeout = 300
+
+    def __init__(self, alias: str, path: str = CACHE_PATH):
+        self.alias = alias
+        self.path = path
+        self.local = threading.local()
+        self.writes = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """A connection per thread, in autocommit mode. The event loop's one
+        waits `LOOP_BUSY_TIMEOUT` at most for locks."""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            create_schema(self.path)
+            connection = sqlite3.connect(
+                self.path,
+                timeout=LOOP_BUSY_TIMEOUT if _on_event_loop() else 5,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            # Losing the last writes on a power loss is fine for a cache.
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    def make_key(self, key: Any, version: Optional[int] = None) -> str:
+        return f"{self.alias}:{version or 1}:{key}"
+
+    def get_expiry(self, timeout: Any) -> Optional[float]:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        # As Django's, `None` never expires and 0 expires right away.
+        return None if timeout is None else time.time() + timeout
+
+    def _read(self, keys: List[str]) -> Dict[str, Any]:
+        placeholders = ", ".join("?" * len(keys))
+        rows = self.connection.execute(
+            f"SELECT key, value FROM cache WHERE key IN ({placeholders})"
+            " AND (expires IS NULL OR expires > ?)",
+            [*keys, time.time()],
+        )
+        return {key: pickle.loads(value) for key, value in rows}
+
+    def _write(self, items: Dict[str, Any], timeout: Any, only_new: bool = False):
+        expires = self.get_expiry(timeout)
+        rows = [
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires)
+            for key, value in items.items()
+        ]
+        if only_new:
+            # `add` only replaces expired entries.
+            changes = 0
+            for row in rows:
+                changes += self.connection.execute(
+                    "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?)"
+                    " ON CONFLICT (key) DO UPDATE SET value = excluded.value,"
+                    " expires = excluded.expires"
+                    " WHERE cache.expires IS NOT NULL AND cache.expires <= ?",
+                    [*row, time.time()],
+                ).rowcount
+        else:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                rows,
+            )
+            changes = len(rows)
+        self.writes += 1
+        if self.writes % CULL_EVERY == 0:
+            self.cull()
+        return changes
+
+    def cull(self):
+        """Deletes expired entries, then the third closest to expire past
+        `CACHE_MAX_ENTRIES`, as Django's database cache."""
+        connection = self.connection
+        connection.execute("DELETE FROM cache WHERE expires <= ?", [time.time()])
+        (count,) = connection.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if count > CACHE_MAX_ENTRIES:
+            connection.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache"
+                " ORDER BY expires IS NULL, expires LIMIT ?)",
+                [count // 3],
+            )
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        return self._write({self.make_key(key, version): value}, timeout, True) > 0
+
+    def get(self, key, default=None, version=None) -> Any:
+        return self._read([self.make_key(key, version)]).get(
+            self.make_key(key, version), default
+        )
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._write({self.make_key(key, version): value}, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        cursor = self.connection.execute(
+            "UPDATE cache SET expires = ? WHERE key = ?"
+            " AND (expires IS NULL OR expires > ?)",
+            [self.get_expiry(timeout), self.make_key(key, version), time.time()],
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None) -> bool:
+        cursor = self.connection.execute(
+            "DELETE FROM cache WHERE key = ?", [self.make_key(key, version)]
+        )
+        return cursor.rowcount > 0
+
+    def get_many(self, keys: Iterable, version=None) -> Dict[Any, Any]:
+        keys = {self.make_key(key, version): key for key in keys}
+        if not keys:
+            return {}
+        return {keys[key]: value for key, value in self._read(list(keys)).items()}
+
+    def set_many(self, data: Dict, timeout=DEFAULT_TIMEOUT, version=None) -> List:
+        self._write(
+            {self.make_key(key, version): value for key, value in data.items()},
+            timeout,
+        )
+        return []
+
+    def delete_many(self, keys: Iterable, version=None):
+        for key in keys:
+            self.delete(key, version)
+
+    def clear(self):
+        self.connection.execute(
+            "DELETE FROM cache WHERE substr(key, 1, ?) = ?",
+            [len(self.alias) + 1, self.alias + ":"],
+        )
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        value = self.get(key, _MISSING, version)
+        if value is _MISSING:
+            if callable(default):
+                default = default()
+            self.add(key, default, timeout, version)
+            # Whoever added first wins.
+            value = self.get(key, default, version)
+        return value
+
+    def has_key(self, key, version=None) -> bool:
+        return self.get(key, _MISSING, version) is not _MISSING
+
+    def incr(self, key, delta=1, version=None) -> int:
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            value = self.get(key, _MISSING, version)
+            if value is _MISSING:
+                raise ValueError(f"Key '{key}' not found")
+            connection.execute(
+                "UPDATE cache SET value = ? WHERE key = ?",
+                [pickle.dumps(value + delta), self.make_key(key, version)],
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return value + delta
+
+    def decr(self, key, delta=1, version=None) -> int:
+        return self.incr(key, -delta, version)
+
+    def incr_version(self, key, delta=1, version=None) -> int:
+        version = version or 1
+        value = self.get(key, _MISSING, version)
+        if value is _MISSING:
+            raise ValueError(f"Key '{key}' not found")
+        self.set(key, value, version=version + delta)
+        self.delete(key, version)
+        return version + delta
+
+    def decr_version(self, key, delta=1, version=None) -> int:
+        return self.incr_version(key, -delta, version)
+
+    def close(self, **kwargs):
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    async def _run(self, function: Callable, *args) -> Any:
+        return await asyncio.to_thread(function, *args)
+
+    async def _read_on_loop(self, function: Callable, *args) -> Any:
+        """Reads on the event loop, in a thread until the schema is created or
+        when the database stays locked past `LOOP_BUSY_TIMEOUT`."""
+        if self.path in _schemas:
+            try:
+                return function(*args)
+            except sqlite3.OperationalError:
+                pass
+        return await self._run(function, *args)
+
+    async def aadd(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        return await self._run(self.add, key, value, timeout, version)
+
+    async def aget(self, key, default=None, version=None) -> Any:
+        return await self._read_on_loop(self.get, key, default, version)
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        await self._run(self.set, key, value, timeout, version)
+
+    async def atouch(self, key, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        return await self._run(self.touch, key, timeout, version)
+
+    async def adelete(self, key, version=None) -> bool:
+        return await self._run(self.delete, key, version)
+
+    async def aget_many(self, keys: Iterable, version=None) -> Dict[Any, Any]:
+        return await self._read_on_loop(self.get_many, list(keys), version)
+
+    async def aset_many(self, data: Dict, timeout=DEFAULT_TIMEOUT, version=None):
+        return await self._run(self.set_many, data, timeout, version)
+
+    async def adelete_many(self, keys: Iterable, version=None):
+        await self._run(self.delete_many, list(keys), version)
+
+    async def aclear(self):
+        await self._run(self.clear)
+
+    async def aget_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        value = await self.aget(key, _MISSING, version)
+        if value is _MISSING:
+            if callable(default):
+                default = default()
+            if asyncio.iscoroutine(default):
+                default = await default
+            await self.aadd(key, default, timeout, version)
+            value = await self.aget(key, default, version)
+        return value
+
+    async def ahas_key(self, key, version=None) -> bool:
+        return await self._read_on_loop(self.has_key, key, version)
+
+    async def aincr(self, key, delta=1, version=None) -> int:
+        return await self._run(self.incr, key, delta, version)
+
+    async def adecr(self, key, delta=1, version=None) -> int:
+        return await self._run(self.decr, key, delta, version)
+
+    async def aincr_version(self, key, delta=1, version=None) -> int:
+        return await self._run(self.incr_version, key, delta, version)
+
+    async def adecr_version(self, key, delta=1, version=None) -> int:
+        return await self._run(self.decr_version, key, delta, version)
+
+    async def aclose(self, **kwargs):
+        self.close()
+
+
+class CacheHandler:
+    """`caches[alias]`, created on first use."""
+
+    def __init__(self):
+        self.backends: Dict[str, Any] = {}
+
+    def __getitem__(self, alias: str):
+        if alias not in self.backends:
+            self.backends[alias] = SQLiteCache(alias)
+        return self.backends[alias]
+
+    def __setitem__(self, alias: str, backend: Any):
+        self.backends[alias] = backend
+
+    def all(self) -> List[Any]:
+        return list(self.backends.values())
+
+
+class DefaultCacheProxy:
+    """`cache`, the default alias, looked up on every use so that a backend
+    plugged afterwards is used."""
+
+    def __getattr__(self, name: str):
+        return getattr(caches[DEFAULT_CACHE_ALIAS], name)
+
+
+caches = CacheHandler()
+cache = DefaultCacheProxy()
+'''
+    )
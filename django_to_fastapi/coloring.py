@@ -0,0 +1,259 @@
+import ast
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from django_to_fastapi.blocking import HTTP_METHODS
+from django_to_fastapi.utils import Logger
+
+Function = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+def is_route_handler(node: Function):
+    return any(
+        isinstance(decorator, ast.Call)
+        and isinstance(decorator.func, ast.Attribute)
+        and decorator.func.attr in HTTP_METHODS
+        for decorator in node.decorator_list
+    )
+
+
+@dataclass
+class FunctionNode:
+    """A function of the module with the calls it makes to others."""
+
+    key: str
+    node: Function
+    class_name: Optional[str]
+    # Route handlers and decorated functions keep their kind.
+    fixed: bool
+    awaits: bool = False
+    # Call nodes to other functions of the module, by callee.
+    calls: Dict[int, "Call"] = field(default_factory=dict)
+    # Functions referenced without being called, e.g. passed as callbacks, as
+    # (node, function).
+    references: List[Tuple[ast.expr, str]] = field(default_factory=list)
+
+
+@dataclass
+class Call:
+    node: ast.Call
+    callee: str
+    awaited: bool
+    # Whether the call sits where nothing can be awaited: a lambda or a
+    # generator expression.
+    synchronous: bool
+
+
+class CallCollector(ast.NodeVisitor):
+    def __init__(self, function: FunctionNode, keys: Set[str]):
+        self.function = function
+        self.keys = keys
+        self.synchronous = 0
+        self.awaited: Set[int] = set()
+
+    def collect(self):
+        for statement in self.function.node.body:
+            self.visit(statement)
+
+    def resolve(self, node: ast.expr) -> Optional[str]:
+        match node:
+            case ast.Name(id=name) if name in self.keys:
+                return name
+            case ast.Attribute(value=ast.Name(id="self"), attr=attr) if (
+                self.function.class_name
+                and f"{self.function.class_name}.{attr}" in self.keys
+            ):
+                return f"{self.function.class_name}.{attr}"
+        return None
+
+    def visit_FunctionDef(self, node):
+        return
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
+
+    def _visit_synchronous(self, node):
+        self.synchronous += 1
+        self.generic_visit(node)
+        self.synchronous -= 1
+
+    visit_Lambda = _visit_synchronous
+    visit_GeneratorExp = _visit_synchronous
+
+    def visit_Await(self, node):
+        if isinstance(node.value, ast.Call) and self.resolve(node.value.func):
+            # Only awaits if the function called ends up async.
+            self.awaited.add(id(node.value))
+        elif not self.synchronous:
+            self.function.awaits = True
+        self.generic_visit(node)
+
+    def visit_AsyncFor(self, node):
+        self.function.awaits = True
+        self.generic_visit(node)
+
+    visit_AsyncWith = visit_AsyncFor
+
+    def visit_comprehension(self, node):
+        if node.is_async:
+            self.function.awaits = True
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        callee = self.resolve(node.func)
+        if callee is not None:
+            self.function.calls[id(node)] = Call(
+                node, callee, id(node) in self.awaited, bool(self.synchronous)
+            )
+            for child in [*node.args, *node.keywords]:
+                self.visit(child)
+            if isinstance(node.func, ast.Attribute):
+                self.visit(node.func.value)
+            return
+        self.generic_visit(node)
+
+    def visit_Name(self, node):
+        if node.id in self.keys and isinstance(node.ctx, ast.Load):
+            self.function.references.append((node, node.id))
+
+    def visit_Attribute(self, node):
+        callee = self.resolve(node)
+        if callee is not None:
+            self.function.references.append((node, callee))
+        self.generic_visit(node)
+
+
+class _AwaitInserter(ast.NodeTransformer):
+    def __init__(self, awaited: Set[int], unawaited: Set[int]):
+        self.awaited = awaited
+        self.unawaited = unawaited
+
+    def visit_Await(self, node):
+        if id(node.value) in self.unawaited:
+            return self.visit(node.value)
+        self.generic_visit(node)
+        return node
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if id(node) in self.awaited:
+            return ast.copy_location(ast.Await(value=node), node)
+        return node
+
+
+class AsyncColoring:
+    """Makes only the functions of a module which await, directly or through
+    the functions they call, `async`.
+
+    Module functions and methods of classes form the call graph; calls are
+    resolved by name, `self.method()` within a class. Migrated helpers which
+    don't await become plain `def` again, and calls to `async` functions are
+    awaited. Route handlers stay `async` whatever they call; calls that can't
+    be awaited are reported.
+    """
+
+    def __init__(self, module: ast.Module):
+        self.module = module
+        self.functions: Dict[str, FunctionNode] = {}
+        for node in module.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.add(node.name, node, None)
+            elif isinstance(node, ast.ClassDef):
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        self.add(f"{node.name}.{item.name}", item, node.name)
+        keys = set(self.functions)
+        for function in self.functions.values():
+            CallCollector(function, keys).collect()
+
+    def add(self, key: str, node: Function, class_name: Optional[str]):
+        self.functions[key] = FunctionNode(
+            key,
+            node,
+            class_name,
+            fixed=bool(node.decorator_list) or is_route_handler(node),
+        )
+
+    def color(self) -> Dict[str, bool]:
+        """Whether each function has to be `async`."""
+        colors = {
+            key: isinstance(function.node, ast.AsyncFunctionDef)
+            if function.fixed
+            else function.awaits
+            for key, function in self.functions.items()
+        }
+        callers: Dict[str, Set[str]] = {key: set() for key in self.functions}
+        for key, function in self.functions.items():
+            for call in function.calls.values():
+                if not call.synchronous:
+                    callers[call.callee].add(key)
+
+        pending = [key for key, is_async in colors.items() if is_async]
+        while pending:
+            for caller in callers[pending.pop()]:
+                if not colors[caller] and not self.functions[caller].fixed:
+                    colors[caller] = True
+                    pending.append(caller)
+        return colors
+
+    def apply(self):
+        colors = self.color()
+        replacements: Dict[int, Function] = {}
+        for key, function in self.functions.items():
+            node = function.node
+            if function.fixed or colors[key] == isinstance(node, ast.AsyncFunctionDef):
+                continue
+            kind = ast.AsyncFunctionDef if colors[key] else ast.FunctionDef
+            replacements[id(node)] = ast.copy_location(
+                kind(
+                    name=node.name,
+                    args=node.args,
+                    body=node.body,
+                    decorator_list=node.decorator_list,
+                    returns=node.returns,
+                    type_comment=node.type_comment,
+                ),
+                node,
+            )
+
+        for key, function in self.functions.items():
+            awaited = set()
+            unawaited = set()
+            for call in function.calls.values():
+                if not colors[call.callee]:
+                    if call.awaited:
+                        unawaited.add(id(call.node))
+                    continue
+                if call.awaited:
+                    continue
+                if call.synchronous or not colors[key]:
+                    Logger.print_warn(
+                        f"Could not await {call.callee}, it has to be async",
+                        sample_code=ast.unparse(call.node) + "\n",
+                        line=getattr(call.node, "lineno", -1),
+                    )
+                else:
+                    awaited.add(id(call.node))
+            for reference, callee in function.references:
+                if colors[callee] and not self.functions[callee].fixed:
+                    Logger.print_warn(
+                        f"{callee} is async and used as a value",
+                        sample_code=ast.unparse(reference) + "\n",
+                        line=getattr(reference, "lineno", -1),
+                    )
+            if awaited or unawaited:
+                _AwaitInserter(awaited, unawaited).visit(function.node)
+
+        for container in [self.module] + [
+            node for node in self.module.body if isinstance(node, ast.ClassDef)
+        ]:
+            container.body = [
+                replacements.get(id(node), node) for node in container.body
+            ]
+        return colors
+
+
+def color_functions(module: ast.Module):
+    AsyncColoring(module).apply()
+    ast.fix_missing_locations(module)
+    return module
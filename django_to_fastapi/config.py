@@ -0,0 +1,64 @@
+from typing import Any, Dict, Literal, Optional
+
+FORMATTER = Literal["none", "black", "batch"]
+BLOCKING_CALLS = Literal["ignore", "sync", "threadpool"]
+MODELS = Literal["django", "sqlalchemy"]
+RESPONSES = Literal["json", "orjson", "fast"]
+PAYLOADS = Literal["typeddict", "pydantic"]
+ENTRYPOINT = Literal["eager", "lazy"]
+
+# Module and name of the response class of each `RESPONSES` option, "fast" is
+# bundled with the migrated project.
+RESPONSE_CLASSES = {
+    "json": ("fastapi.responses", "JSONResponse"),
+    "orjson": ("fastapi.responses", "ORJSONResponse"),
+    "fast": ("fast_json", "FastJSONResponse"),
+}
+
+
+class Config:
+    """Codemod options, set once from the command line.
+
+    They are class attributes like `Logger` state, so they are snapshotted to
+    be handed over to worker processes and to key the migration cache.
+    """
+
+    formatter: FORMATTER = "black"
+    # What to do with handlers calling blocking APIs, see `blocking.py`.
+    blocking_calls: BLOCKING_CALLS = "sync"
+    # Whether ORM calls of handlers are turned into their async counterparts.
+    async_orm: bool = True
+    # Whether models are kept for the Django ORM or translated to SQLAlchemy,
+    # with the default size of the connection pool of the generated engine.
+    models: MODELS = "django"
+    pool_size: int = 5
+    max_overflow: int = 10
+    # Response class of handlers, set as the default one of the app.
+    responses: RESPONSES = "json"
+    # How payloads inferred from handlers are declared, see `payloads.py`.
+    payloads: PAYLOADS = "typeddict"
+    # Whether gunicorn imports the app once before forking workers.
+    preload: bool = False
+    # Whether main.py includes every router at startup or imports them by
+    # path prefix on first request.
+    entrypoint: ENTRYPOINT = "eager"
+    # Whether apps resolve static paths with a dict before scanning routes.
+    static_routes: bool = False
+    # DRF's `DEFAULT_PAGINATION_CLASS` of the project settings, read by
+    # `ProjectMigration` rather than given on the command line.
+    default_pagination_class: Optional[str] = None
+
+    @classmethod
+    def get_response_class(cls):
+        return RESPONSE_CLASSES[cls.responses]
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        return {name: getattr(cls, name) for name in cls.__annotations__}
+
+    @classmethod
+    def update(cls, **options: Any):
+        for name, value in options.items():
+            if name not in cls.__annotations__:
+                raise AttributeError(f"Unknown option {name}")
+            setattr(cls, name, value)
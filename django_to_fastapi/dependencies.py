@@ -0,0 +1,256 @@
+import ast
+from typing import Iterable, List
+
+from django_to_fastapi.utils import format_string
+
+# `request` attributes with a `get_<attribute>` provider in `dependencies.py`.
+PROVIDERS = (
+    "user",
+    "auth",
+    "session",
+    "COOKIES",
+    "META",
+    "headers",
+    "method",
+    "path",
+    "body",
+)
+
+
+def get_providers(nodes: Iterable[ast.AST]) -> List[str]:
+    """Providers of `dependencies.py` the migrated nodes depend on."""
+    providers = set()
+    for node in nodes:
+        for child in ast.walk(node):
+            match child:
+                case ast.Call(
+                    func=ast.Name(id="Depends"), args=[ast.Name(id=str(name))]
+                ) if name.startswith("get_") and name[4:] in PROVIDERS:
+                    providers.add(name)
+    return sorted(providers)
+
+
+def generate_dependencies_module():
+    return format_string(
+        '''"""Providers of what Django views read from `request`, `request.user` or
+`request.session`, as FastAPI dependencies.
+
+FastAPI resolves each provider once per request, whatever the number of
+dependents. Users are looked up once per session or token every
+`AUTH_CACHE_TTL` seconds, in a cache of each worker set up in the app lifespan:
+a token deleted or a user deactivated is still accepted until its entry expires.
+Sessions modified by handlers are not saved.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from importlib import import_module
+from os import getenv
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Depends, Request
+from fastapi.concurrency import run_in_threadpool
+
+AUTH_CACHE_TTL = float(getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_SIZE = int(getenv("AUTH_CACHE_SIZE", "10000"))
+# Schemes of the `Authorization` header read as tokens, as DRF's
+# TokenAuthentication, then the session cookie.
+TOKEN_KEYWORDS = ("Token", "Bearer")
+
+
+class TTLCache:
+    """Entries expire after `ttl` seconds, the least recently used ones are
+    evicted past `size`. Concurrent misses on a key share a single load."""
+
+    def __init__(self, size: int, ttl: float):
+        self.size = size
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+        self.loading: Dict[Hashable, asyncio.Future] = {}
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[Any]]):
+        entry = self.entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > time.monotonic():
+                self.entries.move_to_end(key)
+                return value
+            del self.entries[key]
+        if key in self.loading:
+            return await asyncio.shield(self.loading[key])
+        future = asyncio.get_running_loop().create_future()
+        self.loading[key] = future
+        try:
+            value = await load()
+        except BaseException as error:
+            future.set_exception(error)
+            # Retrieved, or never awaited by anyone else.
+            future.exception()
+            raise
+        finally:
+            del self.loading[key]
+        future.set_result(value)
+        self.entries[key] = time.monotonic() + self.ttl, value
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+
+class Resources:
+    """Set up by `startup`, in the app lifespan."""
+
+    users: Optional[TTLCache] = None
+    session_store: Any = None
+    session_cookie = "sessionid"
+    user_model: Any = None
+    anonymous_user: Any = None
+
+
+async def startup():
+    Resources.users = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+    try:
+        import django
+        from django.conf import settings
+    except ImportError:
+        return
+    if not (settings.configured or getenv("DJANGO_SETTINGS_MODULE")):
+        return
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import AnonymousUser
+
+    Resources.session_store = import_module(settings.SESSION_ENGINE).SessionStore
+    Resources.session_cookie = settings.SESSION_COOKIE_NAME
+    Resources.user_model = get_user_model()
+    Resources.anonymous_user = AnonymousUser
+
+
+async def shutdown():
+    if Resources.users is not None:
+        Resources.users.clear()
+
+
+def require(resource: Any, attribute: str):
+    if resource is None:
+        raise RuntimeError(
+            f"request.{attribute} requires Django, configured with "
+            "DJANGO_SETTINGS_MODULE, and the app lifespan to have run"
+        )
+    return resource
+
+
+def get_credentials(request: Request) -> Tuple[str, Optional[str]]:
+    """Token of the `Authorization` header, or session key of the cookie."""
+    keyword, _, token = request.headers.get("authorization", "").partition(" ")
+    if keyword in TOKEN_KEYWORDS and token:
+        return "token", token
+    return "session", request.cookies.get(Resources.session_cookie)
+
+
+async def load_identity(kind: str, key: str) -> Tuple[Any, Any]:
+    anonymous = require(Resources.anonymous_user, "user")(), None
+    if kind == "token":
+        from rest_framework.authtoken.models import Token
+
+        try:
+            token = await Token.objects.select_related("user").aget(key=key)
+        except Token.DoesNotExist:
+            return anonymous
+        return (token.user, token) if token.user.is_active else anonymous
+
+    from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+    from django.utils.crypto import constant_time_compare
+
+    session = require(Resources.session_store, "user")(key)
+    stored = await run_in_threadpool(
+        lambda: (session.get(SESSION_KEY), session.get(HASH_SESSION_KEY))
+    )
+    user_id, session_hash = stored
+    if user_id is None:
+        return anonymous
+    model = Resources.user_model
+    try:
+        user = await model._default_manager.aget(
+            pk=model._meta.pk.to_python(user_id)
+        )
+    except model.DoesNotExist:
+        return anonymous
+    # As `django.contrib.auth.get_user`: a changed password ends sessions.
+    if not user.is_active or not constant_time_compare(
+        session_hash or "", user.get_session_auth_hash()
+    ):
+        return anonymous
+    return user, None
+
+
+async def get_identity(
+    credentials: Tuple[str, Optional[str]] = Depends(get_credentials)
+) -> Tuple[Any, Any]:
+    """User and token of the request."""
+    kind, key = credentials
+    if key is None:
+        return require(Resources.anonymous_user, "user")(), None
+    users = require(Resources.users, "user")
+    return await users.get_or_load(credentials, lambda: load_identity(kind, key))
+
+
+async def get_user(identity: Tuple[Any, Any] = Depends(get_identity)) -> Any:
+    return identity[0]
+
+
+async def get_auth(identity: Tuple[Any, Any] = Depends(get_identity)) -> Any:
+    return identity[1]
+
+
+def get_session(request: Request) -> Any:
+    """Loaded on first access, as Django's."""
+    store = require(Resources.session_store, "session")
+    return store(request.cookies.get(Resources.session_cookie))
+
+
+def get_COOKIES(request: Request) -> Dict[str, str]:
+    return dict(request.cookies)
+
+
+def get_headers(request: Request) -> Any:
+    return request.headers
+
+
+def get_META(request: Request) -> Dict[str, Any]:
+    """The WSGI environ keys Django fills `request.META` with."""
+    meta = {
+        "REQUEST_METHOD": request.method,
+        "PATH_INFO": request.url.path,
+        "QUERY_STRING": request.url.query,
+        "SCRIPT_NAME": request.scope.get("root_path", ""),
+        "SERVER_NAME": request.url.hostname or "",
+        "SERVER_PORT": str(request.url.port or ""),
+        "REMOTE_ADDR": request.client.host if request.client else "",
+        "REMOTE_PORT": request.client.port if request.client else "",
+    }
+    for name, value in request.headers.items():
+        name = name.upper().replace("-", "_")
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = "HTTP_" + name
+        meta[name] = meta[name] + "," + value if name in meta else value
+    return meta
+
+
+def get_method(request: Request) -> str:
+    return request.method
+
+
+def get_path(request: Request) -> str:
+    return request.url.path
+
+
+async def get_body(request: Request) -> bytes:
+    return await request.body()
+'''
+    )
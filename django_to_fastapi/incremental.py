@@ -0,0 +1,168 @@
+import json
+import re
+from functools import lru_cache
+from hashlib import sha256
+from os import path
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from django_to_fastapi import __version__
+from django_to_fastapi.config import Config
+from django_to_fastapi.routes import Route
+from django_to_fastapi.utils import read_file
+
+CACHE_FILENAME = ".django_to_fastapi_cache.json"
+
+
+def hash_content(*parts: str):
+    digest = sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_codemod_version():
+    """`__version__` and a hash of the codemod's own modules, so that output
+    cached by another revision of it is migrated again."""
+    package = Path(__file__).parent
+    return (
+        __version__
+        + "+"
+        + hash_content(
+            *[
+                module.name + "\0" + module.read_text()
+                for module in sorted(package.glob("*.py"))
+            ]
+        )
+    )
+
+
+def get_relevant_routes(source_code: str, routes: Sequence[Route]):
+    """Routes whose view may be defined in `source_code`.
+
+    This is a cheap textual superset of what `Migrator` matches, which is
+    enough to invalidate a module when one of its routes changes.
+    """
+    return [
+        route
+        for route in routes
+        if re.search(r"\b" + re.escape(route.view) + r"\b", source_code)
+    ]
+
+
+class MigrationCache:
+    """Persists, per migrated module, the key it was migrated with (which
+    covers the codemod options) and a hash of what was written, so unchanged
+    modules are neither migrated nor rewritten on the next run."""
+
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache_path = cache_path
+        self.modules: Dict[str, Dict] = {}
+        self.entrypoint: Optional[str] = None
+
+    @classmethod
+    def load(cls, cache_path: str):
+        cache = cls(cache_path)
+        try:
+            content = json.loads(read_file(cache_path))
+        except (FileNotFoundError, ValueError):
+            return cache
+        if content.get("version") == get_codemod_version():
+            cache.modules = content.get("modules", {})
+            cache.entrypoint = content.get("entrypoint")
+        return cache
+
+    def save(self):
+        if self.cache_path is None:
+            return
+        with open(self.cache_path, "w") as cursor:
+            json.dump(
+                {
+                    "version": get_codemod_version(),
+                    "modules": self.modules,
+                    "entrypoint": self.entrypoint,
+                },
+                cursor,
+                indent=2,
+                sort_keys=True,
+            )
+
+    def get_module_key(self, source_code: str, routes: Sequence[Route]):
+        return hash_content(
+            get_codemod_version(),
+            json.dumps(Config.snapshot(), sort_keys=True),
+            source_code,
+            *[
+                route.path + "\0" + route.view
+                for route in get_relevant_routes(source_code, routes)
+            ],
+        )
+
+    def is_fresh(self, module: str, key: str, output_path: str):
+        if self.cache_path is None:
+            return False
+        entry = self.modules.get(module)
+        if entry is None or entry["key"] != key:
+            return False
+        try:
+            return hash_content(read_file(output_path)) == entry["output"]
+        except FileNotFoundError:
+            return False
+
+    def get_warns(self, module: str):
+        return self.modules[module]["warns"]
+
+    def get_blocking_calls(self, module: str) -> List[Dict]:
+        return self.modules.get(module, {}).get("blocking_calls", [])
+
+    def uses_cache(self, module: str) -> bool:
+        return self.modules.get(module, {}).get("uses_cache", False)
+
+    def update(
+        self,
+        module: str,
+        key: str,
+        output: str,
+        warns: int,
+        blocking_calls: Sequence[Dict] = (),
+        uses_cache: bool = False,
+    ):
+        self.modules[module] = {
+            "key": key,
+            "output": hash_content(output),
+            "warns": warns,
+            "blocking_calls": list(blocking_calls),
+            "uses_cache": uses_cache,
+        }
+
+    def has_entrypoint_changed(
+        self,
+        modules: Sequence[str],
+        paths: Sequence[str] = (),
+        middleware: Sequence[str] = (),
+        uses_cache: bool = False,
+    ):
+        """Whether `main.py` and `bootstrap.py` have to be generated again."""
+        key = hash_content(
+            get_codemod_version(),
+            json.dumps(Config.snapshot(), sort_keys=True),
+            *modules,
+            # The lazy entrypoint groups modules by path.
+            json.dumps(list(paths)),
+            json.dumps(list(middleware)),
+            json.dumps(uses_cache),
+        )
+        changed = key != self.entrypoint
+        self.entrypoint = key
+        return changed
+
+    def prune(self, modules: Sequence[str]):
+        self.modules = {
+            module: entry for module, entry in self.modules.items() if module in modules
+        }
+
+
+def get_cache_path(destination_path: str):
+    return path.join(destination_path, CACHE_FILENAME)
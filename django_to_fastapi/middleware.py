@@ -0,0 +1,711 @@
+import ast
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from django_to_fastapi.blocking import get_imported_names
+from django_to_fastapi.utils import Logger, format_string
+
+# Starlette or `asgi_middleware.py` counterparts of Django middleware: the
+# import they need and the arguments of `app.add_middleware`.
+KNOWN_MIDDLEWARE: Dict[str, Tuple[str, str]] = {
+    "django.middleware.security.SecurityMiddleware": (
+        "import asgi_middleware",
+        "asgi_middleware.SecurityMiddleware",
+    ),
+    "django.middleware.gzip.GZipMiddleware": (
+        "from starlette.middleware.gzip import GZipMiddleware",
+        # Django's threshold.
+        "GZipMiddleware, minimum_size=200",
+    ),
+    "corsheaders.middleware.CorsMiddleware": (
+        "from starlette.middleware.cors import CORSMiddleware",
+        "CORSMiddleware, **asgi_middleware.get_cors_options()",
+    ),
+    # Validates the host against `ALLOWED_HOSTS`, as `request.get_host()`
+    # called by Django's.
+    "django.middleware.common.CommonMiddleware": (
+        "from starlette.middleware.trustedhost import TrustedHostMiddleware",
+        "TrustedHostMiddleware, allowed_hosts=asgi_middleware.get_allowed_hosts()",
+    ),
+    "django.middleware.clickjacking.XFrameOptionsMiddleware": (
+        "import asgi_middleware",
+        "asgi_middleware.XFrameOptionsMiddleware",
+    ),
+}
+# What migrated views get from `dependencies.py` instead.
+COVERED_MIDDLEWARE = {
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+}
+# Packages of middleware which can't be translated from source.
+THIRD_PARTY_PACKAGES = ("django.", "rest_framework.", "corsheaders.")
+# Django's responses, as `asgi_middleware.py` builds them.
+RESPONSES = {
+    "HttpResponse",
+    "JsonResponse",
+    "HttpResponseBadRequest",
+    "HttpResponseForbidden",
+    "HttpResponseNotFound",
+    "HttpResponseNotAllowed",
+    "HttpResponseServerError",
+    "HttpResponseRedirect",
+    "HttpResponsePermanentRedirect",
+}
+UNSUPPORTED_HOOKS = ("process_view", "process_exception", "process_template_response")
+
+
+def get_middleware(settings_source: str, module: str = "settings") -> List[str]:
+    """`MIDDLEWARE` of a settings module, as far as it is literal. Entries
+    without an ASGI counterpart are reported and left out."""
+    Logger.current_module = module
+    middleware: List[str] = []
+    for node in ast.parse(settings_source).body:
+        match node:
+            case ast.Assign(targets=[ast.Name(id="MIDDLEWARE")], value=value):
+                middleware = _get_entries(value)
+            case ast.AugAssign(target=ast.Name(id="MIDDLEWARE"), value=value):
+                middleware += _get_entries(value)
+    return middleware
+
+
+def _get_entries(node: ast.expr) -> List[str]:
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        Logger.print_warn(
+            "MIDDLEWARE isn't a literal list, its entries are not translated",
+            sample_code=ast.unparse(node) + "\n",
+            line=node.lineno,
+        )
+        return []
+    entries = []
+    for element in node.elts:
+        match element:
+            case ast.Constant(value=str(entry)) if entry in COVERED_MIDDLEWARE:
+                pass
+            case ast.Constant(value=str(entry)) if entry in KNOWN_MIDDLEWARE or (
+                is_custom(entry)
+            ):
+                entries.append(entry)
+            case _:
+                Logger.print_warn(
+                    "Middleware has no ASGI counterpart",
+                    sample_code=ast.unparse(element) + "\n",
+                    line=element.lineno,
+                )
+    return entries
+
+
+def is_custom(entry: str):
+    return (
+        entry not in KNOWN_MIDDLEWARE
+        and entry not in COVERED_MIDDLEWARE
+        and not entry.startswith(THIRD_PARTY_PACKAGES)
+    )
+
+
+def get_custom_middleware(middleware: Sequence[str]) -> Dict[str, List[str]]:
+    """Classes of the project's own middleware per module path."""
+    modules: Dict[str, List[str]] = {}
+    for entry in middleware:
+        if is_custom(entry):
+            module, _, name = entry.rpartition(".")
+            modules.setdefault(module.replace(".", "/"), []).append(name)
+    return modules
+
+
+def get_middleware_setup(middleware: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """Imports and `app.add_middleware(...)` calls of `bootstrap.py`. Starlette
+    wraps the app with the last added first, hence the reversed order: the
+    first entry of `MIDDLEWARE` stays outermost."""
+    imports: List[str] = []
+    custom: Dict[str, List[str]] = {}
+    calls: List[str] = []
+    for entry in middleware:
+        if entry in KNOWN_MIDDLEWARE:
+            entry_import, arguments = KNOWN_MIDDLEWARE[entry]
+            if (
+                "asgi_middleware." in arguments
+                and "import asgi_middleware" not in imports
+            ):
+                imports.append("import asgi_middleware")
+            if entry_import not in imports:
+                imports.append(entry_import)
+        else:
+            module, _, arguments = entry.rpartition(".")
+            custom.setdefault(module, []).append(arguments)
+        calls.insert(0, f"app.add_middleware({arguments})")
+    imports += [
+        f"from {module} import {', '.join(names)}" for module, names in custom.items()
+    ]
+    return imports, calls
+
+
+class MiddlewareTranslator(ast.NodeTransformer):
+    """Turns Django middleware classes into `asgi_middleware.HTTPMiddleware`
+    ones. `__call__` is split around `self.get_response(request)` into
+    `process_request` and `process_response`; locals used on both sides and
+    attributes set on the request are kept on `request.state`."""
+
+    def __init__(self, classes: Sequence[str]):
+        self.classes = classes
+        self.translated: List[str] = []
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        if node.name not in self.classes:
+            return node
+        node.bases = [ast.Name(id="HTTPMiddleware", ctx=ast.Load())]
+        body = []
+        for item in node.body:
+            match item:
+                case ast.FunctionDef(name="__init__"):
+                    body += self.translate_init(item)
+                case ast.FunctionDef(name="__call__") | ast.AsyncFunctionDef(
+                    name="__call__"
+                ):
+                    body += self.split_call(item)
+                case ast.FunctionDef(
+                    name="process_request" | "process_response"
+                ) | ast.AsyncFunctionDef(
+                    name="process_request" | "process_response"
+                ) if len(
+                    item.args.args
+                ) > 1:
+                    StateAttributes(item.args.args[1].arg).translate(item.body)
+                    body.append(item)
+                case ast.FunctionDef(name=name) if name in UNSUPPORTED_HOOKS:
+                    Logger.print_warn(
+                        f"{node.name}.{name} is not called by ASGI middleware",
+                        line=item.lineno,
+                    )
+                    body.append(item)
+                case _:
+                    body.append(item)
+        node.body = body or [ast.Pass()]
+        self.translated.append(node.name)
+        return node
+
+    def translate_init(self, node: ast.FunctionDef) -> List[ast.stmt]:
+        """`__init__(self, app)`, dropped when it only kept `get_response`."""
+        parameter = node.args.args[1].arg if len(node.args.args) > 1 else None
+        body = []
+        for statement in node.body:
+            match statement:
+                case ast.Assign(value=ast.Name(id=name)) if name == parameter:
+                    continue
+                case ast.Expr(
+                    value=ast.Call(
+                        func=ast.Attribute(
+                            attr="__init__", value=ast.Call(func=ast.Name(id="super"))
+                        )
+                    )
+                ):
+                    continue
+            body.append(statement)
+        if not body:
+            return []
+        node.args.args[1:] = [ast.arg(arg="app")]
+        node.body = [ast.parse("super().__init__(app)").body[0], *body]
+        return [node]
+
+    def split_call(self, node):
+        request = node.args.args[1].arg
+        for index, statement in enumerate(node.body):
+            match statement:
+                case ast.Assign(
+                    targets=[ast.Name(id=response)], value=value
+                ) if self.is_get_response(value):
+                    break
+                case ast.Return(value=value) if self.is_get_response(value):
+                    response = None
+                    break
+        else:
+            Logger.print_warn(
+                "Could not find `response = self.get_response(request)` in "
+                "__call__, the middleware is left as it is",
+                line=node.lineno,
+            )
+            return [node]
+        before, after = node.body[:index], node.body[index + 1 :]
+        stored = {
+            child.id
+            for statement in before
+            for child in ast.walk(statement)
+            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store)
+        }
+        loaded = {
+            child.id
+            for statement in after
+            for child in ast.walk(statement)
+            if isinstance(child, ast.Name)
+        }
+        StateNames(stored & loaded - {request}, request).visit(
+            ast.Module(body=[*before, *after], type_ignores=[])
+        )
+        StateAttributes(request).translate([*before, *after])
+        function = (
+            ast.AsyncFunctionDef
+            if isinstance(node, ast.AsyncFunctionDef)
+            else ast.FunctionDef
+        )
+        methods = []
+        if before:
+            methods.append(
+                ast.copy_location(
+                    function(
+                        name="process_request",
+                        args=ast.arguments(
+                            posonlyargs=[],
+                            args=[ast.arg(arg="self"), ast.arg(arg=request)],
+                            kwonlyargs=[],
+                            kw_defaults=[],
+                            defaults=[],
+                        ),
+                        body=before,
+                        decorator_list=[],
+                        returns=None,
+                    ),
+                    node,
+                )
+            )
+        if after and response is not None:
+            methods.append(
+                ast.copy_location(
+                    function(
+                        name="process_response",
+                        args=ast.arguments(
+                            posonlyargs=[],
+                            args=[
+                                ast.arg(arg="self"),
+                                ast.arg(arg=request),
+                                ast.arg(arg=response),
+                            ],
+                            kwonlyargs=[],
+                            kw_defaults=[],
+                            defaults=[],
+                        ),
+                        body=after,
+                        decorator_list=[],
+                        returns=None,
+                    ),
+                    node,
+                )
+            )
+        return methods
+
+    @staticmethod
+    def is_get_response(node: Optional[ast.expr]):
+        match node:
+            case ast.Await(value=value):
+                return MiddlewareTranslator.is_get_response(value)
+            case ast.Call(
+                func=ast.Attribute(attr="get_response", value=ast.Name(id="self"))
+            ):
+                return True
+        return False
+
+
+class StateNames(ast.NodeTransformer):
+    """Replaces `names` with attributes of `request.state`."""
+
+    def __init__(self, names: Set[str], request: str):
+        self.names = names
+        self.request = request
+
+    def visit_Name(self, node: ast.Name):
+        if node.id not in self.names:
+            return node
+        return ast.copy_location(
+            ast.Attribute(
+                value=ast.Attribute(
+                    value=ast.Name(id=self.request, ctx=ast.Load()),
+                    attr="state",
+                    ctx=ast.Load(),
+                ),
+                attr=node.id,
+                ctx=node.ctx,
+            ),
+            node,
+        )
+
+
+class StateAttributes(ast.NodeTransformer):
+    """Moves attributes set on `request` to `request.state`, the only part of
+    the middleware's request shared with the handler's, through the scope."""
+
+    def __init__(self, request: str):
+        self.request = request
+        self.attributes: Set[str] = set()
+
+    def translate(self, statements: Sequence[ast.stmt]):
+        module = ast.Module(body=list(statements), type_ignores=[])
+        for child in ast.walk(module):
+            if (
+                isinstance(child, ast.Attribute)
+                and isinstance(child.ctx, ast.Store)
+                and isinstance(child.value, ast.Name)
+                and child.value.id == self.request
+                and child.attr != "state"
+            ):
+                if child.attr not in self.attributes:
+                    Logger.print_warn(
+                        f"{self.request}.{child.attr} is set on "
+                        f"{self.request}.state, views have to read it from there",
+                        line=child.lineno,
+                    )
+                self.attributes.add(child.attr)
+        if self.attributes:
+            self.visit(module)
+
+    def visit_Attribute(self, node: ast.Attribute):
+        self.generic_visit(node)
+        if not (
+            isinstance(node.value, ast.Name)
+            and node.value.id == self.request
+            and node.attr in self.attributes
+        ):
+            return node
+        node.value = ast.copy_location(
+            ast.Attribute(value=node.value, attr="state", ctx=ast.Load()), node.value
+        )
+        return node
+
+
+def translate_middleware(
+    source_code: str, classes: Sequence[str], module_path: str = ""
+) -> ast.Module:
+    """The module of Django middleware `classes`, importing what they need of
+    `asgi_middleware.py`. Django imports are left to `RemoveImports`."""
+    Logger.current_module = module_path
+    module = ast.parse(source_code)
+    imported = get_imported_names(module)
+    translator = MiddlewareTranslator(classes)
+    translator.visit(module)
+    for name in set(classes) - set(translator.translated):
+        Logger.print_warn(f"Middleware class {name} not found")
+    names = ["HTTPMiddleware"] + sorted(
+        name
+        for name, qualified_name in imported.items()
+        if name in RESPONSES and qualified_name.startswith("django.")
+    )
+    position = next(
+        (
+            index
+            for index, node in enumerate(module.body)
+            if not isinstance(node, (ast.Import, ast.ImportFrom))
+            and not (
+                isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)
+            )
+        ),
+        len(module.body),
+    )
+    module.body.insert(
+        position,
+        ast.ImportFrom(
+            module="asgi_middleware",
+            names=[ast.alias(name=name, asname=None) for name in names],
+            level=0,
+        ),
+    )
+    return ast.fix_missing_locations(module)
+
+
+def generate_middleware_module():
+    return format_string(
+        '''"""ASGI counterparts of Django middleware, and the base of the project's
+own. They are pure ASGI middleware: unlike `BaseHTTPMiddleware`, they don't
+run the app in another task nor buffer streamed bodies.
+"""
+import inspect
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import (
+    JSONResponse,
+    RedirectResponse,
+    Response,
+)
+
+from conf import settings
+from dependencies import get_META
+
+# django-cors-headers' defaults.
+CORS_METHODS = ["DELETE", "GET", "OPTIONS", "PATCH", "POST", "PUT"]
+CORS_HEADERS = [
+    "accept",
+    "authorization",
+    "content-type",
+    "user-agent",
+    "x-csrftoken",
+    "x-requested-with",
+]
+
+
+def get_cors_options() -> Dict[str, Any]:
+    """`CORSMiddleware` arguments from django-cors-headers settings."""
+    origins = list(
+        getattr(
+            settings,
+            "CORS_ALLOWED_ORIGINS",
+            getattr(settings, "CORS_ORIGIN_WHITELIST", []),
+        )
+    )
+    if getattr(
+        settings, "CORS_ALLOW_ALL_ORIGINS", getattr(settings, "CORS_ORIGIN_ALLOW_ALL", False)
+    ):
+        origins = ["*"]
+    regexes = getattr(
+        settings,
+        "CORS_ALLOWED_ORIGIN_REGEXES",
+        getattr(settings, "CORS_ORIGIN_REGEX_WHITELIST", []),
+    )
+    return {
+        "allow_origins": origins,
+        "allow_origin_regex": "|".join(f"(?:{regex})" for regex in regexes) or None,
+        "allow_methods": list(getattr(settings, "CORS_ALLOW_METHODS", CORS_METHODS)),
+        "allow_headers": list(getattr(settings, "CORS_ALLOW_HEADERS", CORS_HEADERS)),
+        "allow_credentials": getattr(settings, "CORS_ALLOW_CREDENTIALS", False),
+        "expose_headers": list(getattr(settings, "CORS_EXPOSE_HEADERS", [])),
+        "max_age": getattr(settings, "CORS_PREFLIGHT_MAX_AGE", 86400),
+    }
+
+
+def get_allowed_hosts() -> List[str]:
+    """`ALLOWED_HOSTS` as `TrustedHostMiddleware` patterns: Django's
+    `.example.com` matches the domain and its subdomains."""
+    hosts = list(getattr(settings, "ALLOWED_HOSTS", []))
+    if not hosts and getattr(settings, "DEBUG", False):
+        hosts = [".localhost", "127.0.0.1", "[::1]"]
+    patterns = []
+    for host in hosts:
+        patterns += [host[1:], "*" + host] if host.startswith(".") else [host]
+    return patterns
+
+
+def add_headers(send, headers: List[Tuple[str, str]]):
+    """`send` setting `headers` on responses which don't have them."""
+
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            response_headers = MutableHeaders(scope=message)
+            for name, value in headers:
+                response_headers.setdefault(name, value)
+        await send(message)
+
+    return wrapped
+
+
+class SecurityMiddleware:
+    """Django's `SecurityMiddleware`, configured by the same settings."""
+
+    def __init__(self, app):
+        self.app = app
+        self.redirect = getattr(settings, "SECURE_SSL_REDIRECT", False)
+        self.redirect_host = getattr(settings, "SECURE_SSL_HOST", None)
+        self.headers = []
+        if getattr(settings, "SECURE_CONTENT_TYPE_NOSNIFF", True):
+            self.headers.append(("x-content-type-options", "nosniff"))
+        referrer_policy = getattr(settings, "SECURE_REFERRER_POLICY", "same-origin")
+        if referrer_policy:
+            if not isinstance(referrer_policy, str):
+                referrer_policy = ",".join(referrer_policy)
+            self.headers.append(("referrer-policy", referrer_policy))
+        opener_policy = getattr(
+            settings, "SECURE_CROSS_ORIGIN_OPENER_POLICY", "same-origin"
+        )
+        if opener_policy:
+            self.headers.append(("cross-origin-opener-policy", opener_policy))
+        self.https_headers = list(self.headers)
+        hsts_seconds = getattr(settings, "SECURE_HSTS_SECONDS", 0)
+        if hsts_seconds:
+            hsts = f"max-age={hsts_seconds}"
+            if getattr(settings, "SECURE_HSTS_INCLUDE_SUBDOMAINS", False):
+                hsts += "; includeSubDomains"
+            if getattr(settings, "SECURE_HSTS_PRELOAD", False):
+                hsts += "; preload"
+            self.https_headers.append(("strict-transport-security", hsts))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        secure = scope.get("scheme") == "https"
+        if self.redirect and not secure:
+            request = Request(scope)
+            url = request.url.replace(
+                scheme="https", netloc=self.redirect_host or request.url.netloc
+            )
+            await RedirectResponse(str(url), status_code=301)(scope, receive, send)
+            return
+        headers = self.https_headers if secure else self.headers
+        await self.app(scope, receive, add_headers(send, headers))
+
+
+class XFrameOptionsMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self.headers = [
+            ("x-frame-options", getattr(settings, "X_FRAME_OPTIONS", "DENY").upper())
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, add_headers(send, self.headers))
+
+
+class DjangoRequest(Request):
+    """Starlette's request, with the attributes of Django's middleware use
+    most."""
+
+    @property
+    def path(self) -> str:
+        return self.url.path
+
+    path_info = path
+
+    @property
+    def GET(self):
+        return self.query_params
+
+    @property
+    def COOKIES(self) -> Dict[str, str]:
+        return self.cookies
+
+    @property
+    def META(self) -> Dict[str, Any]:
+        if "django_meta" not in self.scope:
+            self.scope["django_meta"] = get_META(self)
+        return self.scope["django_meta"]
+
+    def get_host(self) -> str:
+        return self.headers.get("host", "")
+
+    def get_full_path(self) -> str:
+        return self.url.path + ("?" + self.url.query if self.url.query else "")
+
+    def is_secure(self) -> bool:
+        return self.url.scheme == "https"
+
+
+class ResponseStart:
+    """Status and headers of a response about to be sent, with the header
+    API of Django's responses. Its body is streamed as it is."""
+
+    def __init__(self, message: Dict[str, Any]):
+        self.message = message
+        self.headers = MutableHeaders(scope=message)
+
+    @property
+    def status_code(self) -> int:
+        return self.message["status"]
+
+    @status_code.setter
+    def status_code(self, status_code: int):
+        self.message["status"] = status_code
+
+    def __getitem__(self, name: str) -> str:
+        return self.headers[name]
+
+    def __setitem__(self, name: str, value: str):
+        self.headers[name] = str(value)
+
+    def __delitem__(self, name: str):
+        if name in self.headers:
+            del self.headers[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.headers
+
+    has_header = __contains__
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.headers.get(name, default)
+
+    def setdefault(self, name: str, value: str):
+        self.headers.setdefault(name, str(value))
+
+
+async def _resolve(value):
+    return await value if inspect.isawaitable(value) else value
+
+
+class HTTPMiddleware:
+    """Base of middleware migrated from Django. `process_request(request)`
+    may return a response, sent instead of calling the app;
+    `process_response(request, response)` gets a `ResponseStart`, changed in
+    place, before it is sent. Both may be `async`."""
+
+    def __init__(self, app):
+        self.app = app
+        self.has_process_response = (
+            type(self).process_response is not HTTPMiddleware.process_response
+        )
+
+    def process_request(self, request: DjangoRequest) -> Optional[Response]:
+        return None
+
+    def process_response(self, request: DjangoRequest, response: ResponseStart):
+        return response
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = DjangoRequest(scope, receive)
+        app = await _resolve(self.process_request(request)) or self.app
+        if self.has_process_response:
+            send = self.wrap(request, send)
+        await app(scope, receive, send)
+
+    def wrap(self, request: DjangoRequest, send):
+        async def wrapped(message):
+            if message["type"] == "http.response.start":
+                await _resolve(self.process_response(request, ResponseStart(message)))
+            await send(message)
+
+        return wrapped
+
+
+def HttpResponse(content=b"", content_type=None, status=200, headers=None):
+    return Response(
+        content,
+        status_code=status,
+        headers=headers,
+        media_type=content_type or "text/html; charset=utf-8",
+    )
+
+
+def JsonResponse(data, status=200, headers=None, safe=True, **kwargs):
+    return JSONResponse(data, status_code=status, headers=headers)
+
+
+def HttpResponseBadRequest(content=b"", **kwargs):
+    return HttpResponse(content, status=400, **kwargs)
+
+
+def HttpResponseForbidden(content=b"", **kwargs):
+    return HttpResponse(content, status=403, **kwargs)
+
+
+def HttpResponseNotFound(content=b"", **kwargs):
+    return HttpResponse(content, status=404, **kwargs)
+
+
+def HttpResponseNotAllowed(permitted_methods, content=b"", **kwargs):
+    response = HttpResponse(content, status=405, **kwargs)
+    response.headers["allow"] = ", ".join(permitted_methods)
+    return response
+
+
+def HttpResponseServerError(content=b"", **kwargs):
+    return HttpResponse(content, status=500, **kwargs)
+
+
+def HttpResponseRedirect(redirect_to: str, **kwargs):
+    return RedirectResponse(redirect_to, status_code=302, headers=kwargs.get("headers"))
+
+
+def HttpResponsePermanentRedirect(redirect_to: str, **kwargs):
+    return RedirectResponse(redirect_to, status_code=301, headers=kwargs.get("headers"))
+'''
+    )
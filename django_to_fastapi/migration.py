@@ -0,0 +1,374 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django_to_fastapi.blocking import BlockingCalls
+from django_to_fastapi.caching import (
+    generate_cache_module,
+    generate_caching_module,
+    imports_cache,
+)
+from django_to_fastapi.config import Config
+from django_to_fastapi.dependencies import generate_dependencies_module
+from django_to_fastapi.incremental import MigrationCache, get_cache_path
+from django_to_fastapi.middleware import (
+    generate_middleware_module,
+    get_custom_middleware,
+    get_middleware,
+    translate_middleware,
+)
+from django_to_fastapi.models import generate_database_module, translate_models
+from django_to_fastapi.modules import (
+    RemoveImports,
+    generate_bootstrap_module,
+    generate_entrypoint,
+    generate_fast_json_module,
+    generate_gunicorn_config,
+    generate_lazy_module,
+    generate_server_module,
+    generate_static_routes_module,
+    process_code,
+)
+from django_to_fastapi.openapi import generate_openapi, generate_openapi_module
+from django_to_fastapi.pagination import (
+    generate_pagination_module,
+    get_default_pagination_class,
+)
+from django_to_fastapi.profiling import ModuleProfile, Profiler
+from django_to_fastapi.routes import Route, RouteTable, URLConfResolver
+from django_to_fastapi.utils import (
+    Logger,
+    format_files,
+    read_file,
+    unparse,
+    write_file,
+)
+
+
+@dataclass
+class MigratedModule:
+    module: str
+    source_code: str
+    warns: int = 0
+    records: List[Tuple[int, str]] = field(default_factory=list)
+    profile: Optional[ModuleProfile] = None
+    # Handlers calling blocking APIs, see `BlockingCallsHandler`.
+    blocking_calls: List[Dict] = field(default_factory=list)
+    # Whether it imports `cache.py`.
+    uses_cache: bool = False
+
+
+def get_module_path(root_path: str, module: str):
+    return root_path + "/" + module + ".py"
+
+
+def migrate_module(root_path: str, module: str, routes: Sequence[Route]):
+    Logger.current_module = module
+    warns = Logger.warns_counter
+    BlockingCalls.records = []
+    Profiler.start(module)
+    with Profiler.cprofile(module):
+        source_code = read_file(get_module_path(root_path, module))
+        # fix_missing_annotations(source_code)
+        migrated = process_code(source_code, routes, module)
+        output = unparse(migrated)
+    return MigratedModule(
+        module=module,
+        source_code=output,
+        warns=Logger.warns_counter - warns,
+        profile=Profiler.finish(),
+        blocking_calls=BlockingCalls.records,
+        uses_cache=imports_cache(migrated),
+    )
+
+
+def _initialize_worker(options: Dict[str, Any], profiler_settings: Dict[str, Any]):
+    Config.update(**options)
+    Profiler.configure(**profiler_settings)
+
+
+def _migrate_module_in_worker(root_path: str, module: str, routes: Sequence[Route]):
+    Logger.records = []
+    Logger.warns_counter = 0
+    migrated = migrate_module(root_path, module, routes)
+    migrated.records = Logger.records
+    return migrated
+
+
+def migrate_modules(
+    root_path: str, modules: Sequence[str], routes: Sequence[Route], jobs: int = 1
+) -> Iterator[MigratedModule]:
+    """Yields migrated modules in the order of `modules`.
+
+    With `jobs` above 1, modules are spread across worker processes, largest
+    first so a big module doesn't end up last on an otherwise idle pool. Their
+    log records are replayed here in order, so the outcome matches a serial run.
+    """
+    if jobs <= 1 or len(modules) <= 1:
+        for module in modules:
+            yield migrate_module(root_path, module, routes)
+        return
+
+    by_size = sorted(
+        dict.fromkeys(modules),
+        key=lambda module: os.path.getsize(get_module_path(root_path, module)),
+        reverse=True,
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_initialize_worker,
+        initargs=(Config.snapshot(), Profiler.settings()),
+    ) as executor:
+        futures = {
+            module: executor.submit(
+                _migrate_module_in_worker, root_path, module, routes
+            )
+            for module in by_size
+        }
+        for module in modules:
+            migrated = futures[module].result()
+            Logger.current_module = module
+            Logger.replay(migrated.records, migrated.warns)
+            yield migrated
+
+
+class ProjectMigration:
+    """Migrates every module routed from the root URLconf at `urls_path` into
+    `destination_path`.
+
+    The resolved routes and the cache are kept on the instance, so `run` can
+    be called again, as `--watch` does, with only the modules that changed.
+    """
+
+    def __init__(
+        self,
+        urls_path: str,
+        destination_path: str,
+        jobs: int = 1,
+        use_cache: bool = True,
+    ):
+        parts = urls_path.removesuffix(".py").split("/")
+        self.root_path = "/".join(parts[0:-2])
+        self.urls_module = ".".join(parts[-2:])
+        self.settings_path = "/".join(parts[0:-1]) + "/settings.py"
+        self.destination_path = destination_path
+        self.jobs = jobs
+
+        os.makedirs(destination_path, exist_ok=True)
+        self.cache = (
+            MigrationCache.load(get_cache_path(destination_path))
+            if use_cache
+            else MigrationCache()
+        )
+        self.resolver = URLConfResolver(self.root_path)
+        self.routes = self.resolve_routes()
+
+    def resolve_routes(self, changed_urlconfs: Sequence[str] = ()) -> RouteTable:
+        """Resolves routes again, parsing only `changed_urlconfs` anew."""
+        for urls_module in changed_urlconfs:
+            self.resolver.invalidate(urls_module)
+        self.routes = self.resolver.resolve(self.urls_module)
+        return self.routes
+
+    def run(self, modules: Optional[Sequence[str]] = None) -> List[MigratedModule]:
+        """Migrates and writes the stale ones among `modules`, every routed
+        module by default, then the entrypoint if the set of routed modules
+        changed. Returns what was migrated."""
+        routes = self.routes
+        if modules is None:
+            modules = routes.modules
+        settings_source = read_file(self.settings_path)
+        Config.update(
+            default_pagination_class=get_default_pagination_class(settings_source)
+        )
+
+        keys = {}
+        stale_modules = []
+        for module in modules:
+            keys[module] = self.cache.get_module_key(
+                read_file(get_module_path(self.root_path, module)), routes
+            )
+            if self.cache.is_fresh(
+                module, keys[module], get_module_path(self.destination_path, module)
+            ):
+                Logger.warns_counter += self.cache.get_warns(module)
+            else:
+                stale_modules.append(module)
+
+        migrated_modules = []
+        written_paths = []
+        for migrated in migrate_modules(
+            self.root_path, stale_modules, routes, jobs=self.jobs
+        ):
+            module = migrated.module
+            output_path = get_module_path(self.destination_path, module)
+            Profiler.start(module, migrated.profile)
+            with Profiler.stage("write"):
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                if write_file(output_path, migrated.source_code):
+                    written_paths.append(output_path)
+            Profiler.finish()
+            migrated_modules.append(migrated)
+
+        middleware = get_middleware(
+            settings_source,
+            os.path.relpath(self.settings_path, self.root_path).removesuffix(".py"),
+        )
+        migrated_use_cache = {
+            migrated.module: migrated.uses_cache for migrated in migrated_modules
+        }
+        uses_cache = any(
+            migrated_use_cache[module]
+            if module in migrated_use_cache
+            else self.cache.uses_cache(module)
+            for module in routes.modules
+        )
+        entrypoint_changed = (
+            self.cache.has_entrypoint_changed(
+                routes.modules, [route.path for route in routes], middleware, uses_cache
+            )
+            or not os.path.exists(self.destination_path + "/bootstrap.py")
+            or not os.path.exists(self.destination_path + "/main.py")
+        )
+        if entrypoint_changed:
+            generated = [
+                ("bootstrap.py", generate_bootstrap_module(middleware, uses_cache)),
+                ("main.py", generate_entrypoint(routes.modules, routes)),
+                ("server.py", generate_server_module()),
+                ("gunicorn.conf.py", generate_gunicorn_config()),
+                ("openapi.py", generate_openapi_module(routes.modules)),
+                ("dependencies.py", generate_dependencies_module()),
+                ("caching.py", generate_caching_module()),
+                ("asgi_middleware.py", generate_middleware_module()),
+                ("pagination.py", generate_pagination_module()),
+            ]
+            if uses_cache:
+                generated.append(("cache.py", generate_cache_module()))
+            if Config.static_routes:
+                generated.append(("static_routes.py", generate_static_routes_module()))
+            if Config.entrypoint == "lazy":
+                generated.append(("lazy.py", generate_lazy_module()))
+            if Config.responses == "fast":
+                generated.append(("fast_json.py", generate_fast_json_module()))
+            for filename, source_code in generated:
+                if write_file(self.destination_path + "/" + filename, source_code):
+                    written_paths.append(self.destination_path + "/" + filename)
+
+        written_paths += self.write_middleware(middleware)
+        if Config.models == "sqlalchemy":
+            written_paths += self.write_models()
+
+        if (
+            migrated_modules
+            or entrypoint_changed
+            or not os.path.exists(self.destination_path + "/openapi.json")
+        ):
+            self.write_openapi()
+
+        format_files(written_paths)
+
+        for migrated in migrated_modules:
+            self.cache.update(
+                migrated.module,
+                keys[migrated.module],
+                read_file(get_module_path(self.destination_path, migrated.module)),
+                migrated.warns,
+                migrated.blocking_calls,
+                migrated.uses_cache,
+            )
+
+        os.makedirs(self.destination_path + "/conf", exist_ok=True)
+        write_file(
+            self.destination_path + "/conf/settings.py", read_file(self.settings_path)
+        )
+
+        self.cache.prune(routes.modules)
+        self.cache.save()
+        return migrated_modules
+
+    def get_models_modules(self) -> List[str]:
+        """`models` modules of the apps holding routed modules."""
+        models_modules = []
+        for module in self.routes.modules:
+            models_module = os.path.dirname(module) + "/models"
+            if models_module not in models_modules and os.path.exists(
+                get_module_path(self.root_path, models_module)
+            ):
+                models_modules.append(models_module)
+        return models_modules
+
+    def write_models(self) -> List[str]:
+        """Writes SQLAlchemy models and the engine, returns written paths.
+
+        Each `models` module is translated next to it, as `sa_models`: views
+        still query the Django models they import. It's cheap enough to be
+        done on every run, which keeps relations between apps up to date."""
+        models_modules = self.get_models_modules()
+        sources = {
+            module: read_file(get_module_path(self.root_path, module))
+            for module in models_modules
+        }
+        app_labels = {module: module.split("/")[-2] for module in models_modules}
+        translated = translate_models(
+            {app_labels[module]: source for module, source in sources.items()}
+        )
+        sqlalchemy_modules = [
+            os.path.dirname(module) + "/sa_models" for module in models_modules
+        ]
+        written_paths = []
+        for module, sqlalchemy_module in zip(models_modules, sqlalchemy_modules):
+            output_path = get_module_path(self.destination_path, sqlalchemy_module)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            if write_file(output_path, translated[app_labels[module]]):
+                written_paths.append(output_path)
+        if write_file(
+            self.destination_path + "/database.py",
+            generate_database_module(sqlalchemy_modules),
+        ):
+            written_paths.append(self.destination_path + "/database.py")
+        return written_paths
+
+    def write_middleware(self, middleware: Sequence[str]) -> List[str]:
+        """Writes the project's own middleware as ASGI middleware, at the same
+        path as the models, on every run. Returns written paths."""
+        written_paths = []
+        for module, classes in get_custom_middleware(middleware).items():
+            source_path = get_module_path(self.root_path, module)
+            if not os.path.exists(source_path):
+                Logger.print_warn(
+                    f"Middleware module {module.replace('/', '.')} not found, "
+                    f"{', '.join(classes)} not translated"
+                )
+                continue
+            translated = RemoveImports().visit(
+                translate_middleware(read_file(source_path), classes, module)
+            )
+            output_path = get_module_path(self.destination_path, module)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            if write_file(output_path, unparse(translated)):
+                written_paths.append(output_path)
+        return written_paths
+
+    def write_openapi(self):
+        """Writes the OpenAPI schema of every routed module, as migrated."""
+        schema = generate_openapi(
+            {
+                module: read_file(get_module_path(self.destination_path, module))
+                for module in self.routes.modules
+            }
+        )
+        write_file(
+            self.destination_path + "/openapi.json",
+            json.dumps(schema, indent=2) + "\n",
+        )
+
+    def get_blocking_calls(self) -> Dict[str, List[Dict]]:
+        """Handlers calling blocking APIs per module, as of the last run."""
+        return {
+            module: self.cache.get_blocking_calls(module)
+            for module in self.routes.modules
+            if self.cache.get_blocking_calls(module)
+        }
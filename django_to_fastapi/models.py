@@ -0,0 +1,846 @@
+import ast
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from django_to_fastapi.blocking import get_imported_names, get_qualified_name
+from django_to_fastapi.config import Config
+from django_to_fastapi.utils import Logger, format_string, unparse
+
+DJANGO_MODELS = "django.db.models"
+
+# Django field -> (SQLAlchemy type, annotation).
+FIELD_TYPES: Dict[str, Tuple[str, str]] = {
+    "AutoField": ("Integer", "int"),
+    "BigAutoField": ("BigInteger", "int"),
+    "SmallAutoField": ("SmallInteger", "int"),
+    "IntegerField": ("Integer", "int"),
+    "BigIntegerField": ("BigInteger", "int"),
+    "SmallIntegerField": ("SmallInteger", "int"),
+    "PositiveIntegerField": ("Integer", "int"),
+    "PositiveBigIntegerField": ("BigInteger", "int"),
+    "PositiveSmallIntegerField": ("SmallInteger", "int"),
+    "BooleanField": ("Boolean", "bool"),
+    "NullBooleanField": ("Boolean", "bool"),
+    "FloatField": ("Float", "float"),
+    "DecimalField": ("Numeric", "Decimal"),
+    "CharField": ("String", "str"),
+    "SlugField": ("String", "str"),
+    "EmailField": ("String", "str"),
+    "URLField": ("String", "str"),
+    "FilePathField": ("String", "str"),
+    "FileField": ("String", "str"),
+    "ImageField": ("String", "str"),
+    "GenericIPAddressField": ("String", "str"),
+    "TextField": ("Text", "str"),
+    "DateField": ("Date", "date"),
+    "DateTimeField": ("DateTime", "datetime"),
+    "TimeField": ("Time", "time"),
+    "DurationField": ("Interval", "timedelta"),
+    "UUIDField": ("Uuid", "UUID"),
+    "JSONField": ("JSON", "Any"),
+    "BinaryField": ("LargeBinary", "bytes"),
+}
+# Default `max_length` of Django string fields.
+MAX_LENGTHS = {
+    "CharField": None,
+    "SlugField": 50,
+    "EmailField": 254,
+    "URLField": 200,
+    "FilePathField": 100,
+    "FileField": 100,
+    "ImageField": 100,
+    "GenericIPAddressField": 39,
+}
+RELATION_FIELDS = ("ForeignKey", "OneToOneField", "ManyToManyField")
+ON_DELETE = {
+    "CASCADE": "CASCADE",
+    "SET_NULL": "SET NULL",
+    "SET_DEFAULT": "SET DEFAULT",
+    "PROTECT": "RESTRICT",
+    "RESTRICT": "RESTRICT",
+}
+ANNOTATION_IMPORTS = {
+    "Decimal": "decimal",
+    "date": "datetime",
+    "datetime": "datetime",
+    "time": "datetime",
+    "timedelta": "datetime",
+    "UUID": "uuid",
+    "Any": "typing",
+    "List": "typing",
+    "Optional": "typing",
+    "Enum": "enum",
+}
+# Field options with no bearing on the database schema.
+IGNORED_OPTIONS = {
+    "blank",
+    "choices",
+    "editable",
+    "error_messages",
+    "help_text",
+    "related_name",
+    "related_query_name",
+    "limit_choices_to",
+    "to_field",
+    "upload_to",
+    "validators",
+    "verbose_name",
+    "on_delete",
+    "max_length",
+    "max_digits",
+    "decimal_places",
+    "auto_now",
+    "auto_now_add",
+    "null",
+    "db_column",
+    "db_table",
+    "through",
+    "symmetrical",
+    "to",
+    "db_constraint",
+    "swappable",
+}
+
+
+@dataclass
+class ModelDefinition:
+    name: str
+    app_label: str
+    node: ast.ClassDef
+    table: str
+    abstract: bool = False
+    meta: Optional[ast.ClassDef] = None
+
+
+@dataclass
+class ModelsModule:
+    app_label: str
+    tree: ast.Module
+    imports: Dict[str, str]
+    models: Dict[str, ModelDefinition] = field(default_factory=dict)
+
+
+def _get_option(node: ast.Call, name: str, position: int = -1):
+    for keyword in node.keywords:
+        if keyword.arg == name:
+            return keyword.value
+    if 0 <= position < len(node.args):
+        return node.args[position]
+    return None
+
+
+def _get_constant(node: ast.Call, name: str, position: int = -1):
+    value = _get_option(node, name, position)
+    return value.value if isinstance(value, ast.Constant) else None
+
+
+def _get_meta_option(meta: Optional[ast.ClassDef], name: str):
+    if meta is None:
+        return None
+    for statement in meta.body:
+        match statement:
+            case ast.Assign(targets=[ast.Name(id=target)], value=value) if (
+                target == name
+            ):
+                return value
+    return None
+
+
+class ModelsTranslator:
+    """Translates the `models.py` of each app into SQLAlchemy 2.0 declarative
+    models using `Mapped` annotations, keeping Django's table and column
+    names so the generated models map the existing database.
+
+    Apps are read first so relations can point at models of other apps; only
+    relations to translated models get a `relationship()`, others keep their
+    foreign key column alone.
+    """
+
+    def __init__(self):
+        self.modules: Dict[str, ModelsModule] = {}
+
+    def add(self, app_label: str, source_code: str):
+        tree = ast.parse(source_code)
+        module = ModelsModule(app_label, tree, get_imported_names(tree))
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and self._is_model(module, node):
+                meta = next(
+                    (
+                        item
+                        for item in node.body
+                        if isinstance(item, ast.ClassDef) and item.name == "Meta"
+                    ),
+                    None,
+                )
+                db_table = _get_meta_option(meta, "db_table")
+                abstract = _get_meta_option(meta, "abstract")
+                module.models[node.name] = ModelDefinition(
+                    name=node.name,
+                    app_label=app_label,
+                    node=node,
+                    table=db_table.value
+                    if isinstance(db_table, ast.Constant)
+                    else app_label + "_" + node.name.lower(),
+                    abstract=isinstance(abstract, ast.Constant)
+                    and bool(abstract.value),
+                    meta=meta,
+                )
+        self.modules[app_label] = module
+
+    def _is_model(self, module: ModelsModule, node: ast.ClassDef):
+        return any(
+            get_qualified_name(base, module.imports) == DJANGO_MODELS + ".Model"
+            or (isinstance(base, ast.Name) and base.id in module.models)
+            for base in node.bases
+        )
+
+    def get_model(self, name: str) -> Optional[ModelDefinition]:
+        for module in self.modules.values():
+            if name in module.models:
+                return module.models[name]
+        return None
+
+    def get_field_type(self, module: ModelsModule, node: ast.expr):
+        qualified_name = get_qualified_name(node, module.imports) or ""
+        if qualified_name.startswith(DJANGO_MODELS + "."):
+            return qualified_name.removeprefix(DJANGO_MODELS + ".")
+        return None
+
+    def resolve_target(
+        self, module: ModelsModule, model: ModelDefinition, target: ast.expr
+    ) -> Tuple[str, str]:
+        """Class name and table of the model a relation points at."""
+        match target:
+            case ast.Constant(value="self"):
+                return model.name, model.table
+            case ast.Constant(value=str(value)) if "." in value:
+                app_label, name = value.split(".")
+            case ast.Constant(value=str(name)):
+                app_label = model.app_label
+            case ast.Name(id=name) if name in module.imports:
+                app_label = module.imports[name].split(".")[0]
+            case ast.Name(id=name):
+                app_label = model.app_label
+            case ast.Attribute(attr="AUTH_USER_MODEL"):
+                app_label, name = "auth", "User"
+            case _:
+                return "", ""
+        definition = self.get_model(name)
+        if definition is not None:
+            return definition.name, definition.table
+        return name, app_label + "_" + name.lower()
+
+    def get_target_key(
+        self, class_name: str, to_field: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """Column name and annotation of the field relations to `class_name`
+        reference: `to_field`, or the primary key, `id` unless declared."""
+        definition = self.get_model(class_name)
+        while definition is not None:
+            module = self.modules[definition.app_label]
+            for statement in definition.node.body:
+                match statement:
+                    case ast.Assign(
+                        targets=[ast.Name(id=name)], value=ast.Call() as call
+                    ) if (
+                        name == to_field
+                        if to_field
+                        else _get_constant(call, "primary_key")
+                    ):
+                        column_name = self.get_column_name(definition, name)
+                        field_type = self.get_field_type(module, call.func)
+                        if field_type in RELATION_FIELDS:
+                            target_name, _ = self.resolve_target(
+                                module, definition, _get_option(call, "to", 0)
+                            )
+                            return (
+                                column_name,
+                                self.get_target_key(
+                                    target_name, _get_constant(call, "to_field")
+                                )[1],
+                            )
+                        return column_name, FIELD_TYPES.get(field_type, ("", "int"))[1]
+            # Fields inherited from a model base, abstract or not.
+            definition = next(
+                (
+                    module.models[base.id]
+                    for base in definition.node.bases
+                    if isinstance(base, ast.Name) and base.id in module.models
+                ),
+                None,
+            )
+        return "id", "int"
+
+    def translate(self, app_label: str) -> str:
+        module = self.modules[app_label]
+        self.sqlalchemy: Set[str] = set()
+        self.orm: Set[str] = {"Mapped", "mapped_column"}
+        self.annotations: Set[str] = set()
+
+        body: List[ast.stmt] = []
+        for node in module.tree.body:
+            match node:
+                case ast.Import() | ast.ImportFrom():
+                    if not any(
+                        qualified_name.startswith("django")
+                        for qualified_name in get_imported_names(
+                            ast.Module(body=[node], type_ignores=[])
+                        ).values()
+                    ):
+                        body.append(node)
+                case ast.ClassDef() if node.name in module.models:
+                    body += self.translate_model(module, module.models[node.name])
+                case ast.ClassDef():
+                    body.append(self.translate_choices(module, node))
+                case _:
+                    body.append(node)
+
+        imports = self.get_imports()
+        position = next(
+            (
+                index
+                for index, node in enumerate(body)
+                if not isinstance(node, (ast.Import, ast.ImportFrom))
+            ),
+            len(body),
+        )
+        tree = ast.Module(
+            body=body[:position] + imports + body[position:], type_ignores=[]
+        )
+        return unparse(ast.fix_missing_locations(tree))
+
+    def get_imports(self) -> List[ast.stmt]:
+        by_module: Dict[str, List[str]] = {}
+        for name in sorted(self.annotations):
+            by_module.setdefault(ANNOTATION_IMPORTS[name], []).append(name)
+        by_module["sqlalchemy"] = sorted(self.sqlalchemy)
+        by_module["sqlalchemy.orm"] = sorted(self.orm)
+        by_module["database"] = ["Base"]
+        return [
+            ast.ImportFrom(
+                module=module,
+                names=[ast.alias(name=name, asname=None) for name in names],
+                level=0,
+            )
+            for module, names in by_module.items()
+            if names
+        ]
+
+    def translate_choices(self, module: ModelsModule, node: ast.ClassDef):
+        """`models.TextChoices` and `models.IntegerChoices` become enums."""
+        bases = [self.get_field_type(module, base) for base in node.bases]
+        if not any(base in ("TextChoices", "IntegerChoices") for base in bases):
+            return node
+        self.annotations.add("Enum")
+        node.bases = [
+            ast.Name(id="str" if "TextChoices" in bases else "int"),
+            ast.Name(id="Enum"),
+        ]
+        for statement in node.body:
+            # Drops labels, only the value is stored.
+            if isinstance(statement, ast.Assign) and isinstance(
+                statement.value, ast.Tuple
+            ):
+                statement.value = statement.value.elts[0]
+        return node
+
+    def translate_model(
+        self, module: ModelsModule, model: ModelDefinition
+    ) -> List[ast.stmt]:
+        Logger.current_module = model.app_label + "/models"
+        before: List[ast.stmt] = []
+        body: List[ast.stmt] = []
+        if model.abstract:
+            body.append(
+                ast.Assign(
+                    targets=[ast.Name(id="__abstract__")], value=ast.Constant(True)
+                )
+            )
+        else:
+            body.append(
+                ast.Assign(
+                    targets=[ast.Name(id="__tablename__")],
+                    value=ast.Constant(model.table),
+                )
+            )
+        table_args = self.translate_meta(model)
+        if table_args:
+            body.append(
+                ast.Assign(
+                    targets=[ast.Name(id="__table_args__")],
+                    value=ast.Tuple(elts=table_args),
+                )
+            )
+
+        has_primary_key = False
+        for statement in model.node.body:
+            match statement:
+                case ast.Assign(
+                    targets=[ast.Name(id=name)], value=ast.Call() as call
+                ) if self.get_field_type(module, call.func):
+                    field_type = self.get_field_type(module, call.func)
+                    if _get_constant(call, "primary_key"):
+                        has_primary_key = True
+                    if field_type in RELATION_FIELDS:
+                        before_field, fields = self.translate_relation(
+                            module, model, name, field_type, call
+                        )
+                        before += before_field
+                        body += fields
+                    elif field_type in FIELD_TYPES:
+                        body.append(self.translate_field(name, field_type, call))
+                    elif field_type.endswith("Manager"):
+                        continue
+                    else:
+                        Logger.print_warn(
+                            f"Unsupported field {field_type} of {model.name}",
+                            sample_code=ast.unparse(statement) + "\n",
+                            line=statement.lineno,
+                        )
+                case ast.ClassDef(name="Meta"):
+                    continue
+                case ast.ClassDef():
+                    body.append(self.translate_choices(module, statement))
+                case ast.Assign(value=ast.Call(func=func)) if (
+                    ast.unparse(func).endswith("Manager")
+                ):
+                    # Managers are Django ORM API, queries go through a session.
+                    continue
+                case _:
+                    body.append(statement)
+
+        if not has_primary_key and not model.abstract:
+            self.orm.add("mapped_column")
+            body.insert(
+                1 + bool(table_args),
+                ast.AnnAssign(
+                    target=ast.Name(id="id"),
+                    annotation=self.annotate("int"),
+                    value=ast.Call(
+                        func=ast.Name(id="mapped_column"),
+                        args=[],
+                        keywords=[ast.keyword("primary_key", ast.Constant(True))],
+                    ),
+                    simple=1,
+                ),
+            )
+
+        bases = [
+            ast.Name(id=base.id)
+            if isinstance(base, ast.Name) and base.id in module.models
+            else ast.Name(id="Base")
+            for base in model.node.bases
+        ]
+        return before + [
+            ast.copy_location(
+                ast.ClassDef(
+                    name=model.name,
+                    bases=list({ast.unparse(base): base for base in bases}.values()),
+                    keywords=[],
+                    body=body,
+                    decorator_list=model.node.decorator_list,
+                ),
+                model.node,
+            )
+        ]
+
+    def translate_meta(self, model: ModelDefinition) -> List[ast.expr]:
+        table_args: List[ast.expr] = []
+        unique_together = _get_meta_option(model.meta, "unique_together")
+        if isinstance(unique_together, (ast.List, ast.Tuple)):
+            groups = (
+                unique_together.elts
+                if all(
+                    isinstance(group, (ast.List, ast.Tuple))
+                    for group in unique_together.elts
+                )
+                else [unique_together]
+            )
+            for group in groups:
+                self.sqlalchemy.add("UniqueConstraint")
+                table_args.append(
+                    ast.Call(
+                        func=ast.Name(id="UniqueConstraint"),
+                        args=[
+                            ast.Constant(self.get_column_name(model, element.value))
+                            for element in group.elts
+                            if isinstance(element, ast.Constant)
+                        ],
+                        keywords=[],
+                    )
+                )
+        for option in ("ordering", "indexes", "constraints"):
+            if _get_meta_option(model.meta, option) is not None:
+                Logger.print_warn(
+                    f"Meta.{option} of {model.name} is not translated",
+                    line=model.node.lineno,
+                )
+        return table_args
+
+    def get_column_name(self, model: ModelDefinition, name: str):
+        for statement in model.node.body:
+            match statement:
+                case ast.Assign(
+                    targets=[ast.Name(id=target)], value=ast.Call() as call
+                ) if (target == name):
+                    db_column = _get_constant(call, "db_column")
+                    if db_column:
+                        return db_column
+                    module = self.modules[model.app_label]
+                    if self.get_field_type(module, call.func) in RELATION_FIELDS:
+                        return name + "_id"
+        return name
+
+    def annotate(self, annotation: str, nullable: bool = False, quoted: bool = False):
+        if annotation in ANNOTATION_IMPORTS:
+            self.annotations.add(annotation)
+        node: ast.expr = ast.Constant(annotation) if quoted else ast.Name(id=annotation)
+        if nullable:
+            self.annotations.add("Optional")
+            node = ast.Subscript(value=ast.Name(id="Optional"), slice=node)
+        return ast.Subscript(value=ast.Name(id="Mapped"), slice=node)
+
+    def get_column_options(self, call: ast.Call) -> List[ast.keyword]:
+        keywords = []
+        for keyword in call.keywords:
+            match keyword.arg:
+                case "primary_key" | "unique" | "default":
+                    keywords.append(ast.keyword(keyword.arg, keyword.value))
+                case "db_index":
+                    keywords.append(ast.keyword("index", keyword.value))
+                case "db_comment":
+                    keywords.append(ast.keyword("comment", keyword.value))
+                case option if option in IGNORED_OPTIONS:
+                    continue
+                case option:
+                    Logger.print_warn(
+                        f"Field option {option} is not translated",
+                        sample_code=ast.unparse(call) + "\n",
+                        line=call.lineno,
+                    )
+        if _get_constant(call, "auto_now_add") or _get_constant(call, "auto_now"):
+            self.sqlalchemy.add("func")
+            keywords.append(
+                ast.keyword("default", ast.parse("func.now()").body[0].value)
+            )
+        if _get_constant(call, "auto_now"):
+            keywords.append(
+                ast.keyword("onupdate", ast.parse("func.now()").body[0].value)
+            )
+        keywords.append(
+            ast.keyword("nullable", ast.Constant(bool(_get_constant(call, "null"))))
+        )
+        return keywords
+
+    def translate_field(self, name: str, field_type: str, call: ast.Call):
+        column_type, annotation = FIELD_TYPES[field_type]
+        self.sqlalchemy.add(column_type)
+        type_args: List[ast.expr] = []
+        type_keywords: List[ast.keyword] = []
+        match field_type:
+            case _ if field_type in MAX_LENGTHS:
+                max_length = (
+                    _get_constant(call, "max_length") or MAX_LENGTHS[field_type]
+                )
+                if max_length:
+                    type_args.append(ast.Constant(max_length))
+            case "DecimalField":
+                type_args += [
+                    ast.Constant(_get_constant(call, "max_digits")),
+                    ast.Constant(_get_constant(call, "decimal_places")),
+                ]
+            case "DateTimeField":
+                type_keywords.append(ast.keyword("timezone", ast.Constant(True)))
+
+        args: List[ast.expr] = []
+        db_column = _get_constant(call, "db_column")
+        if db_column:
+            args.append(ast.Constant(db_column))
+        args.append(
+            ast.Call(
+                func=ast.Name(id=column_type), args=type_args, keywords=type_keywords
+            )
+        )
+        return ast.copy_location(
+            ast.AnnAssign(
+                target=ast.Name(id=name),
+                annotation=self.annotate(
+                    annotation, nullable=bool(_get_constant(call, "null"))
+                ),
+                value=ast.Call(
+                    func=ast.Name(id="mapped_column"),
+                    args=args,
+                    keywords=self.get_column_options(call),
+                ),
+                simple=1,
+            ),
+            call,
+        )
+
+    def translate_relation(
+        self,
+        module: ModelsModule,
+        model: ModelDefinition,
+        name: str,
+        field_type: str,
+        call: ast.Call,
+    ) -> Tuple[List[ast.stmt], List[ast.stmt]]:
+        target = _get_option(call, "to", 0)
+        class_name, table = self.resolve_target(module, model, target)
+        if not table:
+            Logger.print_warn(
+                f"Could not resolve the model {name} of {model.name} points at",
+                sample_code=ast.unparse(call) + "\n",
+                line=call.lineno,
+            )
+            return [], []
+        translated = self.get_model(class_name) is not None
+        if field_type == "ManyToManyField":
+            return self.translate_many_to_many(
+                model, name, call, class_name, table, translated
+            )
+
+        self.sqlalchemy.add("ForeignKey")
+        nullable = bool(_get_constant(call, "null"))
+        foreign_key_keywords = []
+        on_delete = _get_option(call, "on_delete", 1)
+        if isinstance(on_delete, (ast.Attribute, ast.Name)):
+            action = ON_DELETE.get(ast.unparse(on_delete).split(".")[-1])
+            if action:
+                foreign_key_keywords.append(
+                    ast.keyword("ondelete", ast.Constant(action))
+                )
+        column_name = _get_constant(call, "db_column") or name + "_id"
+        key_column, annotation = self.get_target_key(
+            class_name, _get_constant(call, "to_field")
+        )
+        keywords = self.get_column_options(call)
+        if field_type == "OneToOneField" and not _get_constant(call, "unique"):
+            keywords.insert(0, ast.keyword("unique", ast.Constant(True)))
+        fields: List[ast.stmt] = [
+            ast.AnnAssign(
+                target=ast.Name(id=name + "_id"),
+                annotation=self.annotate(annotation, nullable=nullable),
+                value=ast.Call(
+                    func=ast.Name(id="mapped_column"),
+                    args=(
+                        [ast.Constant(column_name)]
+                        if column_name != name + "_id"
+                        else []
+                    )
+                    + [
+                        ast.Call(
+                            func=ast.Name(id="ForeignKey"),
+                            args=[ast.Constant(table + "." + key_column)],
+                            keywords=foreign_key_keywords,
+                        )
+                    ],
+                    keywords=keywords,
+                ),
+                simple=1,
+            )
+        ]
+        if not translated:
+            Logger.print_warn(
+                f"{class_name} is not translated, {model.name}.{name} is only"
+                f" a foreign key to {table}",
+                line=call.lineno,
+            )
+        else:
+            self.orm.add("relationship")
+            fields.append(
+                ast.AnnAssign(
+                    target=ast.Name(id=name),
+                    annotation=self.annotate(
+                        class_name, nullable=nullable, quoted=True
+                    ),
+                    value=ast.Call(
+                        func=ast.Name(id="relationship"),
+                        args=[],
+                        keywords=[
+                            ast.keyword(
+                                "foreign_keys",
+                                ast.Constant(f"{model.name}.{name}_id"),
+                            )
+                        ],
+                    ),
+                    simple=1,
+                )
+            )
+        return [], [ast.copy_location(field, call) for field in fields]
+
+    def translate_many_to_many(
+        self,
+        model: ModelDefinition,
+        name: str,
+        call: ast.Call,
+        class_name: str,
+        table: str,
+        translated: bool,
+    ) -> Tuple[List[ast.stmt], List[ast.stmt]]:
+        through = _get_option(call, "through")
+        before: List[ast.stmt] = []
+        if through is not None:
+            _, secondary = self.resolve_target(
+                self.modules[model.app_label], model, through
+            )
+            secondary_node: ast.expr = ast.Constant(secondary)
+        else:
+            secondary = _get_constant(call, "db_table") or model.table + "_" + name
+            source_column, target_column = (
+                (
+                    "from_" + model.name.lower() + "_id",
+                    "to_" + class_name.lower() + "_id",
+                )
+                if class_name == model.name
+                else (model.name.lower() + "_id", class_name.lower() + "_id")
+            )
+            self.sqlalchemy.update(("Column", "ForeignKey", "Integer", "Table"))
+            source_key = model.table + "." + self.get_target_key(model.name)[0]
+            target_key = table + "." + self.get_target_key(class_name)[0]
+            variable = model.name.lower() + "_" + name
+            before.append(
+                ast.parse(
+                    f"{variable} = Table(\n"
+                    f"    {secondary!r},\n"
+                    "    Base.metadata,\n"
+                    '    Column("id", Integer, primary_key=True),\n'
+                    f"    Column({source_column!r}, ForeignKey({source_key!r}), nullable=False),\n"
+                    f"    Column({target_column!r}, ForeignKey({target_key!r}), nullable=False),\n"
+                    ")\n"
+                ).body[0]
+            )
+            secondary_node = ast.Name(id=variable)
+        if not translated:
+            Logger.print_warn(
+                f"{class_name} is not translated, {model.name}.{name} is only a table",
+                line=call.lineno,
+            )
+            return before, []
+        self.orm.add("relationship")
+        self.annotations.add("List")
+        return before, [
+            ast.copy_location(
+                ast.AnnAssign(
+                    target=ast.Name(id=name),
+                    annotation=ast.Subscript(
+                        value=ast.Name(id="Mapped"),
+                        slice=ast.Subscript(
+                            value=ast.Name(id="List"), slice=ast.Constant(class_name)
+                        ),
+                    ),
+                    value=ast.Call(
+                        func=ast.Name(id="relationship"),
+                        args=[],
+                        keywords=[ast.keyword("secondary", secondary_node)],
+                    ),
+                    simple=1,
+                ),
+                call,
+            )
+        ]
+
+
+def translate_models(sources: Dict[str, str]) -> Dict[str, str]:
+    """SQLAlchemy models of each app, from the source of its `models.py`."""
+    translator = ModelsTranslator()
+    for app_label, source_code in sources.items():
+        translator.add(app_label, source_code)
+    return {app_label: translator.translate(app_label) for app_label in sources}
+
+
+def generate_database_module(models_modules: Sequence[str]):
+    imports = ", ".join(repr(module.replace("/", ".")) for module in models_modules)
+    return format_string(
+        f"""from os import getenv
+from typing import Annotated, AsyncIterator
+import importlib
+
+from fastapi import Depends
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, configure_mappers
+from sqlalchemy.pool import NullPool
+
+from conf import settings
+
+DRIVERS = {{
+    "django.db.backends.postgresql": "postgresql+asyncpg",
+    "django.db.backends.postgresql_psycopg2": "postgresql+asyncpg",
+    "django.db.backends.mysql": "mysql+aiomysql",
+    "django.db.backends.sqlite3": "sqlite+aiosqlite",
+}}
+MODELS_MODULES = [{imports}]
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+engine: AsyncEngine = None
+sessions: async_sessionmaker = None
+
+
+def get_url(database):
+    return URL.create(
+        DRIVERS[database["ENGINE"]],
+        username=database.get("USER") or None,
+        password=database.get("PASSWORD") or None,
+        host=database.get("HOST") or None,
+        port=int(database["PORT"]) if database.get("PORT") else None,
+        database=str(database["NAME"]),
+    )
+
+
+def get_pool_options(database):
+    if database["ENGINE"].endswith("sqlite3") and str(database["NAME"]) == ":memory:":
+        return {{}}
+    conn_max_age = database.get("CONN_MAX_AGE")
+    # Django's CONN_MAX_AGE=0 closes connections after each request.
+    if conn_max_age == 0 and not getenv("DATABASE_POOL_RECYCLE"):
+        return {{"poolclass": NullPool}}
+    return {{
+        "pool_size": int(getenv("DATABASE_POOL_SIZE", {Config.pool_size})),
+        "max_overflow": int(getenv("DATABASE_MAX_OVERFLOW", {Config.max_overflow})),
+        "pool_timeout": float(getenv("DATABASE_POOL_TIMEOUT", 30)),
+        # Django's CONN_MAX_AGE, connections are kept when it's None.
+        "pool_recycle": int(
+            getenv("DATABASE_POOL_RECYCLE", -1 if conn_max_age is None else conn_max_age)
+        ),
+        "pool_pre_ping": database.get("CONN_HEALTH_CHECKS", False),
+    }}
+
+
+def load_models():
+    for module in MODELS_MODULES:
+        importlib.import_module(module)
+    configure_mappers()
+
+
+async def connect():
+    \"\"\"Opens the pool of the process, from the app lifespan so each worker
+    gets its own.\"\"\"
+    global engine, sessions
+    load_models()
+    database = settings.DATABASES["default"]
+    engine = create_async_engine(get_url(database), **get_pool_options(database))
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def disconnect():
+    await engine.dispose()
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    async with sessions() as session:
+        yield session
+
+
+Session = Annotated[AsyncSession, Depends(get_session)]
+"""
+    )
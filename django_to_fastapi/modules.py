@@ -1,20 +1,33 @@
 import ast
 from enum import Enum
-from typing import List, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 from django_to_fastapi.ast_operations import (
     ASTOperation,
     ASTOperationAction,
     ASTOperations,
     Runner,
 )
-
-from django_to_fastapi.routes import Route
+from django_to_fastapi.blocking import handle_blocking_calls
+from django_to_fastapi.caching import (
+    CACHE_NAMES,
+    convert_cache_calls,
+    get_cache_names,
+)
+from django_to_fastapi.coloring import color_functions
+from django_to_fastapi.config import Config
+from django_to_fastapi.dependencies import get_providers
+from django_to_fastapi.middleware import get_middleware_setup
+from django_to_fastapi.orm import convert_to_async_orm
+from django_to_fastapi.pagination import translate_pagination
+from django_to_fastapi.profiling import Profiler
+from django_to_fastapi.routes import Route, RouteTable
 from django_to_fastapi.utils import class_name_to_function, format_string
 from django_to_fastapi.views import (
     RouteConfiguration,
     class_to_class,
     class_to_functions,
     function_to_function,
+    get_function_route_method,
     has_state,
     is_crud_class,
 )
@@ -22,26 +35,86 @@ from django_to_fastapi.views import (
 DJANGO_PACKAGES = ("rest_framework", "django")
 
 
-def _migrate(module: ast.Module, routes: Sequence[Route]):
-    migrator = Migrator(routes)
+def _migrate(
+    module: ast.Module, routes: Sequence[Route], module_path: Optional[str] = None
+):
+    with Profiler.stage("pagination"):
+        pagination_imports = translate_pagination(
+            module, Config.default_pagination_class
+        )
+    for pagination_import in pagination_imports:
+        _add_import(module, pagination_import)
+    migrator = Migrator(routes, module_path)
     migrator.visit(module)
     Runner.execute(module, migrator.operations)
+    if Config.async_orm:
+        with Profiler.stage("async orm"):
+            shortcuts = convert_to_async_orm(module)
+        if shortcuts:
+            _add_import(
+                module,
+                ast.ImportFrom(
+                    module="django.shortcuts",
+                    level=0,
+                    names=[ast.alias(name=name, asname=None) for name in shortcuts],
+                ),
+            )
+    with Profiler.stage("async cache"):
+        convert_cache_calls(module)
+    with Profiler.stage("async coloring"):
+        color_functions(module)
+    with Profiler.stage("blocking calls"):
+        if handle_blocking_calls(module):
+            _add_import(module, _resolve_import(FastAPIUtilsImports.Concurrency))
     return module
 
 
+def _add_import(module: ast.Module, node: ast.stmt):
+    position = next(
+        (
+            index + 1
+            for index, node in reversed(list(enumerate(module.body)))
+            if isinstance(node, (ast.ImportFrom, ast.Import))
+        ),
+        0,
+    )
+    module.body.insert(position, ast.fix_missing_locations(node))
+
+
 def _clear_imports(module: ast.Module):
     remover = RemoveImports()
     return remover.visit(module)
 
 
-def process_code(source_code: str, routes: Sequence[Route]):
-    source_tree = ast.parse(source_code)
-    migrated = _migrate(source_tree, routes)
-    return _clear_imports(migrated)
+def process_code(
+    source_code: str, routes: Sequence[Route], module_path: Optional[str] = None
+):
+    with Profiler.stage("parse"):
+        source_tree = ast.parse(source_code)
+    with Profiler.stage("migrate"):
+        migrated = _migrate(source_tree, routes, module_path)
+    with Profiler.stage("import clearing"):
+        return _clear_imports(migrated)
+
+
+# Names kept from Django imports, the migrated code still uses them.
+KEPT_DJANGO_NAMES = {
+    "django.shortcuts": {"aget_object_or_404", "aget_list_or_404"},
+    # Handlers in transactions stay synchronous Django code.
+    "django.db": {"transaction"},
+}
 
 
 class RemoveImports(ast.NodeTransformer):
     def visit_ImportFrom(self, node):
+        kept_names = [
+            alias
+            for alias in node.names
+            if alias.name in KEPT_DJANGO_NAMES.get(node.module, ())
+        ]
+        if kept_names:
+            node.names = kept_names
+            return node
         if node.module == "django.conf":
             return ast.copy_location(
                 ast.ImportFrom(
@@ -51,6 +124,12 @@ class RemoveImports(ast.NodeTransformer):
                 ),
                 node,
             )
+        if node.module in ("django.core.cache", "django.core.cache.backends.base"):
+            cache_names = [alias for alias in node.names if alias.name in CACHE_NAMES]
+            if cache_names:
+                return ast.copy_location(
+                    ast.ImportFrom(module="cache", level=0, names=cache_names), node
+                )
         return None if self._is_django_import(node.module) else node
 
     def visit_Import(self, node):
@@ -70,11 +149,14 @@ class FastAPIUtilsImports(Enum):
     Types = 3
     CommonImports = 4
     Responses = 5
+    Concurrency = 6
+    Pydantic = 7
+    Caching = 8
 
     Auth = 10
 
 
-def _resolve_import(import_kind: FastAPIUtilsImports):
+def _resolve_import(import_kind: FastAPIUtilsImports, names: Sequence[str] = ()):
     return {
         FastAPIUtilsImports.ClassBasedView: ast.ImportFrom(
             level=0,
@@ -112,18 +194,48 @@ def _resolve_import(import_kind: FastAPIUtilsImports):
         ),
         FastAPIUtilsImports.Responses: ast.ImportFrom(
             level=0,
-            module="fastapi.responses",
+            module=Config.get_response_class()[0],
             names=[
-                ast.alias(name="JSONResponse", asname=None),
+                ast.alias(name=Config.get_response_class()[1], asname=None),
             ],
         ),
-
-    }[import_kind]
+        FastAPIUtilsImports.Concurrency: ast.ImportFrom(
+            level=0,
+            module="fastapi.concurrency",
+            names=[ast.alias(name="run_in_threadpool", asname=None)],
+        ),
+        FastAPIUtilsImports.Pydantic: ast.ImportFrom(
+            level=0,
+            module="pydantic",
+            names=[
+                ast.alias(name="BaseModel", asname=None),
+                ast.alias(name="ConfigDict", asname=None),
+                ast.alias(name="Field", asname=None),
+            ],
+        ),
+        FastAPIUtilsImports.Caching: ast.ImportFrom(
+            level=0,
+            module="caching",
+            names=[ast.alias(name=name, asname=None) for name in names],
+        )
+        if names
+        else None,
+        FastAPIUtilsImports.Auth: ast.ImportFrom(
+            level=0,
+            module="dependencies",
+            names=[ast.alias(name=name, asname=None) for name in names],
+        )
+        if names
+        else None,
+    }.get(import_kind)
 
 
 class Migrator(ast.NodeVisitor):
-    def __init__(self, routes: Sequence[Route]):
-        self.routes = routes
+    def __init__(self, routes: Sequence[Route], module: Optional[str] = None):
+        self.routes = routes if isinstance(routes, RouteTable) else RouteTable(routes)
+        # Path of the migrated module, as in "app/views", to pick its own
+        # routes among same-named views of other modules.
+        self.module = module
         self.operations: ASTOperations = []
 
     def visit_Module(self, node):
@@ -149,11 +261,8 @@ class Migrator(ast.NodeVisitor):
 
         for item in node.body:
 
-            try:
-                matching_route = next(
-                    route for route in self.routes if route.view == item.name
-                )
-            except:
+            matching_route = self.routes.get(getattr(item, "name", None), self.module)
+            if matching_route is None:
                 continue
 
             match item:
@@ -269,7 +378,33 @@ class Migrator(ast.NodeVisitor):
                         )
                     ]
 
-        for additional_import in additional_imports:
+        if (
+            Config.payloads == "pydantic"
+            and FastAPIUtilsImports.Types in additional_imports
+        ):
+            additional_imports.add(FastAPIUtilsImports.Pydantic)
+
+        candidates = [
+            operation.options["candidate"]
+            for operation in self.operations
+            if "candidate" in operation.options
+        ]
+        # Names imported from generated modules, as used by the migrated code.
+        names = {
+            FastAPIUtilsImports.Caching: get_cache_names(candidates),
+            FastAPIUtilsImports.Auth: get_providers(candidates),
+        }
+        if names[FastAPIUtilsImports.Caching]:
+            additional_imports.add(FastAPIUtilsImports.Caching)
+
+        # Sorted so the emitted imports do not depend on the hash seed; each one
+        # is inserted right after the last import, hence the reversed order.
+        for additional_import in sorted(
+            additional_imports, key=lambda kind: kind.value, reverse=True
+        ):
+            # Modules depending on no provider don't import `dependencies`.
+            if _resolve_import(additional_import, names.get(additional_import, ())) is None:
+                continue
             # items.insert(0, _resolve_import(additional_import))
             self.operations.append(
                 ASTOperation(
@@ -280,7 +415,9 @@ class Migrator(ast.NodeVisitor):
                             for importnode in reversed(node.body)
                             if isinstance(importnode, (ast.ImportFrom, ast.Import))
                         ),
-                        "candidate": _resolve_import(additional_import),
+                        "candidate": _resolve_import(
+                            additional_import, names.get(additional_import, ())
+                        ),
                     },
                 )
             )
@@ -310,52 +447,254 @@ class Migrator(ast.NodeVisitor):
 
     def _handle_function(self, node, matching_route):
         route_configuration = RouteConfiguration(
-            matching_route.path,
-            next(decorator for decorator in node.decorator_list)
-            .args[0]
-            .elts[0]
-            .value.lower(),
+            matching_route.path, get_function_route_method(node)
         )
 
         return function_to_function(node, route_configuration)
 
 
-def generate_bootstrap_module():
+def generate_bootstrap_module(
+    middleware: Sequence[str] = (), uses_cache: bool = False
+):
+    standard_imports = [
+        "from contextlib import asynccontextmanager",
+        "from os import getenv",
+    ]
+    imports = ["from fastapi import FastAPI", "import dependencies"]
+    options = []
+    # Sub-applications of the lazy entrypoint are missing from the schema of
+    # `app`, it's compared by `python openapi.py` only.
+    live_openapi = ', live=CONTEXT == "dev"' if Config.entrypoint == "eager" else ""
+    if Config.responses != "json":
+        module, response_class = Config.get_response_class()
+        imports.append(f"from {module} import {response_class}")
+        options.append(f"default_response_class={response_class}")
+    startup = ["await dependencies.startup()"]
+    shutdown = ["await dependencies.shutdown()"]
+    # Only apps using `django.core.cache` get a database created.
+    if uses_cache:
+        imports.append("import cache")
+        startup.insert(0, "await cache.startup()")
+    preloaded = ""
+    if Config.models == "sqlalchemy":
+        imports.append("import database")
+        startup.append("await database.connect()")
+        shutdown.insert(0, "await database.disconnect()")
+        if Config.preload:
+            # Models are shared with the workers, each one opens its own pool.
+            preloaded = "\n\ndatabase.load_models()\n"
+    indent = "\n    "
+    lifespan = f"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    {indent.join(startup)}
+    yield
+    {indent.join(shutdown)}
+{preloaded}"""
+    imports.append("from openapi import install_openapi")
+    install = ""
+    if Config.static_routes:
+        imports.append("from static_routes import install_static_routes")
+        install = "\n    install_static_routes(app)"
+    options.append("lifespan=lifespan")
+    middleware_imports, middleware_calls = get_middleware_setup(middleware)
+    imports += middleware_imports
+    add_middleware = ""
+    if middleware_calls:
+        add_middleware = (
+            "\n    # settings.MIDDLEWARE, the first one outermost."
+            + indent
+            + indent.join(middleware_calls)
+        )
+    standard_imports = "\n".join(standard_imports)
+    imports = "\n".join(imports)
+    dev_options = ", ".join(options)
+    prod_options = ", ".join(['docs_url="/debug"', "redoc_url=None", *options])
     return format_string(
-        """from os import getenv
+        f"""{standard_imports}
 
-from fastapi import FastAPI
+{imports}
 
 CONTEXT = getenv("CONTEXT", "prod")
 
+{lifespan}
 
 def create_app():
     if CONTEXT == "dev":
-        return FastAPI()
+        app = FastAPI({dev_options})
     else:
-        return FastAPI(docs_url="/debug", redoc_url=None)
+        app = FastAPI({prod_options}){install}{add_middleware}
+    return app
 
 
 app = create_app()
+install_openapi(app{live_openapi})
+"""
+    )
+
+
+def generate_static_routes_module():
+    return format_string(
+        '''"""Resolves requests to static paths with a dict lookup rather than
+Starlette's scan of every route regex, which grows with the route count."""
+from typing import Any, Dict, Tuple
+
+from fastapi import FastAPI
+from starlette.routing import Match, Router
+
+
+def get_static_routes(router: Router) -> Dict[Tuple[str, str], Tuple[Any, Dict]]:
+    """Route and child scope per method and path of routes without
+    parameters, unless an earlier route matches the same requests: it wins
+    the scan, so it has to be found by it."""
+    index = {}
+    for position, route in enumerate(router.routes):
+        if getattr(route, "param_convertors", None) != {}:
+            continue
+        for method in getattr(route, "methods", None) or ():
+            scope = {
+                "type": "http",
+                "path": route.path,
+                "root_path": "",
+                "method": method,
+                "headers": [],
+            }
+            if (method, route.path) in index or any(
+                _may_match(earlier, scope) for earlier in router.routes[:position]
+            ):
+                continue
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                index[method, route.path] = route, child_scope
+    return index
+
+
+def _may_match(route: Any, scope: Dict) -> bool:
+    try:
+        return route.matches(scope)[0] != Match.NONE
+    except Exception:
+        return True
+
+
+class StaticRoutes:
+    """Router stack serving indexed paths itself, anything else, redirects
+    and method mismatches included, through the usual scan."""
+
+    def __init__(self, router: Router, app):
+        self.router = router
+        self.app = app
+        self.index: Dict[Tuple[str, str], Tuple[Any, Dict]] = {}
+        self.routes = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not scope.get("root_path"):
+            # Routers are included after the app is created.
+            if len(self.router.routes) != self.routes:
+                self.index = get_static_routes(self.router)
+                self.routes = len(self.router.routes)
+            entry = self.index.get((scope["method"], scope["path"]))
+            if entry is not None:
+                route, child_scope = entry
+                scope.setdefault("router", self.router)
+                scope.update(child_scope)
+                scope["path_params"] = {}
+                await route.handle(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+def install_static_routes(app: FastAPI):
+    app.router.middleware_stack = StaticRoutes(
+        app.router, app.router.middleware_stack
+    )
+'''
+    )
+
+
+def generate_fast_json_module():
+    return format_string(
+        """import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    \"\"\"Renders with orjson like `ORJSONResponse` when it's installed, with
+    compact stdlib JSON otherwise.\"\"\"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(
+                content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
 """
     )
 
 def normalize(module):
     return "routers_" + "_".join(module.split("/")[-2:])
 
-def generate_entrypoint(modules: Sequence[str]):
+def get_lazy_groups(
+    modules: Sequence[str], routes: Sequence[Route]
+) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Modules to include at startup, those with paths not starting with a
+    static segment, and the modules serving each static first segment."""
+    table = routes if isinstance(routes, RouteTable) else RouteTable(routes)
+    eager: List[str] = []
+    prefixes: Dict[str, List[str]] = {}
+    # Views are migrated under their first route only.
+    for route in table.by_view.values():
+        if route.module not in modules:
+            continue
+        segment = route.path.strip("/").split("/")[0]
+        if not segment or "{" in segment:
+            if route.module not in eager:
+                eager.append(route.module)
+        elif route.module not in prefixes.setdefault("/" + segment, []):
+            prefixes["/" + segment].append(route.module)
+    return eager, prefixes
+
+
+def generate_entrypoint(modules: Sequence[str], routes: Sequence[Route] = ()):
+    if Config.entrypoint == "lazy":
+        return generate_lazy_entrypoint(modules, routes)
     imports = "\n".join([f"""from {module.replace("/", ".")} import routers as {normalize(module)}""" for module in modules])
     list_comprehension = ",\n".join([normalize(module) for module in modules])
     all_routers = f"""all_routers = itertools.chain.from_iterable([{list_comprehension}])"""
+    freeze = (
+        """
+# Imported once by the gunicorn master with preload_app: what was allocated
+# so far is left out of collections, which would otherwise write to the pages
+# workers share with it.
+gc.freeze()
+"""
+        if Config.preload
+        else ""
+    )
     return format_string(
-        f"""import os
+        f"""{"import gc" if Config.preload else ""}
+import os
 import itertools
 import glob
 import importlib.util
 
 import uvicorn
 
+import server
 from bootstrap import app, CONTEXT
+from caching import install_cache
 
 {imports}
 
@@ -375,10 +714,235 @@ from bootstrap import app, CONTEXT
 
 for router in all_routers:
     app.include_router(router)
+install_cache(app)
+{freeze}
+if __name__ == "__main__":
+    uvicorn.run("main:app", **server.get_options(reload=CONTEXT == "dev"))
+"""
+    )
+
+
+def generate_lazy_entrypoint(modules: Sequence[str], routes: Sequence[Route]):
+    eager, prefixes = get_lazy_groups(modules, routes)
+    imports = "\n".join(
+        f"from {module.replace('/', '.')} import routers as {normalize(module)}"
+        for module in eager
+    )
+    include = (
+        f"""
+for router in itertools.chain.from_iterable([{", ".join(normalize(module) for module in eager)}]):
+    base_app.include_router(router)
+install_cache(base_app)
+"""
+        if eager
+        else ""
+    )
+    # Paths starting with a parameter can match any first segment, so their
+    # modules are included in every sub-application, after the group's own.
+    groups = {
+        prefix: tuple([*group, *(module for module in eager if module not in group)])
+        for prefix, group in prefixes.items()
+    }
+    # Prefixes served by the same modules share their sub-application.
+    sub_apps: Dict[Tuple[str, ...], str] = {}
+    for group in groups.values():
+        sub_apps.setdefault(group, f"sub_app_{len(sub_apps)}")
+    definitions = "\n".join(
+        f"{name} = LazyApp({[module.replace('/', '.') for module in group]!r})"
+        for group, name in sub_apps.items()
+    )
+    mounts = ", ".join(
+        f"{prefix!r}: {sub_apps[group]}" for prefix, group in groups.items()
+    )
+    freeze = (
+        """
+# Imported once by the gunicorn master with preload_app: what was allocated
+# so far is left out of collections, which would otherwise write to the pages
+# workers share with it.
+gc.freeze()
+"""
+        if Config.preload
+        else ""
+    )
+    return format_string(
+        f"""{"import gc" if Config.preload else ""}
+{"import itertools" if eager else ""}
+from os import getenv
+
+import uvicorn
+
+import server
+from bootstrap import app as base_app, CONTEXT
+{"from caching import install_cache" if eager else ""}
+from lazy import LazyApp, PrefixDispatcher
 
+{imports}
+{include}
+# Modules serving each first segment of paths, imported on first request,
+# then those of paths starting with a parameter.
+{definitions}
+
+app = PrefixDispatcher(base_app, {{{mounts}}})
+
+# Imports every module at startup, with preload_app in the gunicorn master.
+if getenv("WARMUP"):
+    app.warmup()
+{freeze}
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app", host="127.0.0.1", port=4000, log_level="error", reload=CONTEXT == "dev"
+    uvicorn.run("main:app", **server.get_options(reload=CONTEXT == "dev"))
+"""
+    )
+
+
+def generate_lazy_module():
+    return format_string(
+        '''"""Sub-applications imported on their first request, so the app starts
+without importing every migrated module."""
+import importlib
+from typing import Dict, Optional, Sequence
+
+from fastapi import FastAPI
+
+from bootstrap import create_app
+from caching import install_cache
+
+
+class LazyApp:
+    """Includes the routers of `modules` in an app of its own on first call."""
+
+    def __init__(self, modules: Sequence[str]):
+        self.modules = modules
+        self.app: Optional[FastAPI] = None
+
+    def load(self) -> FastAPI:
+        if self.app is None:
+            app = create_app()
+            for module in self.modules:
+                for router in importlib.import_module(module).routers:
+                    app.include_router(router)
+            install_cache(app)
+            self.app = app
+        return self.app
+
+    async def __call__(self, scope, receive, send):
+        await self.load()(scope, receive, send)
+
+
+class PrefixDispatcher:
+    """Hands requests to the sub-application of the first segment of their
+    path, everything else, lifespan included, to `app`.
+
+    Routers keep their full paths, sub-applications see the same paths
+    `app` would.
+    """
+
+    def __init__(self, app: FastAPI, prefixes: Dict[str, LazyApp]):
+        self.app = app
+        self.prefixes = prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            sub_app = self.prefixes.get("/" + scope["path"].split("/", 2)[1])
+            if sub_app is not None:
+                await sub_app(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+    def warmup(self):
+        for sub_app in self.prefixes.values():
+            sub_app.load()
+'''
     )
+
+
+def generate_server_module():
+    return format_string(
+        '''"""Options of the server, from the environment.
+
+`python main.py` runs uvicorn with them, `gunicorn -c gunicorn.conf.py` runs
+gunicorn with uvicorn workers.
 """
+from os import cpu_count, getenv
+from typing import Any, Dict
+
+HOST = getenv("HOST", "127.0.0.1")
+PORT = int(getenv("PORT", "4000"))
+# One worker per core by default.
+WORKERS = int(getenv("WEB_CONCURRENCY", str(cpu_count() or 1)))
+# auto picks uvloop and httptools when they're installed.
+LOOP = getenv("LOOP", "auto")
+HTTP = getenv("HTTP", "auto")
+BACKLOG = int(getenv("BACKLOG", "2048"))
+KEEP_ALIVE = int(getenv("KEEP_ALIVE", "5"))
+LIMIT_CONCURRENCY = (
+    int(getenv("LIMIT_CONCURRENCY")) if getenv("LIMIT_CONCURRENCY") else None
+)
+LOG_LEVEL = getenv("LOG_LEVEL", "error")
+
+
+def get_options(reload: bool = False) -> Dict[str, Any]:
+    """Options of `uvicorn.run`, a single reloading process with `reload`."""
+    return dict(
+        host=HOST,
+        port=PORT,
+        workers=None if reload else WORKERS,
+        reload=reload,
+        loop=LOOP,
+        http=HTTP,
+        backlog=BACKLOG,
+        timeout_keep_alive=KEEP_ALIVE,
+        limit_concurrency=LIMIT_CONCURRENCY,
+        log_level=LOG_LEVEL,
+    )
+
+
+try:
+    from uvicorn.workers import UvicornWorker as BaseUvicornWorker
+except ImportError:
+    # gunicorn isn't installed.
+    UvicornWorker = None
+else:
+
+    class UvicornWorker(BaseUvicornWorker):
+        """Backlog and keep-alive come from gunicorn's settings."""
+
+        CONFIG_KWARGS = {
+            **BaseUvicornWorker.CONFIG_KWARGS,
+            "loop": LOOP,
+            "http": HTTP,
+            "limit_concurrency": LIMIT_CONCURRENCY,
+        }
+'''
+    )
+
+
+def generate_gunicorn_config():
+    preload = (
+        """
+# The app is imported in the master and shared with forked workers. The
+# collector stays off until `main` freezes what it allocated, then runs again
+# in each worker.
+preload_app = True
+gc.disable()
+
+
+def post_fork(server, worker):
+    gc.enable()
+"""
+        if Config.preload
+        else ""
+    )
+    return format_string(
+        f"""{"import gc" if Config.preload else ""}
+
+from server import BACKLOG, HOST, KEEP_ALIVE, LOG_LEVEL, PORT, WORKERS
+
+wsgi_app = "main:app"
+worker_class = "server.UvicornWorker"
+bind = f"{{HOST}}:{{PORT}}"
+workers = WORKERS
+backlog = BACKLOG
+keepalive = KEEP_ALIVE
+loglevel = LOG_LEVEL
+{preload}"""
     )
@@ -0,0 +1,423 @@
+import ast
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from django_to_fastapi.utils import Logger, format_string
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete", "head", "options")
+SCALARS = {
+    "str": {"type": "string"},
+    "int": {"type": "integer"},
+    "float": {"type": "number"},
+    "bool": {"type": "boolean"},
+    "list": {"type": "array", "items": {}},
+    "dict": {"type": "object"},
+    "None": {"type": "null"},
+    "Any": {},
+}
+# Parameters FastAPI injects rather than reads from the request.
+SPECIAL_PARAMETERS = (
+    "Request",
+    "WebSocket",
+    "HTTPConnection",
+    "Response",
+    "BackgroundTasks",
+    "SecurityScopes",
+)
+# As FastAPI declares them.
+VALIDATION_SCHEMAS = {
+    "HTTPValidationError": {
+        "properties": {
+            "detail": {
+                "items": {"$ref": "#/components/schemas/ValidationError"},
+                "type": "array",
+                "title": "Detail",
+            }
+        },
+        "type": "object",
+        "title": "HTTPValidationError",
+    },
+    "ValidationError": {
+        "properties": {
+            "loc": {
+                "items": {"anyOf": [{"type": "string"}, {"type": "integer"}]},
+                "type": "array",
+                "title": "Location",
+            },
+            "msg": {"type": "string", "title": "Message"},
+            "type": {"type": "string", "title": "Error Type"},
+        },
+        "type": "object",
+        "required": ["loc", "msg", "type"],
+        "title": "ValidationError",
+    },
+}
+
+
+def get_title(name: str):
+    return name.replace("_", " ").title()
+
+
+def get_operation_id(name: str, path: str, method: str):
+    """As FastAPI's `generate_unique_id`."""
+    return re.sub(r"\W", "_", name + path) + "_" + method
+
+
+class OpenAPICollector(ast.NodeVisitor):
+    """Operations and payload schemas of a migrated module, read from its
+    routers, route decorators, handler arguments and payload definitions."""
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self.prefixes: Dict[str, str] = {}
+        # Payload definitions are declared before the handlers using them.
+        self.aliases: Dict[str, ast.expr] = {}
+
+    @property
+    def components(self) -> Dict[str, Any]:
+        return self.schema["components"]["schemas"]
+
+    def collect(self, source_code: str):
+        for node in ast.parse(source_code).body:
+            self.visit(node)
+
+    def visit_Assign(self, node):
+        match node:
+            case ast.Assign(
+                targets=[ast.Name(id=name)],
+                value=ast.Call(func=ast.Name(id="InferringRouter" | "APIRouter")),
+            ):
+                prefix = next(
+                    (
+                        keyword.value.value
+                        for keyword in node.value.keywords
+                        if keyword.arg == "prefix"
+                        and isinstance(keyword.value, ast.Constant)
+                    ),
+                    "",
+                )
+                self.prefixes[name] = prefix
+            case ast.Assign(
+                targets=[ast.Name(id=name)],
+                value=ast.Call(func=ast.Name(id="TypedDict"), args=[_, ast.Dict()]),
+            ):
+                self.components[name] = self.get_typed_dict_schema(
+                    name, node.value.args[1]
+                )
+            case ast.Assign(targets=[ast.Name(id=name)]) if name.startswith("Payload"):
+                self.aliases[name] = node.value
+
+    def visit_ClassDef(self, node):
+        if any(
+            isinstance(base, ast.Name) and base.id == "BaseModel" for base in node.bases
+        ):
+            self.components[node.name] = self.get_model_schema(node)
+            return
+        # Handlers of class based views.
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.visit(item)
+
+    def visit_FunctionDef(self, node):
+        for decorator in node.decorator_list:
+            match decorator:
+                case ast.Call(
+                    func=ast.Attribute(value=ast.Name(id=router), attr=method),
+                    args=[ast.Constant(value=str(path)), *_],
+                ) if router in self.prefixes and method in HTTP_METHODS:
+                    self.add_operation(
+                        node, decorator, self.prefixes[router] + path, method
+                    )
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def get_type_schema(self, node: Optional[ast.expr]) -> Dict[str, Any]:
+        match node:
+            case ast.Name(id=name) | ast.Constant(value=str(name)):
+                if name in self.components:
+                    return {"$ref": f"#/components/schemas/{name}"}
+                if name in self.aliases:
+                    return self.get_type_schema(self.aliases[name])
+                return dict(SCALARS.get(name, {}))
+            case ast.Constant(value=None):
+                return {"type": "null"}
+            case ast.Subscript(value=ast.Name(id="Optional"), slice=inner):
+                return {"anyOf": [self.get_type_schema(inner), {"type": "null"}]}
+            case ast.Subscript(value=ast.Name(id="Union"), slice=ast.Tuple(elts=elts)):
+                return {"anyOf": [self.get_type_schema(elt) for elt in elts]}
+            case ast.Subscript(value=ast.Name(id="List" | "list"), slice=inner):
+                return {"type": "array", "items": self.get_type_schema(inner)}
+            case ast.Call(
+                func=ast.Name(id="TypedDict"), args=[_, ast.Dict() as fields]
+            ):
+                return self.get_typed_dict_schema(None, fields)
+        return {}
+
+    def get_typed_dict_schema(self, name: Optional[str], fields: ast.Dict):
+        properties = {}
+        for key, value in zip(fields.keys, fields.values):
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                properties[key.value] = {
+                    **self.get_type_schema(value),
+                    "title": get_title(key.value),
+                }
+        schema = {"properties": properties, "type": "object"}
+        # TypedDicts are total, even with Optional values.
+        if properties:
+            schema["required"] = list(properties)
+        if name:
+            schema["title"] = name
+        return schema
+
+    def get_model_schema(self, node: ast.ClassDef):
+        properties = {}
+        required = []
+        for item in node.body:
+            if not (
+                isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name)
+            ):
+                continue
+            key = item.target.id
+            default = item.value
+            if (
+                isinstance(default, ast.Call)
+                and getattr(default.func, "id", None) == "Field"
+            ):
+                key = next(
+                    (
+                        keyword.value.value
+                        for keyword in default.keywords
+                        if keyword.arg == "alias"
+                    ),
+                    key,
+                )
+                default = default.args[0] if default.args else None
+            properties[key] = {
+                **self.get_type_schema(item.annotation),
+                "title": get_title(item.target.id),
+            }
+            if default is None:
+                required.append(key)
+            elif isinstance(default, ast.Constant):
+                properties[key]["default"] = default.value
+        schema = {"properties": properties, "type": "object"}
+        if required:
+            schema["required"] = required
+        schema["title"] = node.name
+        return schema
+
+    def add_operation(
+        self, node: ast.FunctionDef, decorator: ast.Call, path: str, method: str
+    ):
+        arguments = [arg for arg in node.args.args if arg.arg != "self"]
+        defaults: List[Optional[ast.expr]] = [None] * (
+            len(node.args.args) - len(node.args.defaults)
+        ) + list(node.args.defaults)
+        defaults = defaults[len(node.args.args) - len(arguments) :]
+        path_parameters = set(re.findall(r"{(\w+)(?::\w+)?}", path))
+
+        operation: Dict[str, Any] = {
+            "summary": get_title(node.name),
+            "operationId": get_operation_id(node.name, path, method),
+        }
+        parameters = []
+        for argument, default in zip(arguments, defaults):
+            match default:
+                case ast.Call(func=ast.Name(id="Depends")):
+                    continue
+            match argument.annotation:
+                case ast.Name(id=name) | ast.Attribute(attr=name) if (
+                    name in SPECIAL_PARAMETERS
+                ):
+                    continue
+            if (
+                isinstance(argument.annotation, ast.Name)
+                and argument.annotation.id in self.components
+            ):
+                operation["requestBody"] = {
+                    "content": {
+                        "application/json": {
+                            "schema": self.get_type_schema(argument.annotation)
+                        }
+                    },
+                    "required": True,
+                }
+                continue
+            schema = {
+                **self.get_type_schema(argument.annotation),
+                "title": get_title(argument.arg),
+            }
+            if isinstance(default, ast.Constant) and default.value is not None:
+                schema["default"] = default.value
+            parameters.append(
+                {
+                    "name": argument.arg,
+                    "in": "path" if argument.arg in path_parameters else "query",
+                    "required": argument.arg in path_parameters or default is None,
+                    "schema": schema,
+                }
+            )
+        if parameters:
+            operation["parameters"] = parameters
+
+        response_model = next(
+            (
+                keyword.value
+                for keyword in decorator.keywords
+                if keyword.arg == "response_model"
+            ),
+            node.returns,
+        )
+        operation["responses"] = {
+            "200": {
+                "description": "Successful Response",
+                "content": {
+                    "application/json": {"schema": self.get_type_schema(response_model)}
+                },
+            }
+        }
+        if parameters or "requestBody" in operation:
+            operation["responses"]["422"] = {
+                "description": "Validation Error",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/HTTPValidationError"}
+                    }
+                },
+            }
+            self.components.update(VALIDATION_SCHEMAS)
+
+        operations = self.schema["paths"].setdefault(path, {})
+        if method in operations:
+            Logger.print_warn(
+                f"Route {method.upper()} {path} is declared twice, the first one"
+                " is documented",
+                line=node.lineno,
+            )
+            return
+        operations[method] = operation
+
+
+def generate_openapi(sources: Dict[str, str]) -> Dict[str, Any]:
+    """OpenAPI schema of the migrated modules `sources`, by module, as FastAPI
+    would generate it for the app including their routers in order."""
+    schema: Dict[str, Any] = {
+        "openapi": "3.1.0",
+        "info": {"title": "FastAPI", "version": "0.1.0"},
+        "paths": {},
+        "components": {"schemas": {}},
+    }
+    for module, source_code in sources.items():
+        Logger.current_module = module
+        OpenAPICollector(schema).collect(source_code)
+    schema["components"]["schemas"] = dict(
+        sorted(schema["components"]["schemas"].items())
+    )
+    if not schema["components"]["schemas"]:
+        del schema["components"]
+    return schema
+
+
+def generate_openapi_module(modules: Sequence[str]):
+    imports = repr([module.replace("/", ".") for module in modules])
+    return format_string(
+        f'''"""Serves the OpenAPI schema written at migration time from memory,
+rather than building it on the first docs request.
+
+`python openapi.py` compares it with the schema FastAPI generates.
+"""
+import importlib
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from fastapi import FastAPI
+
+MODULES = {imports}
+SCHEMA_PATH = Path(__file__).with_name("openapi.json")
+
+logger = logging.getLogger(__name__)
+
+
+def load_schema() -> Dict[str, Any]:
+    return json.loads(SCHEMA_PATH.read_text())
+
+
+def get_operations(schema: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {{
+        f"{{method.upper()}} {{path}}": operation
+        for path, operations in schema.get("paths", {{}}).items()
+        for method, operation in operations.items()
+    }}
+
+
+def compare_schemas(expected: Dict[str, Any], actual: Dict[str, Any]) -> List[str]:
+    """Differences between the operations of two schemas."""
+    expected_operations = get_operations(expected)
+    actual_operations = get_operations(actual)
+    differences = [
+        f"{{name}} is missing from the generated schema"
+        for name in expected_operations.keys() - actual_operations.keys()
+    ] + [
+        f"{{name}} is missing from openapi.json"
+        for name in actual_operations.keys() - expected_operations.keys()
+    ]
+    for name in expected_operations.keys() & actual_operations.keys():
+        expected_operation = expected_operations[name]
+        actual_operation = actual_operations[name]
+        for field, get in (
+            ("operationId", lambda operation: operation.get("operationId")),
+            (
+                "parameters",
+                lambda operation: sorted(
+                    (parameter["in"], parameter["name"])
+                    for parameter in operation.get("parameters", [])
+                ),
+            ),
+            ("requestBody", lambda operation: "requestBody" in operation),
+        ):
+            if get(expected_operation) != get(actual_operation):
+                differences.append(
+                    f"{{name}}: {{field}} is {{get(expected_operation)}} in"
+                    f" openapi.json, {{get(actual_operation)}} in the generated schema"
+                )
+    return sorted(differences)
+
+
+def install_openapi(app: FastAPI, live: bool = False):
+    """Serves openapi.json, or with `live` the schema FastAPI generates,
+    warning about what differs from openapi.json."""
+    if not live:
+        app.openapi_schema = load_schema()
+        return
+
+    generate = app.openapi
+
+    def openapi():
+        if app.openapi_schema is None:
+            for difference in compare_schemas(load_schema(), generate()):
+                logger.warning("OpenAPI schema mismatch: %s", difference)
+        return generate()
+
+    app.openapi = openapi
+
+
+def create_full_app() -> FastAPI:
+    from bootstrap import create_app
+
+    app = create_app()
+    for module in MODULES:
+        for router in importlib.import_module(module).routers:
+            app.include_router(router)
+    return app
+
+
+if __name__ == "__main__":
+    differences = compare_schemas(load_schema(), create_full_app().openapi())
+    for difference in differences:
+        print(difference)
+    sys.exit(1 if differences else 0)
+'''
+    )
@@ -0,0 +1,320 @@
+import ast
+from typing import Dict, List, Optional, Set
+
+from django_to_fastapi.blocking import (
+    get_imported_names,
+    get_qualified_name,
+    has_manager,
+    is_lazy_queryset,
+)
+from django_to_fastapi.utils import Logger
+
+# Async counterparts of QuerySet and manager methods hitting the database.
+ASYNC_QUERYSET_METHODS = {
+    method: "a" + method
+    for method in (
+        "get",
+        "first",
+        "last",
+        "earliest",
+        "latest",
+        "count",
+        "exists",
+        "contains",
+        "create",
+        "get_or_create",
+        "update_or_create",
+        "bulk_create",
+        "bulk_update",
+        "in_bulk",
+        "update",
+        "delete",
+        "aggregate",
+        "explain",
+    )
+}
+ASYNC_MODEL_METHODS = {
+    "save": "asave",
+    "delete": "adelete",
+    "refresh_from_db": "arefresh_from_db",
+}
+ASYNC_SHORTCUTS = {
+    "django.shortcuts.get_object_or_404": "aget_object_or_404",
+    "django.shortcuts.get_list_or_404": "aget_list_or_404",
+}
+# Methods returning model instances, whose `save()` can be made async.
+INSTANCE_METHODS = {
+    "get",
+    "first",
+    "last",
+    "earliest",
+    "latest",
+    "create",
+}
+ATOMIC = ("django.db.transaction.atomic", "transaction.atomic")
+# Builtins consuming a queryset, and what they become.
+ASYNC_CONSUMERS = {"list", "tuple", "set", "sorted", "len", "bool"}
+
+
+def _await(node: ast.expr):
+    return ast.copy_location(ast.Await(value=node), node)
+
+
+def _as_async_method(node: ast.Call, method: str):
+    return ast.copy_location(
+        ast.Call(
+            func=ast.Attribute(value=node.func.value, attr=method, ctx=ast.Load()),
+            args=node.args,
+            keywords=node.keywords,
+        ),
+        node,
+    )
+
+
+def _collect(queryset: ast.expr):
+    """`[item async for item in queryset]`"""
+    return ast.copy_location(
+        ast.ListComp(
+            elt=ast.Name(id="item", ctx=ast.Load()),
+            generators=[
+                ast.comprehension(
+                    target=ast.Name(id="item", ctx=ast.Store()),
+                    iter=queryset,
+                    ifs=[],
+                    is_async=1,
+                )
+            ],
+        ),
+        queryset,
+    )
+
+
+class AsyncORMTransformer(ast.NodeTransformer):
+    """Turns synchronous Django ORM calls of an `async def` into their async
+    counterparts: `aget`, `afirst`, `acreate`, `asave`, `adelete`...,
+    `async for` over querysets and `aget_object_or_404`.
+
+    Calls which have no counterpart, or run where nothing can be awaited
+    (generator expressions, lambdas, nested functions), are reported and left
+    as they are for `BlockingCallsHandler` to deal with.
+    """
+
+    def __init__(self, imports: Dict[str, str]):
+        self.imports = imports
+        self.unsafe: List[ast.AST] = []
+        # Names bound to model instances, from `get()`, `create()`, a loop over
+        # a queryset...
+        self.instances: Set[str] = set()
+        self.synchronous = 0
+
+    def transform(self, node: ast.AsyncFunctionDef):
+        self.instances = set()
+        atomic = self.find_atomic(node)
+        if atomic is not None:
+            # Django's transactions have no async API: the whole handler is left
+            # synchronous for `BlockingCallsHandler` to emit as a plain def.
+            self.report(atomic, "transactions have no async API")
+            return node
+        node.body = [self.visit(statement) for statement in node.body]
+        return node
+
+    def find_atomic(self, node: ast.AsyncFunctionDef) -> Optional[ast.expr]:
+        """`transaction.atomic` decorating or used in `node`, if any."""
+        for child in [*node.decorator_list, *node.body]:
+            for expression in ast.walk(child):
+                if isinstance(expression, (ast.Attribute, ast.Name)) and (
+                    get_qualified_name(expression, self.imports) in ATOMIC
+                ):
+                    return expression
+        return None
+
+    def report(self, node: ast.AST, reason: str):
+        self.unsafe.append(node)
+        Logger.print_warn(
+            f"Could not convert ORM call to async, {reason}",
+            sample_code=ast.unparse(node) + "\n",
+            line=getattr(node, "lineno", -1),
+        )
+
+    def _visit_synchronous(self, node):
+        self.synchronous += 1
+        self.generic_visit(node)
+        self.synchronous -= 1
+        return node
+
+    def visit_FunctionDef(self, node):
+        return self._visit_synchronous(node)
+
+    visit_Lambda = visit_FunctionDef
+    visit_GeneratorExp = visit_FunctionDef
+
+    def visit_AsyncFunctionDef(self, node):
+        # Migrated on its own.
+        return node
+
+    def visit_ClassDef(self, node):
+        return node
+
+    def visit_Assign(self, node):
+        self.generic_visit(node)
+        for target in node.targets:
+            match target:
+                case ast.Name(id=name) if self.returns_instance(node.value):
+                    self.instances.add(name)
+                case ast.Tuple(elts=[ast.Name(id=name), _]) if self.returns_pair(
+                    node.value
+                ):
+                    self.instances.add(name)
+        return node
+
+    def returns_pair(self, node: ast.expr):
+        """Whether `node` is `(instance, created)` from `aget_or_create()`..."""
+        match node:
+            case ast.Await(value=ast.Call(func=ast.Attribute(attr=attr))):
+                return attr in ("aget_or_create", "aupdate_or_create")
+        return False
+
+    def returns_instance(self, node: ast.expr):
+        match node:
+            case ast.Await(value=ast.Call(func=ast.Attribute(attr=attr, value=value))):
+                return attr.removeprefix("a") in INSTANCE_METHODS and has_manager(value)
+            case ast.Await(value=ast.Call(func=ast.Name(id=name))):
+                return name == "aget_object_or_404"
+            case ast.Call(func=func):
+                qualified_name = get_qualified_name(func, self.imports) or ""
+                # Model(...) with the model imported from a models module.
+                return ".models." in qualified_name
+        return False
+
+    def visit_For(self, node):
+        node.iter = self.visit(node.iter)
+        lazy = is_lazy_queryset(node.iter)
+        if lazy and not self.synchronous and isinstance(node.target, ast.Name):
+            self.instances.add(node.target.id)
+        node.body = [self.visit(statement) for statement in node.body]
+        node.orelse = [self.visit(statement) for statement in node.orelse]
+        if not lazy:
+            return node
+        if self.synchronous:
+            self.report(node.iter, "the loop can't be made async here")
+            return node
+        return ast.copy_location(
+            ast.AsyncFor(
+                target=node.target,
+                iter=node.iter,
+                body=node.body,
+                orelse=node.orelse,
+                type_comment=node.type_comment,
+            ),
+            node,
+        )
+
+    def visit_comprehension(self, node):
+        self.generic_visit(node)
+        if is_lazy_queryset(node.iter):
+            if self.synchronous:
+                self.report(node.iter, "the comprehension can't be made async here")
+            else:
+                node.is_async = 1
+        return node
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        converted = self.convert(node)
+        if converted is None:
+            return node
+        if self.synchronous:
+            self.report(node, "it isn't in an async context")
+            return node
+        return converted
+
+    def convert(self, node: ast.Call) -> Optional[ast.expr]:
+        match node.func:
+            case ast.Attribute(attr=attr, value=value) if has_manager(value):
+                if attr == "iterator":
+                    self.report(node, "iterate over aiterator() with async for")
+                    return None
+                if attr in ASYNC_QUERYSET_METHODS:
+                    return _await(_as_async_method(node, ASYNC_QUERYSET_METHODS[attr]))
+                return None
+            case ast.Attribute(attr=attr, value=ast.Name(id=name)) if (
+                attr in ASYNC_MODEL_METHODS and name in self.instances
+            ):
+                return _await(_as_async_method(node, ASYNC_MODEL_METHODS[attr]))
+            case ast.Attribute(attr="full_clean", value=ast.Name(id=name)) if (
+                name in self.instances
+            ):
+                self.report(node, "full_clean has no async counterpart")
+                return None
+            case ast.Attribute(attr=attr, value=ast.Name(id=name)) if (
+                attr in ASYNC_MODEL_METHODS and name != "self"
+            ):
+                self.report(node, f"{name} is not known to be a model instance")
+                return None
+            case ast.Name(id=name) if (
+                name in ASYNC_CONSUMERS
+                and name not in self.imports
+                and len(node.args) == 1
+                and is_lazy_queryset(node.args[0])
+            ):
+                return self.convert_consumer(node, name)
+
+        qualified_name = get_qualified_name(node.func, self.imports)
+        if qualified_name in ASYNC_SHORTCUTS:
+            return _await(
+                ast.copy_location(
+                    ast.Call(
+                        func=ast.Name(
+                            id=ASYNC_SHORTCUTS[qualified_name], ctx=ast.Load()
+                        ),
+                        args=node.args,
+                        keywords=node.keywords,
+                    ),
+                    node,
+                )
+            )
+        return None
+
+    def convert_consumer(self, node: ast.Call, name: str):
+        queryset = node.args[0]
+        match name:
+            case "len":
+                return _await(
+                    ast.Call(
+                        func=ast.Attribute(value=queryset, attr="acount"),
+                        args=[],
+                        keywords=[],
+                    )
+                )
+            case "bool":
+                return _await(
+                    ast.Call(
+                        func=ast.Attribute(value=queryset, attr="aexists"),
+                        args=[],
+                        keywords=[],
+                    )
+                )
+            case "list":
+                return _collect(queryset)
+        return ast.copy_location(
+            ast.Call(func=node.func, args=[_collect(queryset)], keywords=[]), node
+        )
+
+
+def convert_to_async_orm(module: ast.Module):
+    """Converts ORM calls of every `async def` in `module`, returns the async
+    shortcuts to import from `django.shortcuts`."""
+    transformer = AsyncORMTransformer(get_imported_names(module))
+    for node in [
+        node for node in ast.walk(module) if isinstance(node, ast.AsyncFunctionDef)
+    ]:
+        transformer.transform(node)
+    ast.fix_missing_locations(module)
+    shortcuts = set(ASYNC_SHORTCUTS.values())
+    return sorted(
+        {
+            node.id
+            for node in ast.walk(module)
+            if isinstance(node, ast.Name) and node.id in shortcuts
+        }
+    )
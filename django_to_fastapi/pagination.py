@@ -0,0 +1,571 @@
+import ast
+from typing import List, Optional, Set
+
+from django_to_fastapi.blocking import get_imported_names
+from django_to_fastapi.utils import Logger, format_string
+
+# DRF's pagination classes, same-named in `pagination.py`.
+PAGINATION_CLASSES = {
+    "rest_framework.pagination.PageNumberPagination",
+    "rest_framework.pagination.LimitOffsetPagination",
+    "rest_framework.pagination.CursorPagination",
+}
+PAGINATOR = "django.core.paginator.Paginator"
+# Names of `django.core.paginator` re-exported by `pagination.py`.
+PAGINATOR_NAMES = {
+    "django.core.paginator.Paginator",
+    "django.core.paginator.EmptyPage",
+    "django.core.paginator.InvalidPage",
+    "django.core.paginator.PageNotAnInteger",
+}
+# Methods of Django's `Paginator` hitting the database, and their async
+# counterparts.
+ASYNC_PAGINATOR_METHODS = {"page": "apage", "get_page": "aget_page"}
+ASYNC_PAGINATOR_ATTRIBUTES = {
+    "count": "acount",
+    "num_pages": "anum_pages",
+    "page_range": "apage_range",
+}
+# Methods of DRF's generic views paginating with their `pagination_class`.
+VIEW_PAGINATION_METHODS = ("paginate_queryset", "get_paginated_response")
+
+
+def _await(node: ast.expr):
+    return ast.copy_location(ast.Await(value=node), node)
+
+
+def _method_call(name: str, method: str, args: List[ast.expr]):
+    return ast.Call(
+        func=ast.Attribute(value=ast.Name(id=name), attr=method),
+        args=args,
+        keywords=[],
+    )
+
+
+class PaginationTransformer(ast.NodeTransformer):
+    """Awaits the pagination of a view, made async by `pagination.py`.
+
+    `self.paginate_queryset(queryset)` and `self.get_paginated_response(data)`
+    of DRF's generic views go through a `paginator` of the view's
+    `pagination_class`, set up at the start of the method."""
+
+    def __init__(
+        self,
+        paginations: Set[str],
+        paginators: Set[str],
+        pagination_class: Optional[str],
+        default_class: Optional[str] = None,
+    ):
+        self.paginations = paginations
+        self.paginators = paginators
+        self.pagination_class = pagination_class
+        # DRF's `DEFAULT_PAGINATION_CLASS`, as a dotted path.
+        self.default_class = default_class
+        self.pagination_instances: Set[str] = set()
+        self.paginator_instances: Set[str] = set()
+        self.uses_view_paginator = False
+        self.uses_default_class = False
+
+    def transform(self, node: ast.FunctionDef):
+        for child in ast.walk(node):
+            match child:
+                case ast.Assign(
+                    targets=[ast.Name(id=name)],
+                    value=ast.Call(
+                        func=ast.Attribute(
+                            value=ast.Name(id="self"), attr="pagination_class"
+                        )
+                    ) as call,
+                ):
+                    call.func = self.get_view_pagination_class(child)
+                    self.pagination_instances.add(name)
+                case ast.Assign(
+                    targets=[ast.Name(id=name)],
+                    value=ast.Call(func=ast.Name(id=constructor)),
+                ) if constructor in self.paginations:
+                    self.pagination_instances.add(name)
+                case ast.Assign(
+                    targets=[ast.Name(id=name)],
+                    value=ast.Call(func=ast.Name(id=constructor)),
+                ) if constructor in self.paginators:
+                    self.paginator_instances.add(name)
+                    Logger.print_warn(
+                        "Paginator keeps OFFSET pages and COUNT(*), the "
+                        "pagination classes of pagination.py seek on the ordering",
+                        sample_code=ast.unparse(child) + "\n",
+                        line=child.lineno,
+                    )
+        self.generic_visit(node)
+        if self.uses_view_paginator:
+            node.body.insert(
+                0,
+                ast.copy_location(
+                    ast.Assign(
+                        targets=[ast.Name(id="paginator")],
+                        value=ast.Call(
+                            func=self.get_view_pagination_class(node),
+                            args=[],
+                            keywords=[],
+                        ),
+                    ),
+                    node.body[0],
+                ),
+            )
+        return node
+
+    def get_view_pagination_class(self, node: ast.AST) -> ast.expr:
+        if self.pagination_class is None:
+            if self.default_class is None:
+                Logger.print_warn(
+                    "No pagination_class on the view nor DEFAULT_PAGINATION_CLASS "
+                    "in settings, PageNumberPagination is used",
+                    line=node.lineno,
+                )
+            self.pagination_class = get_default_name(self.default_class)
+            self.uses_default_class = True
+        return ast.Name(id=self.pagination_class)
+
+    def visit_Call(self, node: ast.Call):
+        self.generic_visit(node)
+        match node:
+            case ast.Call(
+                func=ast.Attribute(value=ast.Name(id=name), attr="paginate_queryset")
+            ) if name in self.pagination_instances:
+                node.keywords = [
+                    keyword for keyword in node.keywords if keyword.arg != "view"
+                ]
+                node.args = node.args[:2]
+                return _await(node)
+            case ast.Call(
+                func=ast.Attribute(value=ast.Name(id="self"), attr="paginate_queryset"),
+                args=[queryset],
+            ):
+                self.uses_view_paginator = True
+                return _await(
+                    ast.copy_location(
+                        _method_call(
+                            "paginator",
+                            "paginate_queryset",
+                            [queryset, ast.Name(id="request")],
+                        ),
+                        node,
+                    )
+                )
+            case ast.Call(
+                func=ast.Attribute(
+                    value=ast.Name(id="self"), attr="get_paginated_response"
+                )
+            ):
+                self.uses_view_paginator = True
+                return ast.copy_location(
+                    _method_call("paginator", "get_paginated_response", node.args),
+                    node,
+                )
+            case ast.Call(
+                func=ast.Attribute(value=ast.Name(id=name), attr=method)
+            ) if name in self.paginator_instances and method in ASYNC_PAGINATOR_METHODS:
+                node.func.attr = ASYNC_PAGINATOR_METHODS[method]
+                return _await(node)
+        return node
+
+    def visit_Attribute(self, node: ast.Attribute):
+        self.generic_visit(node)
+        match node:
+            case ast.Attribute(
+                value=ast.Name(id=name), attr=attribute, ctx=ast.Load()
+            ) if name in self.paginator_instances and (
+                attribute in ASYNC_PAGINATOR_ATTRIBUTES
+            ):
+                return _await(
+                    _method_call(name, ASYNC_PAGINATOR_ATTRIBUTES[attribute], [])
+                )
+        return node
+
+
+def get_default_pagination_class(settings_source: str) -> Optional[str]:
+    """`DEFAULT_PAGINATION_CLASS` of DRF's settings, as far as it is literal."""
+    for node in ast.parse(settings_source).body:
+        match node:
+            case ast.Assign(
+                targets=[ast.Name(id="REST_FRAMEWORK")],
+                value=ast.Dict(keys=keys, values=values),
+            ):
+                for key, value in zip(keys, values):
+                    match key, value:
+                        case ast.Constant(
+                            value="DEFAULT_PAGINATION_CLASS"
+                        ), ast.Constant(value=str(path)):
+                            return path
+    return None
+
+
+def get_default_name(default_class: Optional[str]) -> str:
+    return (default_class or "PageNumberPagination").rpartition(".")[2]
+
+
+def uses_view_pagination(module: ast.Module):
+    return any(
+        isinstance(node, ast.Attribute)
+        and node.attr in VIEW_PAGINATION_METHODS
+        and isinstance(node.value, ast.Name)
+        and node.value.id == "self"
+        for node in ast.walk(module)
+    )
+
+
+def translate_pagination(
+    module: ast.Module, default_class: Optional[str] = None
+) -> List[ast.ImportFrom]:
+    """Awaits pagination in views and returns the imports it needs: names of
+    `pagination.py`, in place of DRF's and Django's, and the class of views
+    without `pagination_class`, `default_class`."""
+    imported = get_imported_names(module)
+    paginations = {
+        name for name, qualified in imported.items() if qualified in PAGINATION_CLASSES
+    }
+    paginators = {
+        name for name, qualified in imported.items() if qualified == PAGINATOR
+    }
+    aliases = [
+        ast.alias(
+            name=qualified.rpartition(".")[2],
+            asname=None if name == qualified.rpartition(".")[2] else name,
+        )
+        for name, qualified in sorted(imported.items())
+        if qualified in PAGINATION_CLASSES or qualified in PAGINATOR_NAMES
+    ]
+    if not aliases and not uses_view_pagination(module):
+        return []
+    uses_default_class = False
+    for node in module.body:
+        match node:
+            case ast.ClassDef(bases=bases):
+                base_names = {base.id for base in bases if isinstance(base, ast.Name)}
+                if base_names & paginations:
+                    paginations.add(node.name)
+                    continue
+                if base_names & paginators:
+                    paginators.add(node.name)
+                    continue
+                pagination_class = get_pagination_class(node, paginations)
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        transformer = PaginationTransformer(
+                            paginations, paginators, pagination_class, default_class
+                        )
+                        transformer.transform(item)
+                        uses_default_class |= transformer.uses_default_class
+            case ast.FunctionDef() | ast.AsyncFunctionDef():
+                PaginationTransformer(paginations, paginators, None).transform(node)
+    imports = []
+    default_name = get_default_name(default_class)
+    if uses_default_class and default_name not in imported:
+        if default_class is None or default_class in PAGINATION_CLASSES:
+            aliases.append(ast.alias(name=default_name, asname=None))
+        else:
+            Logger.print_warn(
+                f"DEFAULT_PAGINATION_CLASS {default_class} is not migrated, it has "
+                "to be based on a class of pagination.py"
+            )
+            imports.append(
+                ast.ImportFrom(
+                    module=default_class.rpartition(".")[0],
+                    names=[ast.alias(name=default_name, asname=None)],
+                    level=0,
+                )
+            )
+    if aliases:
+        imports.insert(0, ast.ImportFrom(module="pagination", names=aliases, level=0))
+    return imports
+
+
+def get_pagination_class(node: ast.ClassDef, paginations: Set[str]) -> Optional[str]:
+    for item in node.body:
+        match item:
+            case ast.Assign(
+                targets=[ast.Name(id="pagination_class")], value=ast.Name(id=name)
+            ):
+                if name not in paginations:
+                    Logger.print_warn(
+                        f"Pagination class {name} is not migrated, it has to be "
+                        "based on a class of pagination.py",
+                        sample_code=ast.unparse(item) + "\n",
+                        line=item.lineno,
+                    )
+                return name
+    return None
+
+
+def generate_pagination_module():
+    return format_string(
+        '''"""DRF's pagination classes, seeking on the ordering of the queryset
+rather than counting and skipping rows with OFFSET: a page costs the same
+wherever it is, provided the ordering fields are indexed. Pages are linked by
+`cursor` query parameters. `page` and `offset` parameters of links handed out
+before the migration are still served, with OFFSET, their `next` and
+`previous` links are cursors.
+
+`count` is `PAGINATION_COUNT`: "exact" (the default) is `COUNT(*)` as DRF's,
+"approximate" is PostgreSQL's planner estimate above
+`PAGINATION_EXACT_COUNT_BELOW` rows and an exact count elsewhere, "none"
+leaves it null.
+"""
+import base64
+import json
+from functools import reduce
+from os import getenv
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from django.core.paginator import EmptyPage, InvalidPage, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+from conf import settings
+
+PAGINATION_COUNT = getenv("PAGINATION_COUNT", "exact")
+PAGINATION_EXACT_COUNT_BELOW = int(getenv("PAGINATION_EXACT_COUNT_BELOW", "1000"))
+PAGE_SIZE = getattr(settings, "REST_FRAMEWORK", {}).get("PAGE_SIZE")
+
+def approximate_count(queryset: QuerySet) -> int:
+    """Row estimate of the query plan on PostgreSQL, when it's large enough
+    for an exact count to be costly."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    return estimate if estimate >= PAGINATION_EXACT_COUNT_BELOW else queryset.count()
+
+
+async def count_rows(queryset: QuerySet, mode: str) -> Optional[int]:
+    if mode == "exact":
+        return await queryset.acount()
+    if mode == "approximate":
+        return await run_in_threadpool(approximate_count, queryset)
+    return None
+
+
+def get_value(row: Any, name: str) -> Any:
+    if isinstance(row, dict):
+        return row[name]
+    return reduce(getattr, name.split("__"), row)
+
+
+def seek(fields: Sequence[Tuple[str, bool]], values: Sequence[Any], reverse: bool) -> Q:
+    """Rows after `values` in the order of `fields`, before them if `reverse`:
+    `(a > x) | (a = x & b > y) | ...`."""
+    condition = None
+    equal = Q()
+    for (name, descending), value in zip(fields, values):
+        lookup = "lt" if descending != reverse else "gt"
+        step = equal & Q(**{f"{name}__{lookup}": value})
+        condition = step if condition is None else condition | step
+        equal &= Q(**{name: value})
+    return condition
+
+
+def positive_int(value: Optional[str], cutoff: Optional[int] = None) -> Optional[int]:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    if number <= 0:
+        return None
+    return min(number, cutoff) if cutoff else number
+
+
+class KeysetPagination:
+    """Base of the pagination classes, used as DRF's in handlers:
+    `await paginator.paginate_queryset(queryset, request)` then
+    `paginator.get_paginated_response(data)`."""
+
+    page_size: Optional[int] = PAGE_SIZE
+    page_size_query_param: Optional[str] = None
+    max_page_size: Optional[int] = None
+    cursor_query_param = "cursor"
+    # Fields of the seek, the queryset's ordering or the primary key by default.
+    ordering: Union[str, Sequence[str], None] = None
+    count_mode = PAGINATION_COUNT
+    with_count = True
+
+    def __init__(self):
+        self.request: Optional[Request] = None
+        self.count: Optional[int] = None
+        self.next: Optional[str] = None
+        self.previous: Optional[str] = None
+
+    def get_page_size(self, request: Request) -> Optional[int]:
+        if self.page_size_query_param:
+            size = positive_int(
+                request.query_params.get(self.page_size_query_param),
+                self.max_page_size,
+            )
+            if size:
+                return size
+        return self.page_size
+
+    def get_offset(self, request: Request, page_size: int) -> int:
+        """Rows skipped by links of offset pagination."""
+        return 0
+
+    def get_ordering(self, queryset: QuerySet) -> List[Tuple[str, bool]]:
+        ordering = self.ordering or queryset.query.order_by or queryset.model._meta.ordering
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        pk = queryset.model._meta.pk.name
+        fields = [
+            (pk if field.lstrip("-") == "pk" else field.lstrip("-"), field.startswith("-"))
+            for field in ordering
+            if isinstance(field, str) and field != "?"
+        ]
+        # A unique last field, so that no row is skipped or repeated.
+        if pk not in (name for name, _ in fields):
+            fields.append((pk, fields[-1][1] if fields else False))
+        return fields
+
+    def encode_cursor(self, row: Any, fields: Sequence[Tuple[str, bool]], reverse: bool):
+        position = json.dumps(
+            [[get_value(row, name) for name, _ in fields], reverse],
+            default=str,
+            separators=(",", ":"),
+        )
+        cursor = base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+        return str(
+            self.request.url.remove_query_params(self.get_offset_query_params())
+            .include_query_params(**{self.cursor_query_param: cursor})
+        )
+
+    def decode_cursor(self, cursor: str, fields: Sequence[Tuple[str, bool]]):
+        try:
+            values, reverse = json.loads(
+                base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            )
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=404, detail="Invalid cursor")
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise HTTPException(status_code=404, detail="Invalid cursor")
+        return values, bool(reverse)
+
+    def get_offset_query_params(self) -> List[str]:
+        return []
+
+    async def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> Optional[List[Any]]:
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        fields = self.get_ordering(queryset)
+        queryset = queryset.order_by(
+            *(("-" if descending else "") + name for name, descending in fields)
+        )
+        if self.with_count:
+            self.count = await count_rows(queryset, self.count_mode)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values, reverse = self.decode_cursor(cursor, fields)
+            window = queryset.filter(seek(fields, values, reverse))
+            if reverse:
+                window = window.reverse()
+            has_before = True
+        else:
+            reverse = False
+            offset = self.get_offset(request, page_size)
+            window = queryset[offset:]
+            has_before = offset > 0
+        rows = [row async for row in window[: page_size + 1]]
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, has_before
+        self.next = self.encode_cursor(rows[-1], fields, False) if has_next and rows else None
+        self.previous = (
+            self.encode_cursor(rows[0], fields, True) if has_previous and rows else None
+        )
+        return rows
+
+    def get_paginated_response(self, data: Any):
+        response = {"next": self.next, "previous": self.previous, "results": data}
+        if self.with_count:
+            response = {"count": self.count, **response}
+        return response
+
+
+class PageNumberPagination(KeysetPagination):
+    page_query_param = "page"
+
+    def get_offset(self, request: Request, page_size: int) -> int:
+        page = request.query_params.get(self.page_query_param)
+        if page is None:
+            return 0
+        number = positive_int(page)
+        if number is None:
+            raise HTTPException(status_code=404, detail="Invalid page.")
+        return (number - 1) * page_size
+
+    def get_offset_query_params(self) -> List[str]:
+        return [self.page_query_param]
+
+
+class LimitOffsetPagination(KeysetPagination):
+    default_limit: Optional[int] = PAGE_SIZE
+    limit_query_param = "limit"
+    offset_query_param = "offset"
+    max_limit: Optional[int] = None
+
+    def get_page_size(self, request: Request) -> Optional[int]:
+        limit = positive_int(
+            request.query_params.get(self.limit_query_param), self.max_limit
+        )
+        return limit or self.default_limit
+
+    def get_offset(self, request: Request, page_size: int) -> int:
+        return positive_int(request.query_params.get(self.offset_query_param)) or 0
+
+    def get_offset_query_params(self) -> List[str]:
+        return [self.offset_query_param]
+
+
+class CursorPagination(KeysetPagination):
+    ordering = "-created"
+    with_count = False
+
+
+class Paginator(DjangoPaginator):
+    """Django's, with async page loads: handlers can't evaluate querysets in
+    the event loop. Counts are cached by the first load."""
+
+    async def apage(self, number):
+        return await run_in_threadpool(self._load, self.page, number)
+
+    async def aget_page(self, number):
+        return await run_in_threadpool(self._load, self.get_page, number)
+
+    async def acount(self) -> int:
+        return await run_in_threadpool(lambda: self.count)
+
+    async def anum_pages(self) -> int:
+        return await run_in_threadpool(lambda: self.num_pages)
+
+    async def apage_range(self):
+        return await run_in_threadpool(lambda: self.page_range)
+
+    @staticmethod
+    def _load(method, number):
+        page = method(number)
+        page.object_list = list(page.object_list)
+        return page
+'''
+    )
@@ -1,6 +1,8 @@
 import ast
-import json
-from typing import Dict, List, Literal, Tuple, Optional
+import keyword
+from dataclasses import dataclass
+from re import sub
+from typing import Dict, List, Literal, Set, Tuple, Optional
 
 from option import NONE, Some, Option
 from django_to_fastapi.ast_operations import (
@@ -11,15 +13,249 @@ from django_to_fastapi.ast_operations import (
     find_field,
 )
 
-from django_to_fastapi.utils import get_arg_or_keyword, to_pascal_case, unparse, Logger
+from django_to_fastapi.config import Config
+from django_to_fastapi.dependencies import PROVIDERS
+from django_to_fastapi.profiling import Profiler
+from django_to_fastapi.utils import get_arg_or_keyword, to_pascal_case, Logger
 
 
 def get_payload_inputs(node: ast.FunctionDef, context: Optional[str] = ""):
-    visitor = InputCollector(context)
-    return visitor.collect(node)
+    with Profiler.stage("payload inference"):
+        visitor = InputCollector(context)
+        return visitor.collect(node)
+
+
+@dataclass
+class RequestAccess:
+    """A `request` (or `Response(...)`) name found in a view, along with its
+    ancestors, innermost first, up to the view itself."""
+
+    node: ast.Name
+    chain: List[ast.AST]
+    statement: ast.stmt
+
+    @property
+    def attr(self):
+        match self.chain[0]:
+            case ast.Attribute(attr=attr, value=value) if value is self.node:
+                return attr
+        return None
+
+
+class RequestAccessIndex:
+    """Single iterative pass over a view, linking every node to its `.parent`
+    and recording, in visiting order, each `request.<attr>` access and each
+    `Response(...)` call.
+
+    Being iterative, it doesn't hit the recursion limit on deep expressions.
+    """
+
+    def __init__(self, root: ast.FunctionDef):
+        self.root = root
+        self.accesses: List[RequestAccess] = []
+        self.build()
+
+    def build(self):
+        path: List[ast.AST] = [self.root]
+        statements: List[ast.stmt] = [self.root]
+        stack = [
+            (child, 1, child in self.root.body)
+            for child in reversed(list(ast.iter_child_nodes(self.root)))
+        ]
+        while stack:
+            node, depth, recording = stack.pop()
+            del path[depth:]
+            del statements[depth:]
+            node.parent = path[-1]
+            path.append(node)
+            statements.append(
+                node if isinstance(node, ast.stmt) else statements[-1]
+            )
+            if recording and isinstance(node, ast.Name) and self._is_tracked(node):
+                self.accesses.append(
+                    RequestAccess(
+                        node=node,
+                        chain=path[-2::-1],
+                        statement=statements[-1],
+                    )
+                )
+            stack.extend(
+                (child, depth + 1, recording)
+                for child in reversed(list(ast.iter_child_nodes(node)))
+            )
+
+    @staticmethod
+    def _is_tracked(node: ast.Name):
+        return node.id == "request" or (
+            node.id == "Response" and isinstance(node.parent, ast.Call)
+        )
+
+    def __iter__(self):
+        return iter(self.accesses)
+
+
+def get_final_node(chain: List[ast.AST], child: ast.AST):
+    """Outermost expression of an access chain starting at `child`: where it
+    stands in a list of nodes, or is the value of an assignment/ternary."""
+    position = chain.index(child)
+    for root in chain[position + 1 :]:
+        field = find_field(root, child)
+        if field and (
+            isinstance(getattr(root, field), list)
+            or isinstance(root, (ast.Assign, ast.IfExp))
+        ):
+            return child
+        child = root
+    raise ValueError("No final node found")
+
+
+def replace_node(root: ast.AST, target: ast.AST, candidate: ast.AST):
+    Runner.replace(root, target, candidate)
+    # Only `candidate` may lack a location, no need to fix the whole `root`.
+    ast.fix_missing_locations(ast.copy_location(candidate, target))
+
+
+def walk_until_parent_is_not(node: ast.AST, target_class):
+    while isinstance(node.parent, target_class):
+        node = node.parent
+    return node.parent
+
+
+def _optional(annotation: ast.expr):
+    return ast.Subscript(slice=annotation, value=ast.Name(id="Optional"))
+
+
+def infer_type(node: ast.expr) -> ast.expr:
+    """Type of a payload value as far as its expression tells, `Any` when it
+    doesn't: a wrong guess would fail validation at runtime."""
+    match node:
+        case ast.Constant(value=bool() | int() | float() | str() as value):
+            return ast.Name(id=type(value).__name__)
+        case ast.JoinedStr():
+            return ast.Name(id="str")
+        case ast.List() | ast.ListComp():
+            return ast.Name(id="list")
+        case ast.Dict() | ast.DictComp():
+            return ast.Name(id="dict")
+        case ast.Compare() | ast.UnaryOp(op=ast.Not()):
+            return ast.Name(id="bool")
+    return ast.Name(id="Any")
+
+
+def get_field_name(key: str):
+    """Attribute of a Pydantic model for a payload key."""
+    name = sub(r"\W", "_", key)
+    if not name.isidentifier() or keyword.iskeyword(name) or name.startswith("_"):
+        name = "field_" + name.lstrip("_")
+    return name
+
+
+def define_field(key: str, annotation: ast.expr, default: Optional[ast.expr]):
+    name = get_field_name(key)
+    value = default
+    if name != key:
+        value = ast.Call(
+            func=ast.Name(id="Field"),
+            args=[default] if default is not None else [],
+            keywords=[ast.keyword(arg="alias", value=ast.Constant(value=key))],
+        )
+    return ast.AnnAssign(
+        target=ast.Name(id=name), annotation=annotation, value=value, simple=1
+    )
+
+
+def define_model(name: str, fields: List[ast.stmt]):
+    return ast.ClassDef(
+        name=name,
+        bases=[ast.Name(id="BaseModel")],
+        keywords=[],
+        body=fields or [ast.Pass()],
+        decorator_list=[],
+    )
+
+
+def get_definition_name(definition: ast.stmt) -> str:
+    """Name of a payload `TypedDict`, model or alias."""
+    match definition:
+        case ast.ClassDef(name=name) | ast.Assign(targets=[ast.Name(id=name)]):
+            return name
+    raise ValueError("Not a payload definition")
+
+
+class PayloadAttributes(ast.NodeTransformer):
+    """Reads keys of a Pydantic payload as attributes: `data.get("key")` and
+    `data["key"]`, left where `request.data` was, become `data.key`, and
+    `data` used as a whole `data.model_dump(by_alias=True)`."""
+
+    def __init__(self, payload_names: Set[int]):
+        self.payload_names = payload_names
+        self.extra = False
+
+    def is_payload(self, node: ast.expr):
+        return isinstance(node, ast.Name) and id(node) in self.payload_names
+
+    def visit_Call(self, node):
+        match node:
+            case ast.Call(
+                func=ast.Attribute(attr="get", value=value),
+                args=[ast.Constant(value=str(key)), *default],
+                keywords=[],
+            ) if self.is_payload(value):
+                attribute = ast.Attribute(
+                    value=ast.Name(id="data"), attr=get_field_name(key)
+                )
+                if not default or isinstance(default[0], ast.Constant):
+                    return ast.copy_location(attribute, node)
+                return ast.copy_location(
+                    ast.IfExp(
+                        test=ast.Compare(
+                            left=ast.Constant(value=get_field_name(key)),
+                            ops=[ast.In()],
+                            comparators=[
+                                ast.Attribute(
+                                    value=ast.Name(id="data"), attr="model_fields_set"
+                                )
+                            ],
+                        ),
+                        body=attribute,
+                        orelse=self.visit(default[0]),
+                    ),
+                    node,
+                )
+        self.generic_visit(node)
+        return node
+
+    def visit_Subscript(self, node):
+        match node:
+            case ast.Subscript(
+                value=value, slice=ast.Constant(value=str(key))
+            ) if self.is_payload(value):
+                return ast.copy_location(
+                    ast.Attribute(
+                        value=ast.Name(id="data"),
+                        attr=get_field_name(key),
+                        ctx=node.ctx,
+                    ),
+                    node,
+                )
+        self.generic_visit(node)
+        return node
+
+    def visit_Name(self, node):
+        if not self.is_payload(node):
+            return node
+        self.extra = True
+        return ast.copy_location(
+            ast.Call(
+                func=ast.Attribute(value=ast.Name(id="data"), attr="model_dump"),
+                args=[],
+                keywords=[ast.keyword(arg="by_alias", value=ast.Constant(value=True))],
+            ),
+            node,
+        )
 
 
-class InputCollector(ast.NodeVisitor):
+class InputCollector:
     def __init__(self, context: Optional[str] = ""):
         self.args: Dict[str, Tuple[Option[ast.AST], Option[ast.AST]]] = {}
         self.context = context
@@ -27,36 +263,23 @@ class InputCollector(ast.NodeVisitor):
         self.operations: ASTOperations = []
         self.otherops: List[Tuple[ast.AST, ASTOperation]] = []
         self.out = []
-
-    def visit_Name(self, node):
-        if node.id == "Response" and isinstance(node.parent, ast.Call):
+        # With Pydantic payloads: whether each body key was read with `.get()`
+        # and its default, and the `data` names left where `request.data` was.
+        self.body_defaults: Dict[str, Tuple[bool, Option[ast.AST]]] = {}
+        self.payload_names: Set[int] = set()
+        self.extra = False
+        # Payloads returned as they are, which go through `response_model`.
+        self.returned: List[ast.expr] = []
+
+    def _payload_name(self):
+        name = ast.Name(id="data")
+        self.payload_names.add(id(name))
+        return name
+
+    def handle_access(self, access: RequestAccess):
+        node = access.node
+        if node.id == "Response":
             return self._handle_response(node)
-        if node.id != "request":
-            return node
-
-        def get_final_node(root, child):
-            field = find_field(root, child)
-            if not field:
-                return get_final_node(root.parent, root)
-            if (
-                isinstance(getattr(root, field), list)
-                or isinstance(root, ast.Assign)
-                or isinstance(root, ast.IfExp)
-            ):
-                return child
-            return get_final_node(root.parent, root)
-
-        def walk_until_parent_is_not(node, target_class):
-            if not isinstance(node.parent, target_class):
-                return node.parent
-            else:
-                return walk_until_parent_is_not(node.parent, target_class)
-
-        def walk_until_parent_is(node, target_class):
-            if isinstance(node.parent, target_class):
-                return node
-            else:
-                return walk_until_parent_is(node.parent, target_class)
 
         def wrap(items: list, index: int):
             try:
@@ -83,108 +306,108 @@ class InputCollector(ast.NodeVisitor):
                     return node.args[0].value, NONE
 
         try:
-            match node.parent:
-                case ast.Attribute():
-                    match node.parent.attr:
-                        case "data":
-                            final = get_final_node(node.parent.parent, node.parent)
-                            if final.parent is self.root:
-                                self.body_input = Some({})
-                            elif final is node.parent:
-                                self.body_input = Some(self.body_input.unwrap_or({}))
-                                Runner.replace(
-                                    node.parent.parent, node.parent, ast.Name(id="data")
-                                )
-                                ast.fix_missing_locations(node.parent.parent)
-                            else:
-                                body_input_definitions = self.body_input.unwrap_or({})
-                                name, default = handle_final(final)
-
-                                body_input_definitions[name] = (
-                                    ast.Subscript(
-                                        slice=ast.Name(id="Any"),
-                                        value=ast.Name(id="Optional"),
-                                    )
-                                    if default.is_some
-                                    else ast.Name(id="Any")
-                                )
-
-                                self.body_input = Some(body_input_definitions)
-
-                                Runner.replace(
-                                    node.parent.parent, node.parent, ast.Name(id="data")
-                                )
-                                ast.fix_missing_locations(node.parent.parent)
-
-                        case "query_params" | "GET":
-                            final = walk_until_parent_is_not(node.parent, ast.Attribute)
-                            name, default = handle_final(final)
-                            self.args[name] = (
-                                default,
-                                Some(
-                                    ast.Subscript(
-                                        slice=ast.Name(id="str"),
-                                        value=ast.Name(id="Optional"),
-                                    )
-                                    if default.is_some
-                                    else ast.Name(id="str")
-                                ),
+            match access.attr:
+                case "data":
+                    final = get_final_node(access.chain, node.parent)
+                    if final.parent is self.root:
+                        self.body_input = Some({})
+                    elif final is node.parent:
+                        self.body_input = Some(self.body_input.unwrap_or({}))
+                        replace_node(
+                            node.parent.parent, node.parent, self._payload_name()
+                        )
+                    else:
+                        body_input_definitions = self.body_input.unwrap_or({})
+                        name, default = handle_final(final)
+
+                        body_input_definitions[name] = (
+                            ast.Subscript(
+                                slice=ast.Name(id="Any"),
+                                value=ast.Name(id="Optional"),
+                            )
+                            if default.is_some
+                            else ast.Name(id="Any")
+                        )
+
+                        self.body_input = Some(body_input_definitions)
+                        self.body_defaults[name] = (
+                            isinstance(final, ast.Call),
+                            default,
+                        )
+
+                        replace_node(
+                            node.parent.parent, node.parent, self._payload_name()
+                        )
+
+                case "query_params" | "GET":
+                    final = walk_until_parent_is_not(node.parent, ast.Attribute)
+                    name, default = handle_final(final)
+                    self.args[name] = (
+                        default,
+                        Some(
+                            ast.Subscript(
+                                slice=ast.Name(id="str"),
+                                value=ast.Name(id="Optional"),
                             )
+                            if default.is_some
+                            else ast.Name(id="str")
+                        ),
+                    )
 
-                            match final.parent:
-                                case ast.Assign():
-                                    if final.parent.targets[0].id == name:
-                                        self.otherops.append(
-                                            (
-                                                final.parent.parent,
-                                                ASTOperation(
-                                                    action=ASTOperationAction.Remove,
-                                                    options={"target": final.parent},
-                                                ),
-                                            )
-                                        )
-                                    else:
-                                        Runner.replace(
-                                            final.parent, final, ast.Name(id=name)
-                                        )
-                                        ast.fix_missing_locations(final.parent)
-                                case ast.Call():
-                                    ...
-                                case _:
-                                    Runner.replace(
-                                        final.parent, final, ast.Name(id=name)
-                                    )
-                                    ast.fix_missing_locations(final.parent)
-                        case str:
-
-                            self.args[node.parent.attr] = (
-                                Some(
-                                    ast.Call(
-                                        func=ast.Name(id="Depends"),
-                                        args=[ast.Name(id="get_" + node.parent.attr)],
-                                        keywords=[],
+                    match final.parent:
+                        case ast.Assign():
+                            if final.parent.targets[0].id == name:
+                                self.otherops.append(
+                                    (
+                                        final.parent.parent,
+                                        ASTOperation(
+                                            action=ASTOperationAction.Remove,
+                                            options={"target": final.parent},
+                                        ),
                                     )
-                                ),
-                                Some(ast.Name(id="Any")),
-                            )
-                            Runner.replace(
-                                node.parent.parent,
-                                node.parent,
-                                ast.Name(id=node.parent.attr),
+                                )
+                            else:
+                                replace_node(final.parent, final, ast.Name(id=name))
+                        case ast.Call():
+                            ...
+                        case _:
+                            replace_node(final.parent, final, ast.Name(id=name))
+                case str(attr):
+                    if attr not in PROVIDERS:
+                        Logger.print_warn(
+                            f"No provider of request.{attr} in dependencies.py,"
+                            f" get_{attr} has to be written",
+                            sample_code=ast.unparse(access.statement) + "\n",
+                            line=node.lineno,
+                        )
+                    self.args[attr] = (
+                        Some(
+                            ast.Call(
+                                func=ast.Name(id="Depends"),
+                                args=[ast.Name(id="get_" + attr)],
+                                keywords=[],
                             )
-                            ast.fix_missing_locations(node.parent.parent)
+                        ),
+                        Some(ast.Name(id="Any")),
+                    )
+                    replace_node(node.parent.parent, node.parent, ast.Name(id=attr))
+                case None if "request" not in self.args:
+                    # Passed on as it is, to a paginator for instance: the
+                    # first parameter, as it has no default.
+                    self.args = {
+                        "request": (NONE, Some(ast.Name(id="Request"))),
+                        **self.args,
+                    }
         except Exception as e:
             Logger.print_warn(
                 f"Could not handle request rewrite: ({e})",
-                sample_code=unparse(walk_until_parent_is(node.parent, ast.FunctionDef)),
+                sample_code=ast.unparse(access.statement) + "\n",
                 line=node.lineno,
             )
 
         if self.body_input.is_some and "data" not in self.args:
             self.args["data"] = (NONE, Some(ast.Name(id=self.get_payload_input())))
 
-        return node
-
     def get_payload_input(self):
         return "PayloadInput" + self.context + to_pascal_case(self.root.name)
 
@@ -193,15 +416,20 @@ class InputCollector(ast.NodeVisitor):
 
     def collect(self, node: ast.FunctionDef):
         self.root = node
-        for item in ast.walk(node):
-            for child in ast.iter_child_nodes(item):
-                child.parent = item
-
-        [self.visit(item) for item in node.body]
+        for access in RequestAccessIndex(node):
+            self.handle_access(access)
 
         Runner.execute(node, self.operations)
+        # One batch per parent, rather than a full pass per operation.
+        batches: Dict[int, Tuple[ast.AST, ASTOperations]] = {}
         for (root, operation) in self.otherops:
-            Runner.execute(root, [operation])
+            batches.setdefault(id(root), (root, []))[1].append(operation)
+        for root, operations in batches.values():
+            Runner.execute(root, operations)
+        if Config.payloads == "pydantic" and "data" in self.args:
+            attributes = PayloadAttributes(self.payload_names)
+            attributes.visit(self.root)
+            self.extra = attributes.extra
 
         return (
             [
@@ -211,10 +439,31 @@ class InputCollector(ast.NodeVisitor):
                 )
             ],
             Some(self._define_payload_type()) if "data" in self.args else NONE,
-            Some(self._define_payload_output()) if self.out else NONE,
+            self._get_payload_output(),
         )
 
+    def _get_payload_output(self) -> Option[ast.stmt]:
+        if Config.payloads != "pydantic":
+            return Some(self._define_payload_output()) if self.out else NONE
+        # Responses built by the handler skip `response_model`, anything else
+        # returned has to fit the model.
+        returned = {id(node) for node in self.returned}
+        if not self.returned or any(
+            id(node.value) not in returned
+            for node in ast.walk(self.root)
+            if isinstance(node, ast.Return)
+            and not (
+                isinstance(node.value, ast.Call)
+                and isinstance(node.value.func, ast.Name)
+                and node.value.func.id == Config.get_response_class()[1]
+            )
+        ):
+            return NONE
+        return Some(self._define_payload_output())
+
     def _define_payload_type(self):
+        if Config.payloads == "pydantic":
+            return self._define_payload_model()
         keys = [ast.Constant(value=key) for key in self.body_input.unwrap().keys()]
         values = [value for value in self.body_input.unwrap().values()]
 
@@ -232,7 +481,84 @@ class InputCollector(ast.NodeVisitor):
             ),
         )
 
+    def _define_payload_model(self):
+        fields = []
+        for key in self.body_input.unwrap():
+            optional, default = self.body_defaults.get(key, (False, NONE))
+            match default.unwrap() if default.is_some else None:
+                case _ if not optional:
+                    annotation, value = ast.Name(id="Any"), None
+                case ast.Constant(value=bool() | int() | float() | str()) as value:
+                    annotation = _optional(ast.Name(id=type(value.value).__name__))
+                case _:
+                    # Non-constant defaults are applied where the key is read.
+                    annotation, value = _optional(ast.Name(id="Any")), ast.Constant(value=None)
+            fields.append(define_field(key, annotation, value))
+        if self.extra:
+            # `data` is also used as a whole, keep the keys not read alone.
+            fields.insert(
+                0,
+                ast.Assign(
+                    targets=[ast.Name(id="model_config")],
+                    value=ast.Call(
+                        func=ast.Name(id="ConfigDict"),
+                        args=[],
+                        keywords=[
+                            ast.keyword(arg="extra", value=ast.Constant(value="allow"))
+                        ],
+                    ),
+                ),
+            )
+        return define_model(self.get_payload_input(), fields)
+
+    def _define_output_model(self) -> Optional[ast.ClassDef]:
+        """Model of the dicts returned by the handler, keys missing from some
+        of them are optional. None if keys aren't all known strings."""
+        types: Dict[str, ast.expr] = {}
+        counts: Dict[str, int] = {}
+        for item in self.returned:
+            for key, value in zip(item.keys, item.values):
+                if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
+                    return None
+                value_type = infer_type(value)
+                if key.value in types and ast.dump(types[key.value]) != ast.dump(
+                    value_type
+                ):
+                    value_type = ast.Name(id="Any")
+                types[key.value] = value_type
+                counts[key.value] = counts.get(key.value, 0) + 1
+        if len({get_field_name(key) for key in types}) != len(types):
+            return None
+        return define_model(
+            self.get_payload_output(),
+            [
+                define_field(key, value_type, None)
+                if counts[key] == len(self.returned)
+                else define_field(key, _optional(value_type), ast.Constant(value=None))
+                for key, value_type in types.items()
+            ],
+        )
+
     def _define_payload_output(self):
+        if Config.payloads == "pydantic":
+            if all(isinstance(item, ast.Dict) for item in self.returned):
+                model = self._define_output_model()
+                if model is not None:
+                    return model
+            types = []
+            for item in self.returned:
+                value_type = infer_type(item)
+                if not any(ast.dump(value_type) == ast.dump(other) for other in types):
+                    types.append(value_type)
+            return ast.Assign(
+                targets=[ast.Name(id=self.get_payload_output())],
+                value=ast.Subscript(
+                    slice=ast.Tuple(elts=types), value=ast.Name(id="Union")
+                )
+                if len(types) > 1
+                else types[0],
+            )
+
         def get_type(item, context=""):
             match item:
                 case ast.Name():
@@ -300,7 +626,7 @@ class InputCollector(ast.NodeVisitor):
 
         def getnewwcall(status_node: ast.AST, payload):
             return ast.Call(
-                func=ast.Name("JSONResponse"),
+                func=ast.Name(Config.get_response_class()[1]),
                 args=[payload.unwrap()] if payload.is_some else [ast.Constant(value="")],
                 keywords=[
                     ast.keyword(
@@ -312,11 +638,10 @@ class InputCollector(ast.NodeVisitor):
         def handle_target(status_code, status_value, payload):
             if payload.is_some:
                 self.out.append(payload.unwrap())
-            return (
-                getnewwcall(status_value, payload)
-                if status_code != 200 or status_code == 200 and payload.is_none
-                else payload.unwrap()
-            )
+            if status_code != 200 or status_code == 200 and payload.is_none:
+                return getnewwcall(status_value, payload)
+            self.returned.append(payload.unwrap())
+            return payload.unwrap()
 
         if status.is_some:
             status_node = status.unwrap()
@@ -336,6 +661,6 @@ class InputCollector(ast.NodeVisitor):
                     ...
         else:
             target = payload.unwrap()
-        Runner.replace(node.parent.parent, node.parent, target)
-        ast.fix_missing_locations(node.parent.parent)
+            self.returned.append(target)
+        replace_node(node.parent.parent, node.parent, target)
         return node
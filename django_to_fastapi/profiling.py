@@ -0,0 +1,193 @@
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter, process_time
+from typing import Any, Dict, List, Optional
+
+STAGES = (
+    "parse",
+    "migrate",
+    "pagination",
+    "payload inference",
+    "async orm",
+    "async cache",
+    "async coloring",
+    "blocking calls",
+    "import clearing",
+    "unparse",
+    "format",
+    "write",
+)
+
+
+@dataclass
+class _Frame:
+    name: str
+    wall: float
+    cpu: float
+    memory: int
+    peak: int
+    children_wall: float = 0.0
+    children_cpu: float = 0.0
+
+
+@dataclass
+class ModuleProfile:
+    module: str
+    stages: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    ast_operations: int = 0
+
+    @property
+    def wall(self):
+        return sum(stage["wall"] for stage in self.stages.values())
+
+    def to_dict(self):
+        return {
+            "wall": self.wall,
+            "cpu": sum(stage["cpu"] for stage in self.stages.values()),
+            "ast_operations": self.ast_operations,
+            "stages": self.stages,
+        }
+
+
+class Profiler:
+    """Times stages of the migration of the current module.
+
+    Like `Logger`, state is held by the class so stages can be marked from
+    anywhere in the pipeline; `stage` does nothing unless `enabled`. Nested
+    stages are subtracted from the wall and CPU times of the enclosing one,
+    peak memory is the highest traced memory above what was allocated when the
+    stage started.
+    """
+
+    enabled = False
+    cprofile_module: Optional[str] = None
+    cprofile_path: Optional[str] = None
+
+    current: Optional[ModuleProfile] = None
+    frames: List[_Frame] = []
+
+    @classmethod
+    def configure(
+        cls,
+        enabled: bool,
+        cprofile_module: Optional[str] = None,
+        cprofile_path: Optional[str] = None,
+    ):
+        cls.enabled = enabled
+        cls.cprofile_module = cprofile_module
+        cls.cprofile_path = cprofile_path
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def settings(cls) -> Dict[str, Any]:
+        return {
+            "enabled": cls.enabled,
+            "cprofile_module": cls.cprofile_module,
+            "cprofile_path": cls.cprofile_path,
+        }
+
+    @classmethod
+    def start(cls, module: str, profile: Optional[ModuleProfile] = None):
+        if cls.enabled:
+            cls.current = profile or ModuleProfile(module)
+            cls.frames = []
+
+    @classmethod
+    def finish(cls):
+        profile, cls.current = cls.current, None
+        return profile
+
+    @classmethod
+    @contextmanager
+    def stage(cls, name: str):
+        if cls.current is None:
+            yield
+            return
+
+        if cls.frames:
+            parent = cls.frames[-1]
+            parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        memory = tracemalloc.get_traced_memory()[0]
+        frame = _Frame(name, perf_counter(), process_time(), memory, memory)
+        cls.frames.append(frame)
+        try:
+            yield
+        finally:
+            wall = perf_counter() - frame.wall
+            cpu = process_time() - frame.cpu
+            peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            cls.frames.pop()
+            if cls.frames:
+                parent = cls.frames[-1]
+                parent.children_wall += wall
+                parent.children_cpu += cpu
+                parent.peak = max(parent.peak, peak)
+
+            stage = cls.current.stages.setdefault(
+                name, {"wall": 0.0, "cpu": 0.0, "peak_memory": 0, "calls": 0}
+            )
+            stage["wall"] += wall - frame.children_wall
+            stage["cpu"] += cpu - frame.children_cpu
+            stage["peak_memory"] = max(stage["peak_memory"], peak - frame.memory)
+            stage["calls"] += 1
+
+    @classmethod
+    def count_operations(cls, count: int):
+        if cls.current is not None:
+            cls.current.ast_operations += count
+
+    @classmethod
+    @contextmanager
+    def cprofile(cls, module: str):
+        """Dumps cProfile stats of the migration of `cprofile_module`."""
+        if not cls.enabled or module != cls.cprofile_module:
+            yield
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(cls.cprofile_path)
+
+
+class ProfileReport:
+    def __init__(self):
+        self.modules: Dict[str, ModuleProfile] = {}
+
+    def add(self, profile: ModuleProfile):
+        self.modules[profile.module] = profile
+
+    def to_dict(self, top: int = 10):
+        stages: Dict[str, Dict[str, float]] = {}
+        for profile in self.modules.values():
+            for name, stage in profile.stages.items():
+                total = stages.setdefault(
+                    name, {"wall": 0.0, "cpu": 0.0, "peak_memory": 0, "calls": 0}
+                )
+                total["wall"] += stage["wall"]
+                total["cpu"] += stage["cpu"]
+                total["peak_memory"] = max(total["peak_memory"], stage["peak_memory"])
+                total["calls"] += stage["calls"]
+
+        slowest = sorted(
+            self.modules.values(), key=lambda profile: profile.wall, reverse=True
+        )[:top]
+        return {
+            "wall": sum(profile.wall for profile in self.modules.values()),
+            "ast_operations": sum(
+                profile.ast_operations for profile in self.modules.values()
+            ),
+            "stages": {name: stages[name] for name in STAGES if name in stages},
+            "slowest_modules": [
+                {"module": profile.module, "wall": profile.wall} for profile in slowest
+            ],
+            "modules": {
+                module: profile.to_dict() for module, profile in self.modules.items()
+            },
+        }
@@ -1,12 +1,26 @@
 import ast
+import re
+from collections.abc import Sequence as SequenceABC
 from dataclasses import dataclass
-from typing import List, Sequence
+from os import path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django_to_fastapi.utils import Logger, read_file
+
+DJANGO_PACKAGES = ("rest_framework", "django")
+PATH_FUNCTIONS = ("path", "re_path", "url")
+ROUTER_CLASSES = ("DefaultRouter", "SimpleRouter")
+
+PATH_CONVERTER = re.compile(r"<(?:[^>:]+:)?(?P<parameter>\w+)>")
+NAMED_GROUP = re.compile(r"\(\?P<(?P<parameter>\w+)>[^)]*\)")
 
 
 @dataclass
 class Route:
     path: str
     view: str
+    # Module defining the view, as in "app/views", when known.
+    module: Optional[str] = None
 
 
 def get_view(source: str, node: ast.AST):
@@ -16,6 +30,8 @@ def get_view(source: str, node: ast.AST):
             if isinstance(node.func.value, ast.Name)
             else node.func.value.func.id
         )
+    if isinstance(node, ast.Name):
+        return node.id
 
     return ast.get_source_segment(source, node)
 
@@ -45,9 +61,9 @@ def get_routes(source_code: str) -> Sequence[Route]:
 
 
 class ImportsCollector(ast.NodeVisitor):
-    def __init__(self, views: List[str], modules: List[str] = []):
+    def __init__(self, views: List[str], modules: Optional[List[str]] = None):
         self.views = views
-        self.modules = modules
+        self.modules = [] if modules is None else modules
 
     def visit_Import(self, node: ast.ImportFrom):
         if set(node.names).difference(self.views):
@@ -59,7 +75,6 @@ class ImportsCollector(ast.NodeVisitor):
             self.modules.append(node.module)
         except:
             return
-            
 
 
 def get_modules_from_routes(source_code, routes: Sequence[Route]) -> List[str]:
@@ -68,3 +83,273 @@ def get_modules_from_routes(source_code, routes: Sequence[Route]) -> List[str]:
     visitor = ImportsCollector([route.view for route in routes])
     visitor.visit(source_tree)
     return [import_.replace(".", "/") for import_ in visitor.modules]
+
+
+class RouteTable(SequenceABC):
+    """Routes in URLconf order, indexed by module and view name.
+
+    A view routed several times is found under its first route, as `Migrator`
+    always did when scanning routes in order. Same-named views of different
+    modules each keep their own route.
+    """
+
+    def __init__(self, routes: Sequence[Route]):
+        self.routes = list(routes)
+        self.by_view: Dict[Tuple[Optional[str], str], Route] = {}
+        self.by_name: Dict[str, Route] = {}
+        for route in self.routes:
+            self.by_view.setdefault((route.module, route.view), route)
+            self.by_name.setdefault(route.view, route)
+
+    def __getitem__(self, index):
+        return self.routes[index]
+
+    def __len__(self):
+        return len(self.routes)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def get(self, view: str, module: Optional[str] = None) -> Optional[Route]:
+        """Route of `view` in `module`, or of a route whose module is unknown.
+        Without `module`, the first route of a view of that name."""
+        if module is None:
+            return self.by_name.get(view)
+        return self.by_view.get((module, view)) or self.by_view.get((None, view))
+
+    @property
+    def modules(self) -> List[str]:
+        return list(
+            dict.fromkeys(route.module for route in self.routes if route.module)
+        )
+
+
+def path_to_fastapi(route: str):
+    return PATH_CONVERTER.sub(r"{\g<parameter>}", route)
+
+
+def regex_to_fastapi(route: str):
+    route = route.removeprefix("^").removesuffix("$").removesuffix("\\Z")
+    return NAMED_GROUP.sub(r"{\g<parameter>}", route)
+
+
+def _resolve_relative(module: Optional[str], level: int, package: str):
+    if not level:
+        return module or ""
+    parts = package.split(".")[: len(package.split(".")) - level + 1]
+    return ".".join([*[part for part in parts if part], *([module] if module else [])])
+
+
+class URLConfResolver:
+    """Resolves the whole URL tree from a root URLconf.
+
+    `include()` of other URLconfs (by dotted path, `(module, app_name)` tuple,
+    inline list or router), `path`, `re_path`/`url` and
+    `DefaultRouter`/`SimpleRouter.register` are followed, prefixes composed and
+    Django path converters or regex named groups turned into FastAPI path
+    parameters. Each URLconf is parsed at most once.
+    """
+
+    def __init__(self, root_path: str):
+        self.root_path = root_path
+        self.parsed: Dict[str, Optional[ast.Module]] = {}
+
+    def resolve(self, urls_module: str) -> RouteTable:
+        return RouteTable(self.resolve_module(urls_module, "", ()))
+
+    def get_path(self, urls_module: str):
+        return self.root_path + "/" + urls_module.replace(".", "/") + ".py"
+
+    def parse(self, urls_module: str):
+        if urls_module not in self.parsed:
+            file_path = self.get_path(urls_module)
+            self.parsed[urls_module] = (
+                ast.parse(read_file(file_path)) if path.exists(file_path) else None
+            )
+        return self.parsed[urls_module]
+
+    def invalidate(self, urls_module: str):
+        self.parsed.pop(urls_module, None)
+
+    def resolve_module(
+        self, urls_module: str, prefix: str, stack: Tuple[str, ...]
+    ) -> List[Route]:
+        if urls_module in stack:
+            return []
+        if urls_module.startswith(DJANGO_PACKAGES):
+            return []
+        tree = self.parse(urls_module)
+        if tree is None:
+            Logger.current_module = stack[-1] if stack else urls_module
+            Logger.print_warn(f"Could not find URLconf {urls_module}")
+            return []
+
+        context = _URLConfContext(urls_module, tree)
+        routes = []
+        for patterns in context.get_urlpatterns():
+            for pattern in patterns:
+                routes += self.resolve_pattern(
+                    context, pattern, prefix, (*stack, urls_module)
+                )
+        return routes
+
+    def resolve_pattern(
+        self, context: "_URLConfContext", node: ast.AST, prefix: str, stack
+    ) -> List[Route]:
+        match node:
+            case ast.Call(
+                func=ast.Name(id=function) | ast.Attribute(attr=function)
+            ) if (function in PATH_FUNCTIONS and len(node.args) >= 2):
+                route = node.args[0]
+                if not isinstance(route, ast.Constant):
+                    return []
+                route_path = (
+                    path_to_fastapi(route.value)
+                    if function == "path"
+                    else regex_to_fastapi(route.value)
+                )
+                return self.resolve_view(
+                    context, node.args[1], prefix + route_path, stack
+                )
+            case ast.Attribute(attr="urls", value=ast.Name(id=router)) if (
+                router in context.routers
+            ):
+                return [
+                    route
+                    for register_prefix, view in context.routers[router]
+                    for route in self.resolve_view(
+                        context, view, prefix + regex_to_fastapi(register_prefix), stack
+                    )
+                ]
+        return []
+
+    def resolve_view(
+        self, context: "_URLConfContext", node: ast.AST, route_path: str, stack
+    ) -> List[Route]:
+        match node:
+            case ast.Call(func=ast.Name(id="include") | ast.Attribute(attr="include")):
+                return self.resolve_include(context, node.args[0], route_path, stack)
+            case ast.Call(func=ast.Attribute(attr="as_view")):
+                view = get_view("", node)
+                return [Route("/" + route_path, view, context.get_module(view))]
+            case ast.Call(args=[view, *_]):
+                # Wrapped by a decorator, as in csrf_exempt(view).
+                return self.resolve_view(context, view, route_path, stack)
+            case ast.Name(id=view):
+                return [Route("/" + route_path, view, context.get_module(view))]
+            case ast.Attribute(attr=view):
+                module = context.get_module(ast.unparse(node.value), attribute=True)
+                if module is None:
+                    return []
+                return [Route("/" + route_path, view, module)]
+        return []
+
+    def resolve_include(self, context, node: ast.AST, prefix: str, stack):
+        match node:
+            case ast.Constant(value=str(urls_module)):
+                return self.resolve_module(urls_module, prefix, stack)
+            case ast.Tuple(elts=[first, *_]):
+                return self.resolve_include(context, first, prefix, stack)
+            case ast.List(elts=patterns):
+                return [
+                    route
+                    for pattern in patterns
+                    for route in self.resolve_pattern(context, pattern, prefix, stack)
+                ]
+            case ast.Attribute(attr="urls"):
+                return self.resolve_pattern(context, node, prefix, stack)
+            case ast.Name(id=name) if name in context.imports:
+                base, attribute = context.imports[name]
+                urls_module = base + "." + attribute if attribute else base
+                return self.resolve_module(urls_module, prefix, stack)
+        return []
+
+
+class _URLConfContext:
+    def __init__(self, urls_module: str, tree: ast.Module):
+        self.package = urls_module.rpartition(".")[0]
+        self.tree = tree
+        # Local name -> (module, attribute imported from it or None).
+        self.imports: Dict[str, Tuple[str, Optional[str]]] = {}
+        self.routers: Dict[str, List[Tuple[str, ast.AST]]] = {}
+
+        for node in tree.body:
+            match node:
+                case ast.ImportFrom():
+                    base = _resolve_relative(node.module, node.level, self.package)
+                    for alias in node.names:
+                        self.imports[alias.asname or alias.name] = (base, alias.name)
+                case ast.Import():
+                    for alias in node.names:
+                        name = alias.asname or alias.name.split(".")[0]
+                        self.imports[name] = (
+                            alias.name if alias.asname else name,
+                            None,
+                        )
+                case ast.Assign(
+                    targets=[ast.Name(id=router)],
+                    value=ast.Call(
+                        func=ast.Name(id=router_class)
+                        | ast.Attribute(attr=router_class)
+                    ),
+                ) if router_class in ROUTER_CLASSES:
+                    self.routers[router] = []
+                case ast.Expr(
+                    value=ast.Call(
+                        func=ast.Attribute(attr="register", value=ast.Name(id=router))
+                    )
+                ) if router in self.routers:
+                    call = node.value
+                    arguments = {
+                        keyword.arg: keyword.value for keyword in call.keywords
+                    }
+                    register_prefix = (
+                        call.args[0] if call.args else arguments.get("prefix")
+                    )
+                    view = (
+                        call.args[1] if len(call.args) > 1 else arguments.get("viewset")
+                    )
+                    if isinstance(register_prefix, ast.Constant) and view is not None:
+                        self.routers[router].append((register_prefix.value + "/", view))
+
+    def get_urlpatterns(self):
+        for node in self.tree.body:
+            match node:
+                case ast.Assign(targets=[ast.Name(id="urlpatterns")], value=value):
+                    yield self._get_patterns(value)
+                case ast.AugAssign(target=ast.Name(id="urlpatterns"), value=value):
+                    yield self._get_patterns(value)
+
+    def _get_patterns(self, node: ast.AST) -> List[ast.AST]:
+        match node:
+            case ast.List(elts=patterns) | ast.Tuple(elts=patterns):
+                return patterns
+            case ast.BinOp(op=ast.Add(), left=left, right=right):
+                return self._get_patterns(left) + self._get_patterns(right)
+            case ast.Attribute(attr="urls"):
+                return [node]
+        return []
+
+    def get_module(self, name: str, attribute: bool = False):
+        """Module defining `name`, or `name` itself if it's an imported module,
+        as a path like "app/views"."""
+        head, _, rest = name.partition(".")
+        if head not in self.imports:
+            return None
+        base, imported = self.imports[head]
+        module = (
+            ".".join(part for part in (base, imported, rest) if part)
+            if attribute
+            else base
+        )
+        if module.startswith(DJANGO_PACKAGES):
+            return None
+        return module.replace(".", "/")
+
+
+def resolve_routes(urls_path: str) -> RouteTable:
+    """Resolves every route reachable from the URLconf at `urls_path`, which
+    is expected to sit in a package at the root of the project."""
+    parts = urls_path.removesuffix(".py").split("/")
+    root_path = "/".join(parts[0:-2])
+    return URLConfResolver(root_path).resolve(".".join(parts[-2:]))
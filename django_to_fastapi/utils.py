@@ -1,7 +1,11 @@
 import ast
 import logging
+import subprocess
+import sys
+from collections import OrderedDict
+from hashlib import sha256
 from re import sub
-from typing import Callable, List, TypeVar
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
 
 from black import format_str, FileMode
 from option import NONE, Option, Some
@@ -10,6 +14,9 @@ from option import NONE, Option, Some
 # from pytype.pytd import visitors
 from termcolor import colored
 
+from django_to_fastapi.config import Config
+from django_to_fastapi.profiling import Profiler
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,6 +30,9 @@ class Logger:
 
     current_module = ""
     warns_counter = 0
+    # When set, messages are buffered as (level, message) instead of being
+    # logged, so a worker process can hand them back to the parent.
+    records: Optional[List[Tuple[int, str]]] = None
 
     @classmethod
     def format(cls, message: str, sample_code="", color="white", line=-1):
@@ -34,24 +44,96 @@ class Logger:
             + (f"\n```\n{sample_code}```" if sample_code else "")
         )
 
+    @classmethod
+    def log(cls, level: int, message: str):
+        if cls.records is None:
+            _logger.log(level, message)
+        else:
+            cls.records.append((level, message))
+
     @classmethod
     def print_info(cls, message: str, sample_code="", line=-1):
-        _logger.info(cls.format(message, sample_code=sample_code, line=line))
+        cls.log(logging.INFO, cls.format(message, sample_code=sample_code, line=line))
 
     @classmethod
     def print_warn(cls, message: str, sample_code="", line=-1):
-        _logger.warning(
-            cls.format(message, sample_code=sample_code, color="yellow", line=line)
+        cls.log(
+            logging.WARNING,
+            cls.format(message, sample_code=sample_code, color="yellow", line=line),
         )
         cls.warns_counter += 1
 
+    @classmethod
+    def replay(cls, records: List[Tuple[int, str]], warns: int):
+        for level, message in records:
+            cls.log(level, message)
+        cls.warns_counter += warns
+
+
+def read_file(path: str):
+    with open(path) as cursor:
+        return cursor.read()
+
+
+def write_file(path: str, content: str):
+    """Writes `content` unless the file already holds it, so its mtime only
+    moves when it actually changes. Returns whether the file was written."""
+    try:
+        if read_file(path) == content:
+            return False
+    except FileNotFoundError:
+        pass
+    with open(path, "w") as cursor:
+        cursor.write(content)
+    return True
+
+
+class Formatter:
+    """Formats emitted code according to `Config.formatter`:
+
+    - `none` leaves `ast.unparse` output as is,
+    - `black` runs black in-process,
+    - `batch` leaves code as is too, `format_files` is then expected to run
+      black once over every written file, using black's own file cache and
+      worker processes.
+
+    Formatted code is cached by hash, so identical code is formatted once. The
+    cache keeps the `max_entries` most recently used results, so it doesn't grow
+    with every edit in `--watch` mode.
+    """
+
+    cache: "OrderedDict[str, str]" = OrderedDict()
+    max_entries = 1024
+
+    @classmethod
+    def format(cls, source_code: str):
+        if Config.formatter != "black":
+            return source_code
+        key = sha256(source_code.encode()).hexdigest()
+        if key in cls.cache:
+            cls.cache.move_to_end(key)
+            return cls.cache[key]
+        with Profiler.stage("format"):
+            formatted = cls.cache[key] = format_str(source_code, mode=FileMode())
+        if len(cls.cache) > cls.max_entries:
+            cls.cache.popitem(last=False)
+        return formatted
+
+
+def format_files(paths: Sequence[str]):
+    if Config.formatter != "batch" or not paths:
+        return
+    subprocess.run([sys.executable, "-m", "black", "--quiet", *paths], check=True)
+
 
 def unparse(node: ast.AST):
-    return format_string(ast.unparse(node))
+    with Profiler.stage("unparse"):
+        source_code = ast.unparse(node)
+    return format_string(source_code)
 
 
 def format_string(source_code: str):
-    return format_str(source_code, mode=FileMode())
+    return Formatter.format(source_code)
 
 
 def to_snake_case(string: str):
@@ -2,7 +2,14 @@ import ast
 from dataclasses import dataclass
 from typing import List, Literal, Tuple, cast
 
-from django_to_fastapi.payloads import get_payload_inputs
+from django_to_fastapi.caching import (
+    get_cache_decorators,
+    get_class_cache_decorators,
+    remove_class_cache_decorators,
+    translate_method_decorators,
+)
+from django_to_fastapi.config import Config
+from django_to_fastapi.payloads import get_definition_name, get_payload_inputs
 from django_to_fastapi.routes import Route
 from django_to_fastapi.utils import class_name_to_function
 from django_to_fastapi.ast_operations import (
@@ -91,7 +98,9 @@ def get_function_route_method(node: ast.FunctionDef) -> HTTP_METHOD:
         next(
             decorator
             for decorator in node.decorator_list
-            if isinstance(decorator.func, ast.Name) and decorator.func.id == "api_view"
+            if isinstance(decorator, ast.Call)
+            and isinstance(decorator.func, ast.Name)
+            and decorator.func.id == "api_view"
         )
         .args[0]
         .elts[0]
@@ -114,6 +123,19 @@ def handle_inputs(inputs):
     return args, defaults
 
 
+def get_route_keywords(maybe_output_definition) -> List[ast.keyword]:
+    """`response_model` of a route with Pydantic payloads, serialized by
+    pydantic-core rather than FastAPI's generic encoder."""
+    if Config.payloads != "pydantic" or maybe_output_definition.is_none:
+        return []
+    return [
+        ast.keyword(
+            arg="response_model",
+            value=ast.Name(id=get_definition_name(maybe_output_definition.unwrap())),
+        )
+    ]
+
+
 class RemoveArgs(ast.NodeVisitor):
     def __init__(self, configuration: RouteConfiguration):
         self.configuration = configuration
@@ -136,8 +158,9 @@ class RemoveArgs(ast.NodeVisitor):
                         attr=self.configuration.method, value=ast.Name(id="router")
                     ),
                     args=[ast.Constant(value=self.configuration.path)],
-                    keywords=[],
-                )
+                    keywords=get_route_keywords(maybe_output_definition),
+                ),
+                *get_cache_decorators(node.decorator_list),
             ],
             returns=node.returns,
         )
@@ -252,7 +275,8 @@ class ClassToFunctions(ast.NodeTransformer):
                     keywords=[],
                 )
             ]
-            + cast(List[ast.Call], node.decorator_list)
+            + translate_method_decorators(node.decorator_list)
+            + get_class_cache_decorators(self.context.decorator_list, node.name)
             if is_route
             else node.decorator_list
         )
@@ -264,6 +288,7 @@ class ClassToFunctions(ast.NodeTransformer):
                 maybe_output_definition,
             ) = get_payload_inputs(node, self.route.view)
             args, defaults = handle_inputs(inputs)
+            decorator_list[0].keywords += get_route_keywords(maybe_output_definition)
 
             if maybe_payload_definition.is_some:
                 self.operations.append(
@@ -290,7 +315,7 @@ class ClassToFunctions(ast.NodeTransformer):
         new_node = ast.AsyncFunctionDef(
             name=self._get_route_function_name(node.name) if is_route else node.name,
             returns=(
-                maybe_output_definition.unwrap().targets[0]
+                ast.Name(id=get_definition_name(maybe_output_definition.unwrap()))
                 if maybe_output_definition.is_some
                 else None
             )
@@ -334,7 +359,8 @@ class ClassToClass(ast.NodeVisitor):
                     keywords=[],
                 )
             ]
-            + cast(List[ast.Call], node.decorator_list)
+            + translate_method_decorators(node.decorator_list)
+            + get_class_cache_decorators(self.class_decorators, node.name)
             if is_route
             else node.decorator_list
         )
@@ -346,6 +372,7 @@ class ClassToClass(ast.NodeVisitor):
                 maybe_output_definition,
             ) = get_payload_inputs(node, self.route.view)
             args, defaults = handle_inputs(inputs)
+            decorator_list[0].keywords += get_route_keywords(maybe_output_definition)
 
             if maybe_payload_definition.is_some:
                 self.operations.append(
@@ -394,8 +421,9 @@ class ClassToClass(ast.NodeVisitor):
 
     def transform(self, node):
         self.context = node
+        self.class_decorators = node.decorator_list
         node.decorator_list = [
-            *node.decorator_list,
+            *remove_class_cache_decorators(node.decorator_list),
             ast.Call(
                 func=ast.Name(id="cbv"),
                 args=[self.get_router_node()],
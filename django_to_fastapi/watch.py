@@ -0,0 +1,138 @@
+import os
+import time
+import traceback
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django_to_fastapi.config import Config
+from django_to_fastapi.migration import (
+    MigratedModule,
+    ProjectMigration,
+    get_module_path,
+)
+from django_to_fastapi.utils import Logger
+
+URLCONF = "urlconf"
+MODULE = "module"
+SETTINGS = "settings"
+MODELS = "models"
+
+
+def get_mtimes(paths: Sequence[str]) -> Dict[str, Optional[int]]:
+    """Modification time of each of `paths`, None for missing files."""
+    mtimes = {}
+    for file_path in paths:
+        try:
+            mtimes[file_path] = os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
+            mtimes[file_path] = None
+    return mtimes
+
+
+class Watcher:
+    """Keeps a `ProjectMigration` resident and migrates again what changes.
+
+    URLconfs, routed modules and settings are polled every `interval`
+    seconds, which is a few dozen `stat` calls for most projects. An edited
+    module is migrated alone; an edited URLconf resolves routes again and
+    migrates the modules whose routes changed, so `main.py` is only written
+    again when the set of routed modules does.
+    """
+
+    def __init__(self, project: ProjectMigration, interval: float = 0.1):
+        self.project = project
+        self.interval = interval
+        self.watched: Dict[str, Tuple[str, str]] = {}
+        self.mtimes: Dict[str, Optional[int]] = {}
+
+    def get_watched(self) -> Dict[str, Tuple[str, str]]:
+        resolver = self.project.resolver
+        watched = {
+            resolver.get_path(urls_module): (URLCONF, urls_module)
+            for urls_module in resolver.parsed
+        }
+        for module in self.project.routes.modules:
+            watched[get_module_path(self.project.root_path, module)] = (MODULE, module)
+        if Config.models == "sqlalchemy":
+            for module in self.project.get_models_modules():
+                watched[get_module_path(self.project.root_path, module)] = (
+                    MODELS,
+                    module,
+                )
+        watched[self.project.settings_path] = (SETTINGS, "")
+        return watched
+
+    def snapshot(self):
+        """Updates what is watched, files already watched keep the time they
+        were polled at so edits made while migrating are not missed."""
+        self.watched = self.get_watched()
+        mtimes = get_mtimes(
+            [file_path for file_path in self.watched if file_path not in self.mtimes]
+        )
+        self.mtimes = {
+            file_path: self.mtimes[file_path]
+            if file_path in self.mtimes
+            else mtimes[file_path]
+            for file_path in self.watched
+        }
+
+    def poll(self) -> List[Tuple[str, str]]:
+        """Kinds and names of what changed since the last poll."""
+        mtimes = get_mtimes(list(self.watched))
+        changes = [
+            self.watched[file_path]
+            for file_path, mtime in mtimes.items()
+            if mtime != self.mtimes[file_path]
+        ]
+        self.mtimes = mtimes
+        return changes
+
+    def sync(self, changes: Sequence[Tuple[str, str]]) -> List[MigratedModule]:
+        urlconfs = [name for kind, name in changes if kind == URLCONF]
+        if urlconfs:
+            self.project.resolve_routes(urlconfs)
+            # Routes may have moved between modules, the cache sorts it out.
+            migrated = self.project.run()
+        else:
+            migrated = self.project.run(
+                [name for kind, name in changes if kind == MODULE]
+            )
+        self.snapshot()
+        return migrated
+
+    def watch(self):
+        self.snapshot()
+        migrated = self.project.run()
+        print(
+            f"Migrated {len(migrated)} modules with {Logger.warns_counter} warnings,"
+            " watching for changes."
+        )
+        while True:
+            time.sleep(self.interval)
+            changes = self.poll()
+            if not changes:
+                continue
+
+            Logger.warns_counter = 0
+            # Set to each module as it is migrated.
+            Logger.current_module = ", ".join(name for _, name in changes)
+            start = time.perf_counter()
+            try:
+                migrated = self.sync(changes)
+            except SyntaxError as error:
+                # Likely a file saved halfway, it will be picked up once fixed.
+                Logger.print_warn(f"Could not parse: {error.msg}", line=error.lineno)
+                continue
+            except Exception as error:
+                # The codemod choking on a half-edited file shouldn't stop
+                # the watcher either.
+                Logger.print_warn(
+                    f"Could not migrate: {error!r}",
+                    sample_code=traceback.format_exc(),
+                    line=0,
+                )
+                continue
+            print(
+                f"Migrated {', '.join(m.module for m in migrated) or 'nothing'}"
+                f" in {(time.perf_counter() - start) * 1000:.0f}ms"
+                f" with {Logger.warns_counter} warnings."
+            )
@@ -2,9 +2,11 @@
 
 from distutils.core import setup
 
+from django_to_fastapi import __version__
+
 setup(
     name="DjangoToFastAPI",
-    version="0.1",
+    version=__version__,
     description="A Django to FastAPI Codemod",
     author="Laegel",
     author_email="laegel@tutanota.com",
@@ -71,3 +71,60 @@ def create_post(data: Payload):
     Runner.execute(root, operations)
 
     assert unparse(module) == expected
+
+
+def test_operations_ordering():
+    module = ast.parse("import os\nimport re\na = 1\nb = 2\nc = 3\n")
+    last_import, a, b, c = module.body[1:]
+    replacement = ast.parse("b = 20").body[0]
+
+    def statement(source: str):
+        return ast.parse(source).body[0]
+
+    Runner.execute(
+        module,
+        [
+            ASTOperation(
+                ASTOperationAction.InsertAfter,
+                {"target": last_import, "candidate": statement("import sys")},
+            ),
+            ASTOperation(
+                ASTOperationAction.InsertAfter,
+                {"target": last_import, "candidate": statement("import json")},
+            ),
+            ASTOperation(
+                ASTOperationAction.InsertBefore,
+                {"target": a, "candidate": statement("x = 1")},
+            ),
+            ASTOperation(
+                ASTOperationAction.InsertBefore,
+                {"target": a, "candidate": statement("y = 1")},
+            ),
+            ASTOperation(
+                ASTOperationAction.Replace, {"target": b, "candidate": replacement}
+            ),
+            ASTOperation(
+                ASTOperationAction.InsertAfter,
+                {"target": replacement, "candidate": statement("z = 1")},
+            ),
+            ASTOperation(ASTOperationAction.Remove, {"target": c}),
+            ASTOperation(
+                ASTOperationAction.InsertLast, {"target": statement("routers = []")}
+            ),
+        ],
+    )
+
+    assert ast.unparse(module) == "\n".join(
+        [
+            "import os",
+            "import re",
+            "import json",
+            "import sys",
+            "x = 1",
+            "y = 1",
+            "a = 1",
+            "b = 20",
+            "z = 1",
+            "routers = []",
+        ]
+    )
@@ -0,0 +1,98 @@
+import ast
+
+from django_to_fastapi.blocking import (
+    BlockingCalls,
+    BlockingCallsFinder,
+    get_imported_names,
+    handle_blocking_calls,
+)
+from django_to_fastapi.config import Config
+from django_to_fastapi.utils import unparse
+
+SOURCE_CODE = """import time
+from django.shortcuts import get_object_or_404
+
+router_product = InferringRouter(prefix="/products")
+
+
+@router.get("/products")
+async def products():
+    names = [product.name for product in Product.objects.filter(active=True)]
+    product = get_object_or_404(Product, pk=1)
+    product.save()
+    time.sleep(1)
+    return Product.objects.filter(active=True).first()
+
+
+@router.get("/ping")
+async def ping(request):
+    return request.data.get("query")
+"""
+
+
+def test_blocking_calls_finder():
+    module = ast.parse(SOURCE_CODE)
+    finder = BlockingCallsFinder(get_imported_names(module))
+
+    calls = finder.find(module.body[3])
+
+    assert [(call.kind, ast.unparse(call.node)) for call in calls] == [
+        ("orm", "Product.objects.filter(active=True)"),
+        ("orm", "get_object_or_404(Product, pk=1)"),
+        ("orm", "product.save()"),
+        ("sleep", "time.sleep(1)"),
+        ("orm", "Product.objects.filter(active=True).first()"),
+    ]
+    assert not BlockingCallsFinder({}).find(module.body[4])
+
+
+def test_handle_blocking_calls_as_sync(monkeypatch):
+    monkeypatch.setattr(Config, "blocking_calls", "sync")
+    monkeypatch.setattr(BlockingCalls, "records", [])
+    module = ast.parse(SOURCE_CODE)
+
+    assert not handle_blocking_calls(module)
+    assert isinstance(module.body[3], ast.FunctionDef)
+    assert isinstance(module.body[4], ast.AsyncFunctionDef)
+    (record,) = BlockingCalls.records
+    assert record["route"] == {"method": "get", "path": "/products"}
+    assert record["action"] == "sync"
+    assert len(record["calls"]) == 5
+
+
+def test_handle_blocking_calls_in_threadpool(monkeypatch):
+    monkeypatch.setattr(Config, "blocking_calls", "threadpool")
+    monkeypatch.setattr(BlockingCalls, "records", [])
+    module = ast.parse(SOURCE_CODE)
+
+    assert handle_blocking_calls(module)
+    assert unparse(module.body[3]) == (
+        '@router.get("/products")\n'
+        "async def products():\n"
+        "    names = [\n"
+        "        product.name\n"
+        "        for product in await run_in_threadpool(\n"
+        "            list, Product.objects.filter(active=True)\n"
+        "        )\n"
+        "    ]\n"
+        "    product = await run_in_threadpool(get_object_or_404, Product, pk=1)\n"
+        "    await run_in_threadpool(product.save)\n"
+        "    await run_in_threadpool(time.sleep, 1)\n"
+        "    return await run_in_threadpool(Product.objects.filter(active=True).first)\n"
+    )
+
+
+def test_blocking_helpers(monkeypatch):
+    monkeypatch.setattr(Config, "blocking_calls", "threadpool")
+    monkeypatch.setattr(BlockingCalls, "records", [])
+    module = ast.parse(
+        "import time\n\n"
+        "def wait():\n    time.sleep(1)\n\n"
+        "def wait_twice():\n    wait()\n    wait()\n\n"
+        "async def handler():\n    wait_twice()\n"
+    )
+
+    assert handle_blocking_calls(module)
+    assert unparse(module.body[3]) == (
+        "async def handler():\n    await run_in_threadpool(wait_twice)\n"
+    )
@@ -0,0 +1,206 @@
+import ast
+import asyncio
+import sys
+
+import pytest
+
+from django_to_fastapi.caching import (
+    ASYNC_CACHE_METHODS,
+    convert_cache_calls,
+    generate_cache_module,
+    generate_caching_module,
+    get_cache_decorators,
+    get_cache_names,
+    get_class_cache_decorators,
+    remove_class_cache_decorators,
+    translate_method_decorators,
+)
+from django_to_fastapi.dependencies import generate_dependencies_module
+from django_to_fastapi.modules import _clear_imports, _migrate, generate_entrypoint
+from django_to_fastapi.routes import Route
+from django_to_fastapi.utils import unparse
+
+
+def get_decorators(source: str):
+    return ast.parse(source + "\ndef view():\n    pass\n").body[0].decorator_list
+
+
+def dump(decorators):
+    return [unparse(decorator).strip() for decorator in decorators]
+
+
+def test_function_decorators():
+    decorators = get_decorators(
+        '@api_view(["GET"])\n@cache_page(60 * 15)\n@vary_on_headers("Accept")'
+    )
+    assert dump(get_cache_decorators(decorators)) == [
+        "cache_page(60 * 15)",
+        'vary_on_headers("Accept")',
+    ]
+
+
+def test_cache_page_above_api_view():
+    module = _migrate(
+        ast.parse(
+            "from django.views.decorators.cache import cache_page\n"
+            "from rest_framework.decorators import api_view\n\n\n"
+            "@cache_page(60)\n"
+            '@api_view(["GET"])\n'
+            "def posts(request):\n"
+            "    return Response([])\n"
+        ),
+        [Route(path="/posts", view="posts", module="blog/views")],
+    )
+    source = unparse(module)
+    assert '@router.get("/posts")\n@cache_page(60)\n' in source
+
+
+def test_method_decorators():
+    decorators = get_decorators(
+        "@method_decorator(cache_page(60))\n"
+        "@method_decorator([vary_on_cookie, login_required])\n"
+        "@permission_required"
+    )
+    assert dump(translate_method_decorators(decorators)) == [
+        "cache_page(60)",
+        "vary_on_cookie",
+        "permission_required",
+    ]
+
+
+def test_class_decorators():
+    decorators = get_decorators(
+        '@method_decorator(cache_page(60), name="dispatch")\n'
+        '@method_decorator(never_cache, name="post")\n'
+        "@other"
+    )
+    assert dump(get_class_cache_decorators(decorators, "get")) == ["cache_page(60)"]
+    assert dump(get_class_cache_decorators(decorators, "post")) == [
+        "cache_page(60)",
+        "never_cache",
+    ]
+    assert dump(remove_class_cache_decorators(decorators)) == ["other"]
+
+
+def test_cache_names():
+    module = ast.parse(
+        "@router.get('/')\n@cache_page(60)\n@never_cache\nasync def view():\n"
+        "    return cache_control\n"
+    )
+    assert get_cache_names([module]) == ["cache_page", "never_cache"]
+
+
+def test_caching_module():
+    entrypoint = generate_entrypoint(["app/views"])
+    assert entrypoint.index("app.include_router(router)") < entrypoint.index(
+        "install_cache(app)"
+    )
+    tree = ast.parse(generate_caching_module())
+    functions = {node.name for node in tree.body if isinstance(node, ast.FunctionDef)}
+    assert {"cache_page", "vary_on_headers", "install_cache", "get_stats"} <= functions
+
+
+def test_convert_cache_calls():
+    module = ast.parse(
+        "from django.core.cache import cache, caches\n"
+        "async def view():\n"
+        "    count = cache.get('count')\n"
+        "    caches['other'].set('count', count, 60)\n"
+        "    keys = list(key for key in cache.get_many(['a']))\n"
+        "    return other.get('count')\n"
+    )
+    convert_cache_calls(module)
+    assert unparse(_clear_imports(module)) == (
+        "from cache import cache, caches\n\n\n"
+        "async def view():\n"
+        '    count = await cache.aget("count")\n'
+        '    await caches["other"].aset("count", count, 60)\n'
+        '    keys = list((key for key in cache.get_many(["a"])))\n'
+        '    return other.get("count")\n'
+    )
+
+
+def test_cache_module(tmp_path):
+    namespace = {"__file__": str(tmp_path / "cache.py")}
+    exec(generate_cache_module(), namespace)
+    cache = namespace["SQLiteCache"]("default", str(tmp_path / "cache.sqlite3"))
+    assert {
+        method for method in ASYNC_CACHE_METHODS.values() if not hasattr(cache, method)
+    } == set()
+
+    cache.set("count", 1)
+    assert cache.get("count") == 1
+    assert not cache.add("count", 2)
+    assert cache.incr("count") == 2
+    cache.set("expired", 1, 0)
+    assert cache.get("expired", "missing") == "missing"
+    assert cache.add("expired", 2)
+
+    async def run():
+        await cache.aset("items", [1])
+        assert await cache.aget("items") == [1]
+        assert await cache.aget_or_set("computed", lambda: 3) == 3
+        assert await cache.adelete("items")
+        return await cache.aget_many(["count", "items", "computed"])
+
+    assert asyncio.run(run()) == {"count": 2, "computed": 3}
+    other = namespace["SQLiteCache"]("other", str(tmp_path / "cache.sqlite3"))
+    other.set("count", 5)
+    cache.clear()
+    assert cache.get("count") is None and other.get("count") == 5
+
+
+def test_cache_schema_off_the_loop(tmp_path):
+    namespace = {"__file__": str(tmp_path / "cache.py")}
+    exec(generate_cache_module(), namespace)
+    path = str(tmp_path / "cache.sqlite3")
+    cache = namespace["SQLiteCache"]("default", path)
+
+    async def read():
+        return await cache.aget("count", "missing")
+
+    # Before the schema is created, reads go through a thread.
+    assert asyncio.run(read()) == "missing"
+    assert getattr(cache.local, "connection", None) is None
+    assert path in namespace["_schemas"]
+
+    cache.close()
+    assert asyncio.run(read()) == "missing"
+    assert cache.local.connection.execute("PRAGMA busy_timeout").fetchone() == (5,)
+
+
+def test_cached_pages_vary_on_identity(tmp_path, monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi import Depends, FastAPI, Request
+    from fastapi.testclient import TestClient
+
+    (tmp_path / "dependencies.py").write_text(generate_dependencies_module())
+    (tmp_path / "caching.py").write_text(generate_caching_module())
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for module in ("dependencies", "caching"):
+        monkeypatch.delitem(sys.modules, module, raising=False)
+    import caching
+    import dependencies
+
+    def get_identity(request: Request):
+        return request.headers.get("authorization"), None
+
+    app = FastAPI()
+
+    @app.get("/me")
+    @caching.cache_page(60)
+    async def me(user=Depends(dependencies.get_user)):
+        return {"user": user}
+
+    app.dependency_overrides[dependencies.get_identity] = get_identity
+    caching.install_cache(app)
+    client = TestClient(app)
+
+    first = client.get("/me", headers={"Authorization": "Token first"})
+    second = client.get("/me", headers={"Authorization": "Token second"})
+    again = client.get("/me", headers={"Authorization": "Token first"})
+
+    assert first.json() == again.json() == {"user": "Token first"}
+    assert second.json() == {"user": "Token second"}
+    assert first.headers["vary"] == "Cookie, Authorization"
+    assert caching.get_stats()["routes"]["/me"] == {"hits": 1, "misses": 2}
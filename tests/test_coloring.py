@@ -0,0 +1,61 @@
+import ast
+
+from django_to_fastapi.coloring import AsyncColoring, color_functions
+from django_to_fastapi.utils import unparse
+
+SOURCE_CODE = """@router.get("/products")
+async def get_products():
+    return {"names": names(), "total": total(3), "sorted": sorted([], key=total)}
+
+
+async def names():
+    return [product.name async for product in fetch()]
+
+
+async def fetch():
+    return await query()
+
+
+async def total(count):
+    return double(count)
+
+
+async def double(count):
+    return count * 2
+
+
+class View:
+    async def query(self):
+        return await self.fetch()
+
+    async def fetch(self):
+        return self.cached
+"""
+
+
+def test_async_coloring():
+    colors = AsyncColoring(ast.parse(SOURCE_CODE)).color()
+
+    assert colors == {
+        "get_products": True,
+        "names": True,
+        "fetch": True,
+        "total": False,
+        "double": False,
+        "View.query": False,
+        "View.fetch": False,
+    }
+
+
+def test_color_functions():
+    module = color_functions(ast.parse(SOURCE_CODE))
+
+    assert unparse(module.body[0]) == (
+        '@router.get("/products")\n'
+        "async def get_products():\n"
+        '    return {"names": await names(), "total": total(3), "sorted": sorted([], key=total)}\n'
+    )
+    assert isinstance(module.body[3], ast.FunctionDef)
+    assert unparse(module.body[5].body[0]) == (
+        "def query(self):\n    return self.fetch()\n"
+    )
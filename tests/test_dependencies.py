@@ -0,0 +1,37 @@
+import ast
+
+from django_to_fastapi.dependencies import (
+    PROVIDERS,
+    generate_dependencies_module,
+    get_providers,
+)
+from django_to_fastapi.modules import FastAPIUtilsImports, _resolve_import
+from django_to_fastapi.utils import unparse
+
+
+def test_get_providers():
+    definition = ast.parse(
+        "async def me(user: Any = Depends(get_user), META: Any = Depends(get_META),"
+        " foo: Any = Depends(get_foo), db: Any = Depends(get_db)):\n"
+        "    return {}\n"
+    )
+    assert get_providers([definition]) == ["get_META", "get_user"]
+
+
+def test_providers_import():
+    assert _resolve_import(FastAPIUtilsImports.Auth) is None
+    assert (
+        unparse(_resolve_import(FastAPIUtilsImports.Auth, ["get_auth", "get_user"]))
+        == "from dependencies import get_auth, get_user\n"
+    )
+
+
+def test_dependencies_module():
+    tree = ast.parse(generate_dependencies_module())
+    functions = {
+        node.name
+        for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+    assert {"get_" + attribute for attribute in PROVIDERS} <= functions
+    assert {"startup", "shutdown"} <= functions
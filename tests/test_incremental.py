@@ -0,0 +1,57 @@
+from django_to_fastapi import incremental
+from django_to_fastapi.incremental import MigrationCache, get_relevant_routes
+from django_to_fastapi.routes import Route
+
+
+def test_get_relevant_routes():
+    routes = [Route(path="/posts", view="PostsView"), Route(path="/in", view="signin")]
+    source_code = "class PostsView(APIView):\n    ...\n"
+
+    assert get_relevant_routes(source_code, routes) == routes[0:1]
+
+
+def test_migration_cache(tmp_path):
+    output_path = tmp_path / "views.py"
+    output_path.write_text("migrated")
+    routes = [Route(path="/posts", view="PostsView")]
+    source_code = "class PostsView(APIView):\n    ...\n"
+
+    cache = MigrationCache(str(tmp_path / "cache.json"))
+    key = cache.get_module_key(source_code, routes)
+    assert not cache.is_fresh("app/views", key, str(output_path))
+
+    cache.update("app/views", key, "migrated", warns=2)
+    assert cache.has_entrypoint_changed(["app/views"])
+    cache.save()
+
+    cache = MigrationCache.load(str(tmp_path / "cache.json"))
+    assert cache.is_fresh("app/views", key, str(output_path))
+    assert cache.get_warns("app/views") == 2
+    assert not cache.has_entrypoint_changed(["app/views"])
+    assert not cache.is_fresh(
+        "app/views",
+        cache.get_module_key(source_code, [Route(path="/other", view="PostsView")]),
+        str(output_path),
+    )
+
+    output_path.write_text("edited by hand")
+    assert not cache.is_fresh("app/views", key, str(output_path))
+
+
+def test_migration_cache_of_another_revision(tmp_path, monkeypatch):
+    output_path = tmp_path / "views.py"
+    output_path.write_text("migrated")
+    cache = MigrationCache(str(tmp_path / "cache.json"))
+    key = cache.get_module_key("value = 1\n", [])
+    cache.update("app/views", key, "migrated", warns=0)
+    cache.save()
+
+    # The same `__version__`, with edited codemod modules.
+    monkeypatch.setattr(
+        incremental,
+        "get_codemod_version",
+        lambda: incremental.__version__ + "+edited",
+    )
+    assert cache.get_module_key("value = 1\n", []) != key
+    cache = MigrationCache.load(str(tmp_path / "cache.json"))
+    assert cache.modules == {}
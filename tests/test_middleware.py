@@ -0,0 +1,131 @@
+import ast
+
+from django_to_fastapi.middleware import (
+    generate_middleware_module,
+    get_custom_middleware,
+    get_middleware,
+    get_middleware_setup,
+    translate_middleware,
+)
+from django_to_fastapi.modules import RemoveImports, generate_bootstrap_module
+from django_to_fastapi.utils import unparse
+
+SETTINGS = """
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.middleware.gzip.GZipMiddleware",
+]
+MIDDLEWARE += ["project.middleware.TimingMiddleware"]
+"""
+
+MIDDLEWARE = """import time
+
+from django.http import HttpResponseForbidden, JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+
+
+class TimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = "X-Elapsed"
+
+    def __call__(self, request):
+        start = time.monotonic()
+        response = self.get_response(request)
+        response[self.header] = str(time.monotonic() - start)
+        return response
+
+
+class BlockMiddleware(MiddlewareMixin):
+    def process_request(self, request):
+        if request.META.get("HTTP_X_BLOCKED"):
+            return HttpResponseForbidden()
+
+
+class TagMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.tag = "tagged"
+        return self.get_response(request)
+"""
+
+
+def test_get_middleware():
+    assert get_middleware(SETTINGS) == [
+        "django.middleware.security.SecurityMiddleware",
+        "django.middleware.gzip.GZipMiddleware",
+        "project.middleware.TimingMiddleware",
+    ]
+    assert get_custom_middleware(get_middleware(SETTINGS)) == {
+        "project/middleware": ["TimingMiddleware"]
+    }
+
+
+def test_middleware_order():
+    imports, calls = get_middleware_setup(get_middleware(SETTINGS))
+    assert "from project.middleware import TimingMiddleware" in imports
+    # The first entry is added last, Starlette makes it the outermost.
+    assert calls == [
+        "app.add_middleware(TimingMiddleware)",
+        "app.add_middleware(GZipMiddleware, minimum_size=200)",
+        "app.add_middleware(asgi_middleware.SecurityMiddleware)",
+    ]
+    bootstrap = generate_bootstrap_module(get_middleware(SETTINGS))
+    assert "app.add_middleware(TimingMiddleware)" in bootstrap
+    assert "add_middleware" not in generate_bootstrap_module()
+
+
+def test_translate_middleware():
+    module = RemoveImports().visit(
+        translate_middleware(
+            MIDDLEWARE, ["TimingMiddleware", "BlockMiddleware", "TagMiddleware"]
+        )
+    )
+    assert unparse(module) == unparse(
+        ast.parse(
+            """import time
+from asgi_middleware import HTTPMiddleware, HttpResponseForbidden, JsonResponse
+
+
+class TimingMiddleware(HTTPMiddleware):
+    def __init__(self, app):
+        super().__init__(app)
+        self.header = "X-Elapsed"
+
+    def process_request(self, request):
+        request.state.start = time.monotonic()
+
+    def process_response(self, request, response):
+        response[self.header] = str(time.monotonic() - request.state.start)
+        return response
+
+
+class BlockMiddleware(HTTPMiddleware):
+    def process_request(self, request):
+        if request.META.get("HTTP_X_BLOCKED"):
+            return HttpResponseForbidden()
+
+
+class TagMiddleware(HTTPMiddleware):
+    def process_request(self, request):
+        request.state.tag = "tagged"
+"""
+        )
+    )
+
+
+def test_generate_middleware_module():
+    module = ast.parse(generate_middleware_module())
+    names = {node.name for node in module.body if hasattr(node, "name")}
+    assert {
+        "HTTPMiddleware",
+        "SecurityMiddleware",
+        "XFrameOptionsMiddleware",
+        "get_allowed_hosts",
+        "get_cors_options",
+        "HttpResponseForbidden",
+    } <= names
@@ -0,0 +1,93 @@
+from django_to_fastapi.migration import ProjectMigration, migrate_modules
+from django_to_fastapi.modules import get_lazy_groups
+from django_to_fastapi.profiling import Profiler
+from django_to_fastapi.routes import Route, RouteTable
+
+
+def test_migrate_modules_in_parallel(tmp_path):
+    modules = ["app/small", "app/big", "other/views"]
+    for index, module in enumerate(modules):
+        path = tmp_path / (module + ".py")
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(
+            "from re import sub\n" + "value = 1\n" * (index * 10)
+        )
+
+    serial = list(migrate_modules(str(tmp_path), modules, []))
+    parallel = list(migrate_modules(str(tmp_path), modules, [], jobs=2))
+
+    assert [migrated.module for migrated in parallel] == modules
+    assert [migrated.source_code for migrated in parallel] == [
+        migrated.source_code for migrated in serial
+    ]
+
+
+def test_migrate_modules_with_profiler(tmp_path, monkeypatch):
+    monkeypatch.setattr(Profiler, "enabled", True)
+    (tmp_path / "views.py").write_text("from re import sub\n")
+
+    (migrated,) = migrate_modules(str(tmp_path), ["views"], [])
+
+    assert {"parse", "migrate", "import clearing", "unparse"} <= set(
+        migrated.profile.stages
+    )
+    assert migrated.profile.ast_operations == 1
+
+
+def test_same_view_name_in_two_apps(tmp_path):
+    view = (
+        "from rest_framework.decorators import api_view\n\n\n"
+        '@api_view(["GET"])\n'
+        "def index(request):\n"
+        '    return Response("ok")\n'
+    )
+    for app in ("blog", "shop"):
+        (tmp_path / app).mkdir()
+        (tmp_path / app / "views.py").write_text(view)
+    routes = RouteTable(
+        [
+            Route(path="/blog/", view="index", module="blog/views"),
+            Route(path="/shop/", view="index", module="shop/views"),
+        ]
+    )
+
+    blog, shop = migrate_modules(str(tmp_path), ["blog/views", "shop/views"], routes)
+
+    assert '@router.get("/blog/")' in blog.source_code
+    assert '@router.get("/shop/")' in shop.source_code
+    assert get_lazy_groups(["blog/views", "shop/views"], routes) == (
+        [],
+        {"/blog": ["blog/views"], "/shop": ["shop/views"]},
+    )
+
+
+def test_cache_module_only_when_used(tmp_path):
+    for directory in ("project", "blog"):
+        (tmp_path / directory).mkdir()
+    (tmp_path / "project" / "urls.py").write_text(
+        "from django.urls import path\n"
+        "from blog.views import posts\n\n"
+        'urlpatterns = [path("posts", posts)]\n'
+    )
+    (tmp_path / "project" / "settings.py").write_text("DEBUG = True\n")
+    view = (
+        "from rest_framework.decorators import api_view\n\n\n"
+        '@api_view(["GET"])\n'
+        "def posts(request):\n"
+        "    return {}\n"
+    )
+    (tmp_path / "blog" / "views.py").write_text(view)
+    destination = tmp_path / "output"
+    project = ProjectMigration(str(tmp_path / "project" / "urls.py"), str(destination))
+
+    project.run()
+    assert not (destination / "cache.py").exists()
+    assert "cache.startup()" not in (destination / "bootstrap.py").read_text()
+
+    (tmp_path / "blog" / "views.py").write_text(
+        "from django.core.cache import cache\n"
+        + view.replace("return {}", 'return {"count": cache.get("count")}')
+    )
+    project.run()
+    assert (destination / "cache.py").exists()
+    assert "await cache.startup()" in (destination / "bootstrap.py").read_text()
@@ -0,0 +1,120 @@
+from django_to_fastapi.models import generate_database_module, translate_models
+
+MODELS = """from django.db import models
+
+
+class Category(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+
+class Product(models.Model):
+    name = models.CharField(max_length=200, db_index=True)
+    category = models.ForeignKey(Category, null=True, on_delete=models.SET_NULL)
+    tags = models.ManyToManyField("tags.Tag")
+
+    class Meta:
+        db_table = "products"
+
+    def __str__(self):
+        return self.name
+"""
+
+TAGS = """from django.db import models
+
+
+class Tag(models.Model):
+    label = models.SlugField()
+"""
+
+
+def test_translate_models():
+    translated = translate_models({"shop": MODELS, "tags": TAGS})
+
+    assert translated["shop"] == (
+        "from typing import List, Optional\n"
+        "from sqlalchemy import Column, ForeignKey, Integer, String, Table\n"
+        "from sqlalchemy.orm import Mapped, mapped_column, relationship\n"
+        "from database import Base\n"
+        "\n"
+        "\n"
+        "class Category(Base):\n"
+        '    __tablename__ = "shop_category"\n'
+        "    id: Mapped[int] = mapped_column(primary_key=True)\n"
+        "    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)\n"
+        "\n"
+        "\n"
+        "product_tags = Table(\n"
+        '    "products_tags",\n'
+        "    Base.metadata,\n"
+        '    Column("id", Integer, primary_key=True),\n'
+        '    Column("product_id", ForeignKey("products.id"), nullable=False),\n'
+        '    Column("tag_id", ForeignKey("tags_tag.id"), nullable=False),\n'
+        ")\n"
+        "\n"
+        "\n"
+        "class Product(Base):\n"
+        '    __tablename__ = "products"\n'
+        "    id: Mapped[int] = mapped_column(primary_key=True)\n"
+        "    name: Mapped[str] = mapped_column(String(200), index=True, nullable=False)\n"
+        "    category_id: Mapped[Optional[int]] = mapped_column(\n"
+        '        ForeignKey("shop_category.id", ondelete="SET NULL"), nullable=True\n'
+        "    )\n"
+        '    category: Mapped[Optional["Category"]] = relationship(\n'
+        '        foreign_keys="Product.category_id"\n'
+        "    )\n"
+        '    tags: Mapped[List["Tag"]] = relationship(secondary=product_tags)\n'
+        "\n"
+        "    def __str__(self):\n"
+        "        return self.name\n"
+    )
+    assert "label: Mapped[str] = mapped_column(String(50)" in translated["tags"]
+
+
+ORDERS = """from django.db import models
+
+
+class Order(models.Model):
+    uuid = models.UUIDField(primary_key=True)
+    reference = models.CharField(max_length=20, unique=True)
+
+
+class Line(models.Model):
+    order = models.ForeignKey(Order, on_delete=models.CASCADE)
+    order_reference = models.ForeignKey(
+        Order, to_field="reference", on_delete=models.CASCADE
+    )
+    related = models.ManyToManyField(Order)
+"""
+
+
+def test_foreign_keys_reference_the_target_key():
+    translated = translate_models({"orders": ORDERS})["orders"]
+
+    assert "from uuid import UUID\n" in translated
+    assert (
+        "    order_id: Mapped[UUID] = mapped_column(\n"
+        '        ForeignKey("orders_order.uuid", ondelete="CASCADE"), nullable=False\n'
+        "    )\n"
+    ) in translated
+    assert (
+        "    order_reference_id: Mapped[str] = mapped_column(\n"
+        '        ForeignKey("orders_order.reference", ondelete="CASCADE"), nullable=False\n'
+        "    )\n"
+    ) in translated
+    assert (
+        'Column("line_id", ForeignKey("orders_line.id"), nullable=False)' in translated
+    )
+    assert (
+        'Column("order_id", ForeignKey("orders_order.uuid"), nullable=False)'
+        in translated
+    )
+
+
+def test_generate_database_module():
+    source_code = generate_database_module(["shop/sa_models"])
+
+    assert 'MODELS_MODULES = ["shop.sa_models"]' in source_code
+    assert (
+        'if conn_max_age == 0 and not getenv("DATABASE_POOL_RECYCLE"):' in source_code
+    )
+    assert "async def get_session() -> AsyncIterator[AsyncSession]:" in source_code
@@ -1,6 +1,17 @@
 import ast
 
-from django_to_fastapi.modules import _clear_imports
+from django_to_fastapi.config import Config
+from django_to_fastapi.modules import (
+    FastAPIUtilsImports,
+    _clear_imports,
+    _resolve_import,
+    generate_bootstrap_module,
+    generate_entrypoint,
+    generate_gunicorn_config,
+    generate_server_module,
+    get_lazy_groups,
+)
+from django_to_fastapi.routes import Route
 from django_to_fastapi.utils import unparse
 from tests.conftest import get_fixture
 
@@ -10,3 +21,84 @@ def test_clear_imports():
 
     source_tree = ast.parse(definition)
     assert unparse(_clear_imports(source_tree)) == "from conf import settings\nfrom re import sub\n"
+
+
+def test_response_class(monkeypatch):
+    assert "default_response_class" not in generate_bootstrap_module()
+
+    monkeypatch.setattr(Config, "responses", "orjson")
+    bootstrap = generate_bootstrap_module()
+    assert "from fastapi.responses import ORJSONResponse" in bootstrap
+    assert "FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)" in bootstrap
+    assert (
+        unparse(_resolve_import(FastAPIUtilsImports.Responses))
+        == "from fastapi.responses import ORJSONResponse\n"
+    )
+
+    monkeypatch.setattr(Config, "responses", "fast")
+    assert (
+        unparse(_resolve_import(FastAPIUtilsImports.Responses))
+        == "from fast_json import FastJSONResponse\n"
+    )
+
+
+def test_server_options(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("LIMIT_CONCURRENCY", "100")
+    monkeypatch.setenv("LOOP", "uvloop")
+    server = {}
+    exec(generate_server_module(), server)
+
+    options = server["get_options"]()
+    assert options["workers"] == 3
+    assert options["limit_concurrency"] == 100
+    assert options["loop"] == "uvloop"
+    assert options["timeout_keep_alive"] == 5
+    assert server["get_options"](reload=True)["workers"] is None
+    # uvicorn's worker options are extended rather than replaced.
+    assert "**BaseUvicornWorker.CONFIG_KWARGS," in generate_server_module()
+
+
+def test_preload(monkeypatch):
+    assert "gc.freeze()" not in generate_entrypoint(["app/views"])
+    assert "preload_app" not in generate_gunicorn_config()
+
+    monkeypatch.setattr(Config, "preload", True)
+    entrypoint = generate_entrypoint(["app/views"])
+    assert entrypoint.index("app.include_router(router)") < entrypoint.index(
+        "gc.freeze()"
+    )
+    config = generate_gunicorn_config()
+    assert "preload_app = True" in config
+    assert "def post_fork(server, worker):\n    gc.enable()" in config
+
+
+def test_lazy_groups(monkeypatch):
+    routes = [
+        Route(path="/products", view="products", module="shop/views"),
+        Route(path="/{slug}/page", view="page", module="pages/views"),
+        Route(path="/products/{pk}/page", view="product_page", module="pages/views"),
+        Route(path="/ping", view="ping", module="shop/views"),
+        # Migrated under its first route only.
+        Route(path="/again", view="ping", module="shop/views"),
+    ]
+
+    assert get_lazy_groups(["shop/views", "pages/views"], routes) == (
+        ["pages/views"],
+        {"/products": ["shop/views", "pages/views"], "/ping": ["shop/views"]},
+    )
+
+    monkeypatch.setattr(Config, "entrypoint", "lazy")
+    entrypoint = generate_entrypoint(["shop/views", "pages/views"], routes)
+    # /ping/page is served by pages/views.
+    assert 'sub_app_0 = LazyApp(["shop.views", "pages.views"])' in entrypoint
+    assert '{"/products": sub_app_0, "/ping": sub_app_0}' in entrypoint
+
+
+def test_static_routes(monkeypatch):
+    assert "install_static_routes" not in generate_bootstrap_module()
+
+    monkeypatch.setattr(Config, "static_routes", True)
+    bootstrap = generate_bootstrap_module()
+    assert "from static_routes import install_static_routes" in bootstrap
+    assert "    install_static_routes(app)\n    return app" in bootstrap
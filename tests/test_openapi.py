@@ -0,0 +1,76 @@
+import ast
+
+from django_to_fastapi.openapi import generate_openapi, generate_openapi_module
+
+VIEWS = """from fastapi_restful.cbv import cbv
+from fastapi_restful.inferring_router import InferringRouter
+from pydantic import BaseModel, Field
+
+router = InferringRouter()
+PayloadInputCreate = TypedDict("PayloadInputCreate", {"title": Optional[Any]})
+
+
+class PayloadOutputCreate(BaseModel):
+    id: int
+    page_size: Optional[int] = Field(10, alias="page-size")
+
+
+@router.post("/posts", response_model=PayloadOutputCreate)
+async def create(
+    request: Request,
+    data: PayloadInputCreate,
+    background_tasks: BackgroundTasks,
+    user: Any = Depends(get_user),
+):
+    return {"id": 1}
+
+
+router_post = InferringRouter(prefix="/posts/{pk}")
+
+
+@cbv(router_post)
+class Post:
+    @router_post.get("/")
+    async def get(self, pk: str, response: Response, draft: Optional[str] = None):
+        return "post"
+
+
+routers = [router, router_post]
+"""
+
+
+def test_generate_openapi():
+    schema = generate_openapi({"blog/views": VIEWS})
+
+    create = schema["paths"]["/posts"]["post"]
+    assert create["operationId"] == "create_posts_post"
+    assert "parameters" not in create
+    assert create["requestBody"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/PayloadInputCreate"
+    }
+    assert create["responses"]["200"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/PayloadOutputCreate"
+    }
+
+    get = schema["paths"]["/posts/{pk}/"]["get"]
+    assert get["operationId"] == "get_posts__pk___get"
+    assert [
+        (parameter["name"], parameter["in"], parameter["required"])
+        for parameter in get["parameters"]
+    ] == [("pk", "path", True), ("draft", "query", False)]
+
+    components = schema["components"]["schemas"]
+    assert components["PayloadInputCreate"]["required"] == ["title"]
+    assert components["PayloadOutputCreate"]["required"] == ["id"]
+    assert components["PayloadOutputCreate"]["properties"]["page-size"] == {
+        "anyOf": [{"type": "integer"}, {"type": "null"}],
+        "title": "Page Size",
+        "default": 10,
+    }
+    assert "HTTPValidationError" in components
+
+
+def test_generate_openapi_module():
+    source_code = generate_openapi_module(["blog/views"])
+    ast.parse(source_code)
+    assert 'MODULES = ["blog.views"]' in source_code
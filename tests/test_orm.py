@@ -0,0 +1,79 @@
+import ast
+
+from django_to_fastapi.blocking import BlockingCalls, handle_blocking_calls
+from django_to_fastapi.config import Config
+from django_to_fastapi.modules import _clear_imports
+from django_to_fastapi.orm import convert_to_async_orm
+from django_to_fastapi.utils import unparse
+
+SOURCE_CODE = """from django.shortcuts import get_object_or_404, render
+from shop.models import Product
+
+
+async def update_products(pk):
+    product = get_object_or_404(Product, pk=pk)
+    product.price = Product.objects.filter(active=True).first().price
+    product.save()
+    for other in Product.objects.exclude(pk=pk):
+        other.delete()
+    created, _ = Product.objects.get_or_create(name="new")
+    created.save()
+    names = [product.name for product in Product.objects.all()]
+    total = sum(product.price for product in Product.objects.all())
+    serializer.save()
+    return len(Product.objects.all()), names, total
+"""
+
+
+def test_convert_to_async_orm():
+    module = ast.parse(SOURCE_CODE)
+
+    assert convert_to_async_orm(module) == ["aget_object_or_404"]
+    assert unparse(module.body[2]) == (
+        "async def update_products(pk):\n"
+        "    product = await aget_object_or_404(Product, pk=pk)\n"
+        "    product.price = (await Product.objects.filter(active=True).afirst()).price\n"
+        "    await product.asave()\n"
+        "    async for other in Product.objects.exclude(pk=pk):\n"
+        "        await other.adelete()\n"
+        '    created, _ = await Product.objects.aget_or_create(name="new")\n'
+        "    await created.asave()\n"
+        "    names = [product.name async for product in Product.objects.all()]\n"
+        "    total = sum((product.price for product in Product.objects.all()))\n"
+        "    serializer.save()\n"
+        "    return (await Product.objects.all().acount(), names, total)\n"
+    )
+
+
+def test_clear_imports_keeps_async_shortcuts():
+    module = ast.parse(
+        "from django.shortcuts import aget_object_or_404, render\n"
+        "from django.http import Http404\n"
+    )
+
+    assert unparse(_clear_imports(module)) == (
+        "from django.shortcuts import aget_object_or_404\n"
+    )
+
+
+def test_transactions_stay_synchronous(monkeypatch):
+    monkeypatch.setattr(Config, "blocking_calls", "sync")
+    monkeypatch.setattr(BlockingCalls, "records", [])
+    source_code = (
+        "from django.db import models, transaction\n"
+        "from shop.models import Product\n\n\n"
+        "async def publish(pk):\n"
+        "    with transaction.atomic():\n"
+        "        product = Product.objects.get(pk=pk)\n"
+        "        product.save()\n"
+        "    return Product.objects.count()\n"
+    )
+    module = ast.parse(source_code)
+
+    convert_to_async_orm(module)
+    assert unparse(module) == unparse(ast.parse(source_code))
+    handle_blocking_calls(module)
+    assert isinstance(module.body[2], ast.FunctionDef)
+    assert unparse(_clear_imports(module)).startswith(
+        "from django.db import transaction\n"
+    )
@@ -0,0 +1,170 @@
+import ast
+
+from django_to_fastapi.config import Config
+from django_to_fastapi.modules import _migrate
+from django_to_fastapi.pagination import (
+    generate_pagination_module,
+    get_default_pagination_class,
+    translate_pagination,
+)
+from django_to_fastapi.routes import Route
+from django_to_fastapi.utils import unparse
+
+VIEWS = """from django.core.paginator import Paginator
+from rest_framework.generics import GenericAPIView
+from rest_framework.pagination import PageNumberPagination
+
+
+class ItemPagination(PageNumberPagination):
+    page_size = 50
+
+
+class ItemList(APIView):
+    pagination_class = ItemPagination
+
+    def get(self, request):
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(Item.objects.all(), request, view=self)
+        return paginator.get_paginated_response([item.name for item in page])
+
+
+class ItemGenericList(GenericAPIView):
+    def get(self, request):
+        page = self.paginate_queryset(Item.objects.all())
+        return self.get_paginated_response([item.name for item in page])
+
+
+def item_pages(request):
+    paginator = Paginator(Item.objects.all(), 25)
+    page = paginator.page(2)
+    return Response({"count": paginator.count, "results": list(page)})
+"""
+
+
+def test_translate_pagination():
+    module = ast.parse(VIEWS)
+    (pagination_import,) = translate_pagination(module)
+    assert pagination_import.module == "pagination"
+    assert [alias.name for alias in pagination_import.names] == [
+        "PageNumberPagination",
+        "Paginator",
+    ]
+    assert unparse(module) == unparse(
+        ast.parse(
+            """from django.core.paginator import Paginator
+from rest_framework.generics import GenericAPIView
+from rest_framework.pagination import PageNumberPagination
+
+
+class ItemPagination(PageNumberPagination):
+    page_size = 50
+
+
+class ItemList(APIView):
+    pagination_class = ItemPagination
+
+    def get(self, request):
+        paginator = ItemPagination()
+        page = await paginator.paginate_queryset(Item.objects.all(), request)
+        return paginator.get_paginated_response([item.name for item in page])
+
+
+class ItemGenericList(GenericAPIView):
+    def get(self, request):
+        paginator = PageNumberPagination()
+        page = await paginator.paginate_queryset(Item.objects.all(), request)
+        return paginator.get_paginated_response([item.name for item in page])
+
+
+def item_pages(request):
+    paginator = Paginator(Item.objects.all(), 25)
+    page = await paginator.apage(2)
+    return Response({"count": await paginator.acount(), "results": list(page)})
+"""
+        )
+    )
+
+
+def test_without_pagination():
+    module = ast.parse("def view(request):\n    return Response(paginate(request))\n")
+    assert translate_pagination(module) == []
+
+
+GENERIC_VIEW = """from rest_framework.generics import GenericAPIView
+
+
+class ItemList(GenericAPIView):
+    def get(self, request):
+        page = self.paginate_queryset(Item.objects.all())
+        return self.get_paginated_response(list(page))
+"""
+
+
+def test_default_pagination_class(monkeypatch):
+    assert (
+        get_default_pagination_class(
+            "REST_FRAMEWORK = {\n"
+            '    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",\n'
+            '    "PAGE_SIZE": 20,\n'
+            "}\n"
+        )
+        == "rest_framework.pagination.LimitOffsetPagination"
+    )
+    assert get_default_pagination_class("DEBUG = True\n") is None
+
+    module = ast.parse(GENERIC_VIEW)
+    (pagination_import,) = translate_pagination(module)
+    assert [alias.name for alias in pagination_import.names] == ["PageNumberPagination"]
+
+    monkeypatch.setattr(
+        Config,
+        "default_pagination_class",
+        "rest_framework.pagination.LimitOffsetPagination",
+    )
+    module = _migrate(
+        ast.parse(GENERIC_VIEW),
+        [Route(path="/items", view="ItemList", module="shop/views")],
+    )
+    source = unparse(module)
+    assert "from pagination import LimitOffsetPagination" in source
+    assert "paginator = LimitOffsetPagination()" in source
+    assert "await paginator.paginate_queryset(" in source
+
+    module = ast.parse(GENERIC_VIEW)
+    (project_import,) = translate_pagination(module, "shop.pagination.ItemPagination")
+    assert project_import.module == "shop.pagination"
+    assert [alias.name for alias in project_import.names] == ["ItemPagination"]
+
+
+def test_migrated_view_has_request():
+    module = _migrate(
+        ast.parse(
+            "from rest_framework.pagination import CursorPagination\n"
+            "from rest_framework.decorators import api_view\n\n"
+            '@api_view(["GET"])\n'
+            "def items(request):\n"
+            "    paginator = CursorPagination()\n"
+            "    page = paginator.paginate_queryset(Item.objects.all(), request)\n"
+            "    return paginator.get_paginated_response(list(page))\n"
+        ),
+        [Route(path="/items", view="items", module="shop/views")],
+    )
+    source = unparse(module)
+    assert "from pagination import CursorPagination" in source
+    assert "async def items(request: Request):" in source
+
+
+def test_generate_pagination_module():
+    source_code = generate_pagination_module()
+    # Approximate counts are opt-in, `count` stays DRF's by default.
+    assert 'PAGINATION_COUNT = getenv("PAGINATION_COUNT", "exact")' in source_code
+    module = ast.parse(source_code)
+    names = {node.name for node in module.body if hasattr(node, "name")}
+    assert {
+        "CursorPagination",
+        "LimitOffsetPagination",
+        "PageNumberPagination",
+        "Paginator",
+        "seek",
+        "approximate_count",
+    } <= names
@@ -3,7 +3,8 @@ import ast
 from option import NONE, Some
 import pytest
 
-from django_to_fastapi.payloads import get_payload_inputs
+from django_to_fastapi.config import Config
+from django_to_fastapi.payloads import RequestAccessIndex, get_payload_inputs
 from django_to_fastapi.utils import unparse
 from tests.conftest import get_first_node
 
@@ -41,6 +42,10 @@ from tests.conftest import get_first_node
             """data = request.data""",
             [("data", NONE, Some(ast.Name(id="PayloadInputMyView")))],
         ),
+        (
+            """page = paginator.paginate_queryset(items, request)""",
+            [("request", NONE, Some(ast.Name(id="Request")))],
+        ),
     ],
 )
 def test_get_payload_inputs(definition: str, expected):
@@ -78,4 +83,99 @@ def test_get_payload_outputs():
     _, _, payload_output = get_payload_inputs(node)
 
     assert payload_output.unwrap().targets[0].id == "PayloadOutputMyView"
-    assert payload_output.unwrap().value.id == "str"
\ No newline at end of file
+    assert payload_output.unwrap().value.id == "str"
+
+
+def test_request_access_index():
+    definition = """def my_view(request):
+    title = request.data.get("title")
+    if request.query_params.get("draft"):
+        user = request.user
+    return Response(title)
+    """
+
+    node = get_first_node(definition)
+    accesses = list(RequestAccessIndex(node))
+
+    assert [access.attr for access in accesses] == ["data", "query_params", "user", None]
+    assert [type(access.statement) for access in accesses] == [
+        ast.Assign,
+        ast.If,
+        ast.Assign,
+        ast.Return,
+    ]
+    assert accesses[0].chain[-1] is node
+
+
+def test_get_payload_inputs_on_deep_expressions():
+    operand = 'request.query_params.get("offset")'
+    definition = f"""def my_view():
+    total = {" + ".join([operand] * 800)}
+    """
+
+    inputs, _, _ = get_payload_inputs(get_first_node(definition))
+
+    assert [name for (name, _, _) in inputs] == ["offset"]
+
+
+def test_get_payload_outputs_response_class(monkeypatch):
+    monkeypatch.setattr(Config, "responses", "fast")
+    definition = """def my_view():
+    return Response({"id": 1}, status=status.HTTP_201_CREATED)
+    """
+
+    module = ast.parse(definition)
+    get_payload_inputs(module.body[0])
+
+    assert unparse(module.body[0].body[0]) == (
+        'return FastJSONResponse({"id": 1}, status_code=status.HTTP_201_CREATED)\n'
+    )
+
+
+def test_get_payload_models(monkeypatch):
+    monkeypatch.setattr(Config, "payloads", "pydantic")
+    definition = """def my_view(request):
+    title = request.data.get("title")
+    size = request.data.get("page-size", 10)
+    label = request.data.get("label", DEFAULT)
+    save(request.data)
+    if not title:
+        return Response({"error": "title"}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"title": title, "ok": True, "class": f"{label}"})
+    """
+
+    node = get_first_node(definition)
+    _, payload_input, payload_output = get_payload_inputs(node)
+
+    assert unparse(ast.fix_missing_locations(payload_input.unwrap())) == (
+        "class PayloadInputMyView(BaseModel):\n"
+        '    model_config = ConfigDict(extra="allow")\n'
+        "    title: Optional[Any] = None\n"
+        '    page_size: Optional[int] = Field(10, alias="page-size")\n'
+        "    label: Optional[Any] = None\n"
+    )
+    assert unparse(ast.fix_missing_locations(payload_output.unwrap())) == (
+        "class PayloadOutputMyView(BaseModel):\n"
+        "    title: Any\n"
+        "    ok: bool\n"
+        '    field_class: str = Field(alias="class")\n'
+    )
+    assert unparse(node).splitlines()[1:5] == [
+        "    title = data.title",
+        "    size = data.page_size",
+        '    label = data.label if "label" in data.model_fields_set else DEFAULT',
+        "    save(data.model_dump(by_alias=True))",
+    ]
+
+
+def test_get_payload_models_without_output(monkeypatch):
+    monkeypatch.setattr(Config, "payloads", "pydantic")
+    definition = """def my_view(request):
+    if request.query_params.get("raw"):
+        return serializer.data
+    return Response({"id": 1})
+    """
+
+    _, _, payload_output = get_payload_inputs(get_first_node(definition))
+
+    assert payload_output.is_none
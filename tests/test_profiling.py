@@ -0,0 +1,108 @@
+import pstats
+import time
+import tracemalloc
+
+import pytest
+
+from django_to_fastapi.__main__ import parse_args
+from django_to_fastapi.profiling import ModuleProfile, Profiler, ProfileReport
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    for name, value in Profiler.settings().items():
+        monkeypatch.setattr(Profiler, name, value)
+    monkeypatch.setattr(Profiler, "current", None)
+    monkeypatch.setattr(Profiler, "frames", [])
+    tracing = tracemalloc.is_tracing()
+    yield Profiler
+    if not tracing:
+        tracemalloc.stop()
+
+
+def test_stage_timing(profiler):
+    profiler.configure(enabled=True)
+    profiler.start("blog/views")
+    with profiler.stage("migrate"):
+        time.sleep(0.01)
+        with profiler.stage("async orm"):
+            time.sleep(0.05)
+            data = [0] * 100_000
+        with profiler.stage("async orm"):
+            pass
+    profiler.count_operations(3)
+    profile = profiler.finish()
+
+    assert profiler.current is None
+    assert profile.module == "blog/views"
+    assert profile.ast_operations == 3
+    migrate, orm = profile.stages["migrate"], profile.stages["async orm"]
+    assert orm["calls"] == 2 and migrate["calls"] == 1
+    assert orm["wall"] >= 0.05
+    # Time spent in nested stages isn't counted twice.
+    assert 0.01 <= migrate["wall"] < 0.05
+    assert orm["peak_memory"] >= len(data) * 8
+    assert migrate["peak_memory"] >= orm["peak_memory"]
+    assert profile.wall == migrate["wall"] + orm["wall"]
+
+
+def test_stage_disabled(profiler):
+    profiler.start("blog/views")
+    with profiler.stage("migrate"):
+        pass
+
+    assert profiler.finish() is None
+
+
+def test_profile_report():
+    report = ProfileReport()
+    for module, wall in (("blog/views", 1.0), ("auth/views", 3.0)):
+        profile = ModuleProfile(module, ast_operations=2)
+        for name in ("write", "parse"):
+            profile.stages[name] = {
+                "wall": wall / 2,
+                "cpu": wall / 4,
+                "peak_memory": int(wall * 100),
+                "calls": 1,
+            }
+        report.add(profile)
+    summary = report.to_dict(top=1)
+
+    assert summary["wall"] == 4.0
+    assert summary["ast_operations"] == 4
+    assert list(summary["stages"]) == ["parse", "write"]
+    assert summary["stages"]["parse"] == {
+        "wall": 2.0,
+        "cpu": 1.0,
+        "peak_memory": 300,
+        "calls": 2,
+    }
+    assert summary["slowest_modules"] == [{"module": "auth/views", "wall": 3.0}]
+    assert summary["modules"]["blog/views"]["cpu"] == 0.5
+
+
+def test_cprofile_dump(profiler, tmp_path):
+    path = str(tmp_path / "report.blog.views.prof")
+    profiler.configure(enabled=True, cprofile_module="blog/views", cprofile_path=path)
+    with profiler.cprofile("auth/views"):
+        sorted(range(10))
+    assert not (tmp_path / "report.blog.views.prof").exists()
+
+    with profiler.cprofile("blog/views"):
+        sorted(range(10))
+    stats = pstats.Stats(path)
+    assert any(
+        function == "<built-in method builtins.sorted>"
+        for _, _, function in stats.stats
+    )
+
+
+def test_cprofile_module_requires_profile(capsys):
+    with pytest.raises(SystemExit):
+        parse_args(["urls.py", "output", "--cprofile-module", "blog/views"])
+    assert "--cprofile-module requires --profile" in capsys.readouterr().err
+
+    arguments = parse_args(
+        ["urls.py", "output", "--profile", "report.json", "--cprofile-module", "app"]
+    )
+    assert arguments.cprofile_module == "app"
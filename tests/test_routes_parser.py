@@ -1,4 +1,9 @@
-from django_to_fastapi.routes import Route, get_modules_from_routes, get_routes
+from django_to_fastapi.routes import (
+    Route,
+    get_modules_from_routes,
+    get_routes,
+    resolve_routes,
+)
 
 
 def test_extract_view():
@@ -59,3 +64,54 @@ from frontend_api.endpoints.auth import signin, signup
     )
     expected = ["frontend_api/endpoints/posts", "frontend_api/endpoints/auth"]
     assert get_modules_from_routes(definition, routes) == expected
+
+
+def test_resolve_routes(tmp_path):
+    files = {
+        "project/urls.py": """
+from django.contrib import admin
+from django.urls import include, path, re_path
+
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("blog/", include("blog.urls")),
+    re_path(r"^shop/", include(("shop.urls", "shop"), namespace="shop")),
+]
+""",
+        "blog/urls.py": """
+from django.urls import path
+from . import views
+from .views import PostsView
+
+urlpatterns = [
+    path("posts/<int:pk>", PostsView.as_view()),
+    path("latest", views.latest),
+]
+""",
+        "shop/urls.py": """
+from django.urls import include, path
+from rest_framework import routers
+from shop.api.views import ProductViewSet, checkout
+
+router = routers.DefaultRouter()
+router.register(r"products", ProductViewSet)
+
+urlpatterns = [re_path(r"^checkout/(?P<cart_id>[0-9]+)/$", checkout)]
+urlpatterns += router.urls
+""",
+    }
+    for file_path, source_code in files.items():
+        (tmp_path / file_path).parent.mkdir(exist_ok=True)
+        (tmp_path / file_path).write_text(source_code)
+
+    routes = resolve_routes(str(tmp_path / "project/urls.py"))
+
+    assert list(routes) == [
+        Route("/blog/posts/{pk}", "PostsView", "blog/views"),
+        Route("/blog/latest", "latest", "blog/views"),
+        Route("/shop/checkout/{cart_id}/", "checkout", "shop/api/views"),
+        Route("/shop/products/", "ProductViewSet", "shop/api/views"),
+    ]
+    assert routes.modules == ["blog/views", "shop/api/views"]
+    assert routes.get("latest").path == "/blog/latest"
+    assert routes.get("missing") is None
@@ -1,8 +1,15 @@
 import ast
+from collections import OrderedDict
 from option import NONE, Some
 import pytest
 
-from django_to_fastapi.utils import class_name_to_function, get_arg_or_keyword
+from django_to_fastapi.config import Config
+from django_to_fastapi.utils import (
+    Formatter,
+    class_name_to_function,
+    format_string,
+    get_arg_or_keyword,
+)
 
 
 @pytest.mark.parametrize(
@@ -53,3 +60,21 @@ def test_get_arg_or_keyword(criteria, expected):
     result = get_arg_or_keyword(*criteria)
     
     assert result.unwrap() == expected.unwrap() if expected.is_some else expected == result
+
+
+def test_formatter(monkeypatch):
+    monkeypatch.setattr(Formatter, "cache", OrderedDict())
+    monkeypatch.setattr(Formatter, "max_entries", 2)
+
+    assert format_string("x=[1,\n2]") == "x = [1, 2]\n"
+    assert len(Formatter.cache) == 1
+    format_string("x=[1,\n2]")
+    assert len(Formatter.cache) == 1
+    format_string("y=1")
+    format_string("x=[1,\n2]")
+    format_string("z=1")
+    # The least recently used entry is evicted.
+    assert list(Formatter.cache.values()) == ["x = [1, 2]\n", "z = 1\n"]
+
+    monkeypatch.setattr(Config, "formatter", "none")
+    assert format_string("x=[1,\n2]") == "x=[1,\n2]"
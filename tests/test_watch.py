@@ -0,0 +1,81 @@
+import pytest
+
+from django_to_fastapi import watch
+from django_to_fastapi.migration import ProjectMigration
+from django_to_fastapi.watch import MODULE, URLCONF, Watcher
+
+URLS = """from django.urls import path
+from blog.views import posts
+
+urlpatterns = [
+    path("posts", posts),
+]
+"""
+
+VIEWS = """from rest_framework.decorators import api_view
+
+
+@api_view(["GET"])
+def posts(request):
+    return {"count": %d}
+"""
+
+
+def create_project(tmp_path):
+    for directory in ("project", "blog", "auth"):
+        (tmp_path / directory).mkdir()
+    (tmp_path / "project" / "urls.py").write_text(URLS)
+    (tmp_path / "project" / "settings.py").write_text("DEBUG = True\n")
+    (tmp_path / "blog" / "views.py").write_text(VIEWS % 1)
+    (tmp_path / "auth" / "views.py").write_text(VIEWS.replace("posts", "signin") % 0)
+    return str(tmp_path / "project" / "urls.py")
+
+
+def test_watcher(tmp_path):
+    urls_path = create_project(tmp_path)
+    destination = tmp_path / "output"
+    watcher = Watcher(ProjectMigration(urls_path, str(destination)))
+    watcher.snapshot()
+    watcher.project.run()
+    entrypoint = (destination / "main.py").read_text()
+    assert not watcher.poll()
+
+    (tmp_path / "blog" / "views.py").write_text(VIEWS % 2)
+    changes = watcher.poll()
+    assert changes == [(MODULE, "blog/views")]
+    (migrated,) = watcher.sync(changes)
+    assert migrated.module == "blog/views"
+    assert '"count": 2' in (destination / "blog" / "views.py").read_text()
+
+    (tmp_path / "project" / "urls.py").write_text(
+        URLS.replace("]", '    path("users", signin),\n]').replace(
+            "from blog.views import posts",
+            "from blog.views import posts\nfrom auth.views import signin",
+        )
+    )
+    changes = watcher.poll()
+    assert changes == [(URLCONF, "project.urls")]
+    assert [migrated.module for migrated in watcher.sync(changes)] == ["auth/views"]
+    assert (destination / "main.py").read_text() != entrypoint
+    assert (tmp_path / "auth" / "views.py").as_posix() in watcher.watched
+
+
+def test_watcher_survives_errors(tmp_path, monkeypatch):
+    urls_path = create_project(tmp_path)
+    watcher = Watcher(ProjectMigration(urls_path, str(tmp_path / "output")))
+    polls = iter([[(MODULE, "blog/views")], [(MODULE, "blog/views")]])
+    synced = []
+
+    def sync(changes):
+        synced.append(changes)
+        if len(synced) == 1:
+            raise KeyError("half-edited")
+        return []
+
+    monkeypatch.setattr(watch.time, "sleep", lambda interval: None)
+    monkeypatch.setattr(watcher, "poll", lambda: next(polls))
+    monkeypatch.setattr(watcher, "sync", sync)
+    # Polling stops once `polls` is exhausted.
+    with pytest.raises(StopIteration):
+        watcher.watch()
+    assert len(synced) == 2